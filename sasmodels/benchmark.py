@@ -0,0 +1,361 @@
+#!/usr/bin/env python
+"""
+Program to time the models and check for performance regressions.
+
+Run using::
+
+    python -m sasmodels.benchmark [options] [model or kind ...]
+
+Each model is timed for each combination of calculation engine, 1D or 2D
+data, and monodisperse or polydisperse parameters.  Polydisperse cases
+use the demo dispersity for the model along with 5% resolution.  The wall
+time per evaluation, evaluations per second and peak memory allocated
+during an evaluation are written as JSON to standard output, or to a file
+with *-out=file.json*.
+
+Two runs can be compared with::
+
+    python -m sasmodels.benchmark -compare old.json new.json
+
+which lists the cases that are slower by more than the tolerance and
+exits with status 1 if there are any, so it can be used as a regression
+gate before upgrading.
+"""
+from __future__ import print_function, division
+
+import sys
+import json
+import time
+import platform
+import traceback
+
+try:
+    import tracemalloc
+except ImportError:  # python 2
+    tracemalloc = None
+
+from . import core
+from . import kernelcl
+from .compare import (make_data, make_engine, get_pars, suppress_pd,
+                      time_calculation)
+from .cost import make_call_args, gauss_n
+
+# pylint: disable=unused-import
+try:
+    from typing import List, Dict, Any, Optional, Tuple
+except ImportError:
+    pass
+else:
+    from .modelinfo import ModelInfo
+# pylint: enable=unused-import
+
+#: Engines timed by default.  The OpenCL engines are added if available.
+DLL_ENGINES = ['single!', 'double!']
+OPENCL_ENGINES = ['single', 'double']
+#: Default number of q points for 1D data, and along each axis for 2D data.
+NQ = {'1d': 128, '2d': 64}
+#: Default number of timed evaluations for each case.
+NEVAL = 5
+#: Default fractional slowdown reported as a regression by *-compare*.
+TOLERANCE = 0.2
+#: Resolution dQ/Q used for the polydisperse cases.
+RESOLUTION = 0.05
+
+#: Fields identifying a benchmark case in the results.
+CASE_FIELDS = ('model', 'engine', 'dim', 'dispersity', 'nq')
+
+def default_engines():
+    # type: () -> List[str]
+    """
+    Return the DLL engines, and the OpenCL engines if OpenCL is available.
+    """
+    return DLL_ENGINES + (OPENCL_ENGINES if kernelcl.use_opencl() else [])
+
+def benchmark_case(model_info, engine, dim='1d', dispersity='mono',
+                   nq=None, neval=NEVAL):
+    # type: (ModelInfo, str, str, str, Optional[int], int) -> Dict[str, Any]
+    """
+    Time *model_info* using calculation *engine* for 1D or 2D data *dim*,
+    with *dispersity* of 'mono' or 'poly'.
+
+    Returns a dictionary with the case fields, the engine name as reported
+    by :func:`compare.make_engine`, *build_ms* to build the calculator,
+    *time_ms* per evaluation averaged over *neval* evaluations,
+    *evals_per_sec*, and *peak_memory* in bytes allocated by python and
+    numpy during one evaluation, or None if it can't be measured.  The
+    amount of work is recorded in *npoints*, the number of q points
+    calculated including resolution, *num_eval*, the number of dispersity
+    points, and *gauss_n*, the quadrature order, for calibrating
+    :class:`cost.CostModel`.  If the case fails, the result has *error*
+    set to the error message instead.
+    """
+    nq = NQ[dim] if nq is None else nq
+    result = dict(model=model_info.id, engine=engine, dim=dim,
+                  dispersity=dispersity, nq=nq)  # type: Dict[str, Any]
+    try:
+        data, _ = make_data({
+            'qmin': 0.001, 'qmax': 0.5, 'nq': nq, 'is2d': dim == '2d',
+            'res': RESOLUTION if dispersity == 'poly' else 0.,
+            'accuracy': 'Low', 'view': 'log', 'zero': False,
+            })
+        pars = get_pars(model_info, use_demo=True)
+        if dispersity == 'mono':
+            pars = suppress_pd(pars)
+        start = _clock()
+        calculator = make_engine(model_info, data, engine, cutoff=0.)
+        build_ms = (_clock() - start)*1000.
+        _, time_ms = time_calculation(calculator, pars, evals=max(neval, 1))
+        peak_memory = _peak_memory(calculator, pars)
+        npoints = len(calculator._kernel_inputs[0])
+        num_eval = int(make_call_args(model_info, pars, dim=dim)[0].num_eval)
+    except Exception as exc:
+        result['error'] = str(exc) or exc.__class__.__name__
+        return result
+    result.update(
+        engine_name=calculator.engine,
+        build_ms=build_ms,
+        time_ms=time_ms,
+        evals_per_sec=(1000./time_ms if time_ms > 0 else None),
+        peak_memory=peak_memory,
+        npoints=npoints,
+        num_eval=num_eval,
+        gauss_n=gauss_n(model_info),
+        )
+    return result
+
+def _clock():
+    # type: () -> float
+    return getattr(time, 'perf_counter', time.time)()
+
+def _peak_memory(calculator, pars):
+    # type: (Any, Dict[str, Any]) -> Optional[int]
+    """
+    Return the peak memory traced during one evaluation of *calculator*.
+    This is done separately from the timing since tracing slows down
+    memory allocation.
+    """
+    if tracemalloc is None:
+        return None
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    try:
+        base, _ = tracemalloc.get_traced_memory()
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        calculator(**pars)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+    return max(peak - base, 0)
+
+def run_benchmarks(models, engines=None, dims=('1d', '2d'),
+                   dispersities=('mono', 'poly'), nq=None, neval=NEVAL,
+                   verbose=False):
+    # type: (List[str], Optional[List[str]], Tuple[str, ...], Tuple[str, ...], Optional[int], int, bool) -> Dict[str, Any]
+    """
+    Time each of *models* for each of *engines*, *dims* and *dispersities*.
+
+    Models which only support 1D are not timed for 2D data.  The same
+    engine is only timed once for each case, so for example python models
+    are not timed again for each precision.
+
+    Returns a dictionary with *system* information and the list of
+    *results* from :func:`benchmark_case`.
+    """
+    if engines is None:
+        engines = default_engines()
+    results = []
+    for name in models:
+        model_info = core.load_model_info(name)
+        for dim in dims:
+            if dim == '2d' and not model_info.parameters.has_2d:
+                continue
+            for dispersity in dispersities:
+                for engine in _distinct_engines(model_info, engines):
+                    if verbose:
+                        print("%s %s %s %s" % (name, engine, dim, dispersity),
+                              file=sys.stderr)
+                    result = benchmark_case(model_info, engine, dim=dim,
+                                            dispersity=dispersity, nq=nq,
+                                            neval=neval)
+                    results.append(result)
+    return {'system': _system_info(), 'results': results}
+
+def _distinct_engines(model_info, engines):
+    # type: (ModelInfo, List[str]) -> List[str]
+    """
+    Return the *engines* which give different calculators for *model_info*,
+    keeping the first of each.  Python models ignore the engine, so only
+    the first engine is used for them.
+    """
+    if model_info.composition is None and callable(model_info.Iq):
+        return engines[:1]
+    distinct = []  # type: List[str]
+    for engine in engines:
+        if engine not in distinct:
+            distinct.append(engine)
+    return distinct
+
+def _system_info():
+    # type: () -> Dict[str, Any]
+    from . import __version__
+    return {
+        'sasmodels': __version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'time': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+
+def compare_runs(old, new, tolerance=TOLERANCE):
+    # type: (Dict[str, Any], Dict[str, Any], float) -> List[Dict[str, Any]]
+    """
+    Compare benchmark runs *old* and *new* as returned from
+    :func:`run_benchmarks`.
+
+    Returns the list of cases in *new* which are more than *tolerance*
+    (as a fraction) slower than in *old*, or which fail in *new* but not in
+    *old*.  Each entry has the case fields along with *old_ms*, *new_ms*
+    and *ratio*, or *error* for failed cases.  Cases which are only in
+    one of the runs are ignored.
+    """
+    previous = dict((_case_key(r), r) for r in old['results'])
+    regressions = []
+    for result in new['results']:
+        before = previous.get(_case_key(result), None)
+        if before is None or 'error' in before:
+            continue
+        case = dict((k, result[k]) for k in CASE_FIELDS)
+        if 'error' in result:
+            case['error'] = result['error']
+            regressions.append(case)
+            continue
+        ratio = result['time_ms']/before['time_ms']
+        if ratio > 1. + tolerance:
+            case.update(old_ms=before['time_ms'], new_ms=result['time_ms'],
+                        ratio=ratio)
+            regressions.append(case)
+    return regressions
+
+def _case_key(result):
+    # type: (Dict[str, Any]) -> Tuple[Any, ...]
+    return tuple(result[k] for k in CASE_FIELDS)
+
+def print_regressions(regressions):
+    # type: (List[Dict[str, Any]]) -> None
+    """
+    Print the regressions found by :func:`compare_runs`.
+    """
+    for case in regressions:
+        label = " ".join(str(case[k]) for k in CASE_FIELDS)
+        if 'error' in case:
+            print("%s: failed with %s" % (label, case['error']))
+        else:
+            print("%s: %.3f ms -> %.3f ms (%.2fx)"
+                  % (label, case['old_ms'], case['new_ms'], case['ratio']))
+
+USAGE = """\
+usage: python -m sasmodels.benchmark [options] [model or kind ...]
+       python -m sasmodels.benchmark -compare old.json new.json [-tol=0.2]
+
+Time the models and write the results as JSON.  Models can be given by
+name or by model kind as in sasmodels.core.list_models (all, py, c, 1d,
+2d, ...).  The default is all models.
+
+Options:
+
+    -engine=single!,double!  engines to time (default DLL, plus OpenCL
+                             if available)
+    -dim=1d,2d               1D and/or 2D data
+    -pd=mono,poly            monodisperse and/or polydisperse with resolution
+    -nq=n                    number of q points (default 128 for 1D and
+                             64x64 for 2D)
+    -neval=5                 number of timed evaluations for each case
+    -out=file.json           write results to a file instead of stdout
+    -compare old new         list cases in new slower than in old
+    -tol=0.2                 fractional slowdown to report as a regression
+"""
+
+def main(argv):
+    # type: (List[str]) -> int
+    """
+    Main program.  Returns the exit status.
+    """
+    opts = dict(engine=None, dim='1d,2d', pd='mono,poly', nq=None,
+                neval=NEVAL, out=None, tol=TOLERANCE)
+    compare = False
+    names = []
+    try:
+        for arg in argv:
+            if arg == '-compare':
+                compare = True
+            elif arg.startswith('-') and '=' in arg:
+                key, value = arg[1:].split('=', 1)
+                if key not in opts:
+                    raise ValueError("unknown option %r" % arg)
+                opts[key] = value
+            elif arg.startswith('-'):
+                raise ValueError("unknown option %r" % arg)
+            else:
+                names.append(arg)
+        if compare:
+            if len(names) != 2:
+                raise ValueError("-compare needs two result files")
+            with open(names[0]) as fid:
+                old = json.load(fid)
+            with open(names[1]) as fid:
+                new = json.load(fid)
+            regressions = compare_runs(old, new, float(opts['tol']))
+            print_regressions(regressions)
+            return 1 if regressions else 0
+        models = []
+        for name in (names or ['all']):
+            kind_models = core.list_models(name) if name in core.KINDS else [name]
+            models.extend(m for m in kind_models if m not in models)
+        engines = (opts['engine'].split(',') if opts['engine'] is not None
+                   else None)
+        nq = int(opts['nq']) if opts['nq'] is not None else None
+        neval = int(opts['neval'])
+    except Exception:
+        traceback.print_exc()
+        print(USAGE, file=sys.stderr)
+        return 2
+
+    run = run_benchmarks(models, engines=engines,
+                         dims=tuple(opts['dim'].split(',')),
+                         dispersities=tuple(opts['pd'].split(',')),
+                         nq=nq, neval=neval, verbose=True)
+    if opts['out'] is not None:
+        with open(opts['out'], 'w') as fid:
+            json.dump(run, fid, indent=2, sort_keys=True)
+    else:
+        json.dump(run, sys.stdout, indent=2, sort_keys=True)
+        print()
+    return 0
+
+def test_benchmark():
+    # type: () -> None
+    """
+    Check that benchmarks run and that slow cases are found.
+    """
+    run = run_benchmarks(['sphere'], engines=['double!'], dims=('1d',),
+                         nq=20, neval=2)
+    assert [r['dispersity'] for r in run['results']] == ['mono', 'poly']
+    for result in run['results']:
+        assert 'error' not in result, result['error']
+        assert result['time_ms'] > 0
+    assert compare_runs(run, run) == []
+    slower = json.loads(json.dumps(run))
+    slower['results'][1]['time_ms'] *= 2
+    regressions = compare_runs(run, slower)
+    assert len(regressions) == 1
+    assert regressions[0]['dispersity'] == 'poly'
+    # python models are only timed once per case
+    run = run_benchmarks(['_spherepy'], engines=['single!', 'double!'],
+                         dims=('1d',), dispersities=('mono',), nq=20, neval=1)
+    assert [r['engine'] for r in run['results']] == ['single!']
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -9,10 +9,17 @@ arguments to set the initial value for each parameter.
 the sasview data loader.  *Experiment* takes a *cutoff* parameter controlling
 how far the polydispersity integral extends.
 
+:class:`ExperimentGroup` is a bumps fit problem for a simultaneous fit to
+several experiments which evaluates the theory for the experiments
+concurrently.
+
 """
 from __future__ import print_function
 
-__all__ = ["Model", "Experiment"]
+__all__ = ["Model", "Experiment", "ExperimentGroup"]
+
+import multiprocessing
+from multiprocessing.pool import ThreadPool
 
 import numpy as np  # type: ignore
 
@@ -21,7 +28,7 @@ from .direct_model import DataMixin
 
 # pylint: disable=unused-import
 try:
-    from typing import Dict, Union, Tuple, Any
+    from typing import Dict, Union, Tuple, Any, List, Optional, Iterator
     from .data import Data1D, Data2D
     from .kernel import KernelModel
     from .modelinfo import ModelInfo
@@ -34,8 +41,15 @@ try:
     # Optional import. This allows the doc builder and nosetests to run even
     # when bumps is not on the path.
     from bumps.names import Parameter # type: ignore
+    from bumps import fitproblem as _fitproblem # type: ignore
 except ImportError:
-    pass
+    _FitProblem = object
+else:
+    # Before bumps 1.0, FitProblem was a factory function and the fit problem
+    # class for a simultaneous fit was MultiFitProblem.
+    _FitProblem = (_fitproblem.MultiFitProblem
+                   if isinstance(_fitproblem.MultiFitProblem, type)
+                   else _fitproblem.FitProblem)
 
 
 def create_parameters(model_info,  # type: ModelInfo
@@ -238,10 +252,229 @@ class Experiment(DataMixin):
         # type: () -> Dict[str, Any]
         # Can't pickle gpu functions, so instead make them lazy
         state = self.__dict__.copy()
-        state['_kernel'] = None
+        state['_kernel'] = state['_shared_kernel'] = None
+        state['_shared_token'] = None
+        return state
+
+    def __setstate__(self, state):
+        # type: (Dict[str, Any]) -> None
+        # pylint: disable=attribute-defined-outside-init
+        self.__dict__ = state
+
+
+def _calc_experiment_theory(job):
+    # type: (Tuple[Experiment, Dict[str, Any]]) -> np.ndarray
+    """
+    Calculate the theory for one experiment of an :class:`ExperimentGroup`.
+    This is a module level function so that it can be sent to a process pool.
+    """
+    experiment, pars = job
+    return experiment._calc_theory(pars, cutoff=experiment.cutoff)
+
+
+class ExperimentGroup(_FitProblem):
+    """
+    Bumps fit problem for a simultaneous fit to several experiments.
+
+    This is a drop-in replacement for the bumps *FitProblem* (or
+    *MultiFitProblem* before bumps 1.0) with the same arguments, but
+    the theory for the :class:`Experiment` models is evaluated concurrently
+    rather than one experiment after another.  Other fitness functions in
+    *models* are evaluated as usual.
+
+    *threads* is the number of threads in the pool, which defaults to the
+    number of CPUs.  The compiled models are shared between the threads.
+    Threads only help for kernels which release the GIL, such as the DLL
+    and OpenCL kernels.
+
+    *pool* is an alternative pool with a *map* method, such as a
+    *multiprocessing.Pool*, to use instead of the thread pool.  With a
+    process pool each experiment is pickled for each evaluation, so it
+    only helps for expensive models.  The pool is not closed by the group,
+    and it is replaced by a thread pool if the group is pickled.  Use
+    :meth:`close` to stop the thread pool when the fit is done; it is
+    also stopped when the group is deleted.
+
+    Both :meth:`model_nllf` and :meth:`residuals`, which is used by
+    Levenberg-Marquardt, calculate the experiments concurrently.
+    """
+    def __init__(self, models, *args, **kwargs):
+        # type: (List[Any], *Any, **Any) -> None
+        self.threads = kwargs.pop('threads', None)  # type: Optional[int]
+        self._pool = kwargs.pop('pool', None)
+        self._thread_pool = None  # type: Optional[ThreadPool]
+        _FitProblem.__init__(self, models, *args, **kwargs)
+
+    def _get_pool(self):
+        if self._pool is not None:
+            return self._pool
+        if self._thread_pool is None:
+            threads = self.threads
+            if threads is None:
+                threads = multiprocessing.cpu_count()
+            self._thread_pool = ThreadPool(max(1, threads))
+        return self._thread_pool
+
+    def close(self):
+        # type: () -> None
+        """
+        Stop the thread pool.  A new pool is started if the group is
+        evaluated again.
+        """
+        pool, self._thread_pool = self._thread_pool, None
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    def __del__(self):
+        # type: () -> None
+        try:
+            self.close()
+        except Exception:  # interpreter shutdown
+            pass
+
+    def model_nllf(self):
+        # type: () -> float
+        """
+        Return cost function for all data sets.
+        """
+        return sum(w**2 * f.nllf() for w, f in self._weighted_models())
+
+    def residuals(self):
+        # type: () -> np.ndarray
+        """
+        Return the weighted residuals for all data sets.
+        """
+        return np.hstack([w * f.residuals()
+                          for w, f in self._weighted_models()])
+
+    def _weighted_models(self):
+        # type: () -> Iterator[Tuple[float, Any]]
+        """
+        Yield the weight and the fitness function for each model with its
+        free variables set, as for the bumps *models* iterator, with the
+        theory for the experiments already calculated.
+        """
+        theories = self._calc_theories()
+        for index, (weight, f) in enumerate(zip(self.weights, self.models)):
+            # Setting the free variables may clear the experiment cache.
+            if index in theories:
+                f._cache['theory'] = theories[index]
+            yield weight, f
+
+    def _calc_theories(self):
+        # type: () -> Dict[int, np.ndarray]
+        """
+        Calculate the theory for each experiment, returning the theories
+        by model index.
+        """
+        # Record the parameters for each experiment that needs to be
+        # calculated while its free variables are set, then calculate the
+        # experiments together.
+        freevars = self.freevars
+        jobs = []
+        try:
+            for index, f in enumerate(self._models):
+                if not isinstance(f, Experiment):
+                    continue
+                freevars.set_model(index)
+                if freevars:
+                    f.update()
+                if 'theory' in f._cache:
+                    continue
+                jobs.append((index, f, f.model.state()))
+        finally:
+            freevars.set_model(self._active_model_index)
+        if len(jobs) > 1:
+            theories = self._get_pool().map(
+                _calc_experiment_theory, [(f, pars) for _, f, pars in jobs])
+        else:
+            theories = [_calc_experiment_theory((f, pars))
+                        for _, f, pars in jobs]
+        computed = {}
+        for (index, f, _), theory in zip(jobs, theories):
+            f._cache['theory'] = computed[index] = theory
+        return computed
+
+    def __getstate__(self):
+        # type: () -> Dict[str, Any]
+        # Pools can't be pickled, so make a new thread pool when restored.
+        state = self.__dict__.copy()
+        state['_pool'] = state['_thread_pool'] = None
         return state
 
     def __setstate__(self, state):
         # type: (Dict[str, Any]) -> None
         # pylint: disable=attribute-defined-outside-init
         self.__dict__ = state
+
+
+def test_experiment_group():
+    # type: () -> None
+    """
+    Test that the group gives the same nllf as evaluating in sequence.
+    """
+    import pickle
+    from bumps.names import FitProblem, FreeVariables
+    from .core import load_model
+    from .data import empty_data1D
+    model = Model(load_model('sphere'), radius=200, background=0.1)
+    experiments = []
+    for k, q in enumerate((np.logspace(-3, -1, 50), np.linspace(0.01, 0.3, 40))):
+        data = empty_data1D(q)
+        data.filename = "data%d" % k
+        experiment = Experiment(data, model)
+        experiment.simulate_data(noise=5)
+        experiments.append(experiment)
+    free = FreeVariables(names=["a", "b"], background=model.background)
+    free.background[1].value = 0.3
+    model.radius.range(10, 1000)
+    target = FitProblem(experiments, freevars=free)
+    group = ExperimentGroup(experiments, freevars=free, threads=2)
+    for radius in (150, 200, 250):
+        group.setp([radius])
+        resid = group.residuals()
+        actual = group.nllf()
+        target.setp([radius])
+        assert np.allclose(actual, target.nllf())
+        assert np.allclose(resid, target.residuals())
+    restored = pickle.loads(pickle.dumps(group))
+    assert np.allclose(restored.nllf(), actual)
+    restored.close()
+    group.close()
+    assert group._thread_pool is None
+
+def test_experiment_group_freevars():
+    # type: () -> None
+    """
+    Test that free variables are set for each experiment in the group.
+    """
+    from bumps.names import FitProblem, FreeVariables
+    from . import instrument
+    from .core import load_model
+    from .data import empty_data1D
+    model = Model(load_model('sphere'), radius=200, background=0.1)
+    q = np.logspace(-3, -1, 50)
+    experiments = []
+    for radius in (150, 250):
+        data = empty_data1D(q)
+        data.filename = "radius%d" % radius
+        model.radius.value = radius
+        experiment = Experiment(data, model)
+        experiment.simulate_data(noise=5)
+        experiments.append(experiment)
+    free = FreeVariables(names=["a", "b"], radius=model.radius)
+    free.radius[0].range(10, 1000)
+    free.radius[1].value = 250
+    target = FitProblem(experiments, freevars=free)
+    group = ExperimentGroup(experiments, freevars=free, threads=2)
+    for radius in (100, 150, 200):
+        group.setp([radius])
+        with instrument.collect() as stats:
+            resid = group.residuals()
+        # One calculation for each experiment, done by the group.
+        assert sum(entry.calls for entry in stats) == 2
+        target.setp([radius])
+        assert np.allclose(resid, target.residuals())
+        assert np.allclose(group.nllf(), target.nllf())
+    group.close()
@@ -98,6 +98,7 @@ Options (* for default):
     -engine=default uses the default calcution precision
     -single/-double/-half/-fast sets an OpenCL calculation engine
     -single!/-double!/-quad! sets an OpenMP calculation engine
+    -single+/-single+! evaluates in single precision, summing in double
 
     === plotting ===
     -plot*/-noplot plots or suppress the plot of the model
@@ -720,6 +721,8 @@ def make_engine(model_info, data, dtype, cutoff, ngauss=0):
     engine_type = calculator._model.__class__.__name__.replace('Model', '').upper()
     bits = calculator._model.dtype.itemsize*8
     precision = "fast" if getattr(calculator._model, 'fast', False) else str(bits)
+    if getattr(calculator._model, 'mixed', False):
+        precision += "+"
     calculator.engine = "%s[%s]" % (engine_type, precision)
     return calculator
 
@@ -967,6 +970,7 @@ OPTIONS = [
     # Precision options
     'engine=',
     'half', 'fast', 'single', 'double', 'single!', 'double!', 'quad!',
+    'single+', 'single+!',
 
     # Output options
     'help', 'html', 'edit',
@@ -1151,6 +1155,8 @@ def parse_opts(argv):
         elif arg == '-single!': opts['engine'] = 'single!'
         elif arg == '-double!': opts['engine'] = 'double!'
         elif arg == '-quad!':   opts['engine'] = 'quad!'
+        elif arg == '-single+': opts['engine'] = 'single+'
+        elif arg == '-single+!': opts['engine'] = 'single+!'
         elif arg == '-edit':    opts['explore'] = True
         elif arg == '-demo':    opts['use_demo'] = True
         elif arg == '-default': opts['use_demo'] = False
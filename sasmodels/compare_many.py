@@ -15,10 +15,12 @@ from __future__ import print_function
 
 import sys
 import traceback
+import multiprocessing
 
 import numpy as np  # type: ignore
 
 from . import core
+from . import kerneldll
 from .compare import (randomize_pars, suppress_pd, make_data,
                       make_engine, get_pars, columnize,
                       constrain_pars)
@@ -77,47 +79,76 @@ PRECISION = {
     'single': 5e-5,
     'double': 5e-14,
     'single!': 5e-5,
+    'single+': 5e-5,
+    'single+!': 5e-5,
     'double!': 5e-14,
     'quad!': 5e-18,
 }
-def compare_instance(name, data, index, N=1, mono=True, cutoff=1e-5,
-                     base='single', comp='double'):
-    r"""
-    Compare the model under different calculation engines.
-
-    *name* is the name of the model.
-
-    *data* is the data object giving $q, \Delta q$ calculation points.
-
-    *index* is the active set of points.
-
-    *N* is the number of comparisons to make.
-
-    *cutoff* is the polydispersity weight cutoff to make the calculation
-    a little bit faster.
+#: Expected error for DLLs built with a compiler profile other than portable,
+#: if larger than the error for the precision.
+PROFILE_PRECISION = {
+    'fastmath': 1e-10,
+}
+def make_seeds(N, seed=None):
+    """
+    Return *N* random seeds for the parameter sets.
 
-    *base* and *comp* are the names of the calculation engines to compare.
+    If *seed* is given then the same seeds are returned each time, so a
+    run can be repeated exactly, whether or not it runs in parallel.
     """
+    rng = np.random.RandomState(seed)
+    return [int(v) for v in rng.randint(1000000, size=N)]
+
+# Calculators built by this process, keyed by model, data and engines, so
+# that a worker only builds them once for all its tasks for a model.  Only
+# the engines for the current model are kept, so that the compiled models
+# are freed as a sweep moves on to the next model.
+_ENGINES = {}
+
+def _get_engines(model_info, data, base, comp, cutoff, profile=None):
+    key = model_info.id, id(data), base, comp, cutoff, profile
+    if key not in _ENGINES:
+        _ENGINES.clear()
+        if profile is not None:
+            # Profiles only apply to DLLs, so don't report a profile check
+            # for an engine that might be OpenCL.
+            if not base.endswith('!'):
+                raise ValueError("-profile=%s needs a DLL engine such as"
+                                 " %s! rather than %s" % (profile, base, base))
+            old_profile = kerneldll.DLL_PROFILE
+            try:
+                kerneldll.DLL_PROFILE = profile
+                calc_base = make_engine(model_info, data, base, cutoff)
+            finally:
+                kerneldll.DLL_PROFILE = old_profile
+            calc_base.engine += " " + profile
+        else:
+            calc_base = make_engine(model_info, data, base, cutoff)
+        _ENGINES[key] = calc_base, make_engine(model_info, data, comp, cutoff)
+    return _ENGINES[key]
 
-    is_2d = hasattr(data, 'qx_data')
+def compare_seeds(name, data, index, seeds, mono=True, cutoff=1e-5,
+                  base='single', comp='double', profile=None, start=0):
+    """
+    Compare the model under two calculation engines for the parameter
+    sets generated from each of *seeds*.
+
+    Returns the engine label and a list of *(seed, stats, pars)* for each
+    seed, where *stats* are from :func:`calc_stats`.  If the engines can't
+    be built then the label is None and the list contains the error
+    message.  *start* is the count of the first seed, used for the
+    progress messages.  See :func:`compare_instance` for the other
+    arguments.
+    """
     model_info = core.load_model_info(name)
-    pars = get_pars(model_info, use_demo=True)
-    header = ('\n"Model","%s","Count","%d","Dimension","%s"'
-              % (name, N, "2D" if is_2d else "1D"))
-    if not mono:
-        header += ',"Cutoff",%g'%(cutoff,)
-    print(header)
-
-    if is_2d:
-        if not model_info.parameters.has_2d:
-            print(',"1-D only"')
-            return
+    try:
+        calc_base, calc_comp = _get_engines(model_info, data, base, comp,
+                                            cutoff, profile)
+    except Exception as exc:
+        #raise
+        return None, [str(exc)]
+    label = " vs. ".join((calc_base.engine, calc_comp.engine))
 
-    # Some not very clean macros for evaluating the models and checking the
-    # results.  They freely use variables from the current scope, even some
-    # which have not been defined yet, complete with abuse of mutable lists
-    # to allow them to update values in the current scope since nonlocal
-    # declarations are not available in python 2.7.
     def try_model(fn, pars):
         """
         Return the model evaluated at *pars*.  If there is an exception,
@@ -133,60 +164,164 @@ def compare_instance(name, data, index, N=1, mono=True, cutoff=1e-5,
             else:
                 result = np.NaN*data.x
         return result
-    def check_model(pars):
-        """
-        Run the two calculators against *pars*, returning statistics
-        on the differences.  See :func:`calc_stats` for the list of stats.
-        """
-        base_value = try_model(calc_base, pars)
-        comp_value = try_model(calc_comp, pars)
-        stats = calc_stats(base_value, comp_value, index)
-        max_diff[0] = max(max_diff[0], stats[0])
-        good[0] = good[0] and (stats[0] < expected)
-        return list(stats)
-
-
-    try:
-        calc_base = make_engine(model_info, data, base, cutoff)
-        calc_comp = make_engine(model_info, data, comp, cutoff)
-    except Exception as exc:
-        #raise
-        print('"Error: %s"'%str(exc).replace('"', "'"))
-        print('"good","%d of %d","max diff",%g' % (0, N, np.NaN))
-        return
-    expected = max(PRECISION[base], PRECISION[comp])
 
-    num_good = 0
-    first = True
-    max_diff = [0]
-    for k in range(N):
-        print("Model %s %d"%(name, k+1), file=sys.stderr)
-        seed = np.random.randint(1e6)
+    pars = get_pars(model_info, use_demo=True)
+    rows = []
+    for k, seed in enumerate(seeds):
+        print("Model %s %d"%(name, start+k+1), file=sys.stderr)
         np.random.seed(seed)
         pars_i = randomize_pars(model_info, pars)
         constrain_pars(model_info, pars_i)
         if mono:
             pars_i = suppress_pd(pars_i)
+        base_value = try_model(calc_base, pars_i)
+        comp_value = try_model(calc_comp, pars_i)
+        stats = calc_stats(base_value, comp_value, index)
+        rows.append((seed, list(stats), pars_i))
+    return label, rows
 
-        good = [True]
-        columns = check_model(pars_i)
-        columns += [v for _, v in sorted(pars_i.items())]
-        if first:
-            labels = [" vs. ".join((calc_base.engine, calc_comp.engine))]
-            print_column_headers(pars_i, labels)
-            first = False
-        if good[0]:
+def _print_header(name, N, is_2d, mono, cutoff):
+    header = ('\n"Model","%s","Count","%d","Dimension","%s"'
+              % (name, N, "2D" if is_2d else "1D"))
+    if not mono:
+        header += ',"Cutoff",%g'%(cutoff,)
+    print(header)
+
+def print_results(name, N, is_2d, mono, cutoff, base, comp, label, rows,
+                  profile=None):
+    """
+    Print the CSV table for model *name* from the results of
+    :func:`compare_seeds`, listing the parameter sets where the
+    difference is more than expected for the precision and the
+    compiler *profile*.
+    """
+    _print_header(name, N, is_2d, mono, cutoff)
+    if label is None:
+        print('"Error: %s"'%rows[0].replace('"', "'"))
+        print('"good","%d of %d","max diff",%g' % (0, N, np.NaN))
+        return
+
+    expected = max(PRECISION[base], PRECISION[comp],
+                   PROFILE_PRECISION.get(profile, 0.))
+    num_good = 0
+    max_diff = 0
+    for k, (seed, stats, pars_i) in enumerate(rows):
+        if k == 0:
+            print_column_headers(pars_i, [label])
+        max_diff = max(max_diff, stats[0])
+        if stats[0] < expected:
             num_good += 1
         else:
+            columns = stats + [v for _, v in sorted(pars_i.items())]
             print(("%d,"%seed)+','.join("%s"%v for v in columns))
-    print('"good","%d of %d","max diff",%g'%(num_good, N, max_diff[0]))
+    print('"good","%d of %d","max diff",%g'%(num_good, N, max_diff))
+
+def compare_instance(name, data, index, N=1, mono=True, cutoff=1e-5,
+                     base='single', comp='double', seed=None, profile=None):
+    r"""
+    Compare the model under different calculation engines.
+
+    *name* is the name of the model.
+
+    *data* is the data object giving $q, \Delta q$ calculation points.
+
+    *index* is the active set of points.
+
+    *N* is the number of comparisons to make.
+
+    *cutoff* is the polydispersity weight cutoff to make the calculation
+    a little bit faster.
+
+    *base* and *comp* are the names of the calculation engines to compare.
+
+    *seed* is the seed for generating the random seeds for each comparison,
+    or None for a different set each time.
+
+    *profile* is the :mod:`kerneldll` compiler profile used to build the
+    *base* engine, or None for the default.
+    """
+    compare_models([name], data, index, N=N, mono=mono, cutoff=cutoff,
+                   base=base, comp=comp, seed=seed, profile=profile)
+
+# Data shared by the worker processes, set by _init_worker.
+_WORKER_DATA = None
+
+def _init_worker(data, index):
+    global _WORKER_DATA
+    _WORKER_DATA = data, index
+
+def _worker(task):
+    name, seeds, start, options = task
+    data, index = _WORKER_DATA
+    return compare_seeds(name, data, index, seeds, start=start, **options)
+
+def compare_models(models, data, index, N=1, mono=True, cutoff=1e-5,
+                   base='single', comp='double', seed=None, profile=None,
+                   nproc=1, chunk_size=None):
+    """
+    Compare each of *models* under different calculation engines,
+    printing the CSV table for each in turn.
+
+    If *nproc* is more than one, then the comparisons are run in a pool
+    of *nproc* processes, with the *N* parameter sets for each model
+    split into tasks of *chunk_size* sets.  The default splits each
+    model into *nproc* tasks.  Each worker builds the engines once for
+    each model that it sees.  The parameter sets for each model come
+    from :func:`make_seeds`, so the output does not depend on *nproc*.
+
+    See :func:`compare_instance` for the other arguments.
+    """
+    is_2d = hasattr(data, 'qx_data')
+    options = dict(mono=mono, cutoff=cutoff, base=base, comp=comp,
+                   profile=profile)
+    if chunk_size is None:
+        chunk_size = max((N + nproc - 1)//nproc, 1)
+    tasks = []
+    for name in models:
+        model_info = core.load_model_info(name)
+        if is_2d and not model_info.parameters.has_2d:
+            continue
+        seeds = make_seeds(N, seed)
+        tasks.extend((name, seeds[k:k+chunk_size], k, options)
+                     for k in range(0, N, chunk_size))
+
+    if nproc > 1 and tasks:
+        pool = multiprocessing.Pool(nproc, _init_worker, (data, index))
+        results = pool.imap(_worker, tasks)
+    else:
+        _init_worker(data, index)
+        pool = None
+        results = (_worker(task) for task in tasks)
+    try:
+        results = iter(results)
+        for name in models:
+            model_info = core.load_model_info(name)
+            if is_2d and not model_info.parameters.has_2d:
+                _print_header(name, N, is_2d, mono, cutoff)
+                print(',"1-D only"')
+                continue
+            parts = [next(results) for _ in range(0, N, chunk_size)]
+            errors = [part for part in parts if part[0] is None]
+            if errors:
+                label, rows = errors[0]
+            else:
+                label = parts[0][0] if parts else ""
+                rows = [row for _, part_rows in parts for row in part_rows]
+            print_results(name, N, is_2d, mono, cutoff, base, comp,
+                          label, rows, profile=profile)
+            if pool is None:
+                _ENGINES.clear()
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
 
 
 def print_usage():
     """
     Print the command usage string.
     """
-    print("usage: compare_many.py MODEL COUNT (1dNQ|2dNQ) (CUTOFF|mono) (single|double|quad)",
+    print("usage: compare_many.py [-nproc=N] [-seed=S] [-profile=P] MODEL COUNT (1dNQ|2dNQ) (CUTOFF|mono) (single|double|quad)",
           file=sys.stderr)
 
 
@@ -226,8 +361,23 @@ is set in compare.py defaults for each model.  Polydispersity is given in the
 
 PRECISION is the floating point precision to use for comparisons.  If two
 precisions are given, then compare one to the other.  Precision is one of
-fast, single, double for GPU or single!, double!, quad! for DLL.  If no
-precision is given, then use single and double! respectively.
+fast, single, single+, double for GPU or single!, single+!, double!, quad!
+for DLL, where single+ evaluates the model in single precision but sums the
+dispersity in double.  If no precision is given, then use single and double!
+respectively.
+
+-nproc=N runs the comparisons in N processes, or one for each cpu if N
+is 0.  The output is the same as for a single process.
+
+-seed=S sets the seed used to generate the seeds for the parameter sets,
+so that a run can be repeated.  Each model uses the same seeds.
+
+-profile=P builds the first engine with compiler profile P, which is
+one of portable, native or fastmath (see sasmodels.kerneldll), so that the
+profile can be checked against the default.  The first engine must be a
+DLL engine ending in '!'.  For example:
+
+    compare_many.py -profile=fastmath all 100 1d100 mono double! double!
 
 Available models:
 """)
@@ -237,6 +387,8 @@ def main(argv):
     """
     Main program.
     """
+    options = [arg for arg in argv if arg.startswith('-')]
+    argv = [arg for arg in argv if not arg.startswith('-')]
     if len(argv) not in (3, 4, 5, 6):
         print_help()
         return
@@ -258,6 +410,19 @@ def main(argv):
         cutoff = float(argv[3]) if not mono else 0
         base = argv[4] if len(argv) > 4 else "single"
         comp = argv[5] if len(argv) > 5 else "double!"
+        nproc, seed, profile = 1, None, None
+        for opt in options:
+            if opt.startswith('-nproc='):
+                nproc = int(opt[7:]) or multiprocessing.cpu_count()
+            elif opt.startswith('-seed='):
+                seed = int(opt[6:])
+            elif opt.startswith('-profile='):
+                profile = opt[9:]
+                kerneldll.profile_flags(profile)  # check the profile name
+            else:
+                raise ValueError("unknown option %r"%opt)
+        if profile is not None and not base.endswith('!'):
+            raise ValueError("-profile needs a DLL engine such as %s!" % base)
     except Exception:
         traceback.print_exc()
         print_usage()
@@ -267,9 +432,36 @@ def main(argv):
         'qmin': 0.001, 'qmax': 1.0, 'is2d': is2D, 'nq': Nq, 'res': 0.,
         'accuracy': 'Low', 'view':'log', 'zero': False
         })
-    for model in model_list:
-        compare_instance(model, data, index, N=count, mono=mono,
-                         cutoff=cutoff, base=base, comp=comp)
+    compare_models(model_list, data, index, N=count, mono=mono,
+                   cutoff=cutoff, base=base, comp=comp, seed=seed,
+                   profile=profile, nproc=nproc)
+
+def test_compare_seeds():
+    """
+    Check that the comparisons are repeatable when split into tasks.
+    """
+    data, index = make_data({
+        'qmin': 0.001, 'qmax': 1.0, 'is2d': False, 'nq': 20, 'res': 0.,
+        'accuracy': 'Low', 'view': 'log', 'zero': False,
+        })
+    seeds = make_seeds(4, seed=1)
+    assert seeds == make_seeds(4, seed=1)
+    options = dict(base='single!', comp='double!')
+    label, rows = compare_seeds('sphere', data, index, seeds, **options)
+    assert label is not None and len(rows) == 4
+    _, first = compare_seeds('sphere', data, index, seeds[:2], **options)
+    _, second = compare_seeds('sphere', data, index, seeds[2:], start=2,
+                              **options)
+    assert [row[1] for row in first + second] == [row[1] for row in rows]
+    assert [row[2] for row in first + second] == [row[2] for row in rows]
+    # Only the engines for the most recent model are kept.
+    compare_seeds('cylinder', data, index, seeds[:1], **options)
+    assert [key[0] for key in _ENGINES] == ['cylinder']
+    # Compiler profiles can only be checked for DLL engines.
+    label, rows = compare_seeds('sphere', data, index, seeds[:1],
+                                base='single', comp='double!',
+                                profile='native')
+    assert label is None and '-profile' in rows[0]
 
 if __name__ == "__main__":
     #from .compare import push_seed
@@ -181,8 +181,8 @@ def build_model(model_info, dtype=None, platform="ocl"):
 
     *dtype* indicates whether the model should use single or double precision
     for the calculation.  Choices are 'single', 'double', 'quad', 'half',
-    or 'fast'.  If *dtype* ends with '!', then force the use of the DLL rather
-    than OpenCL for the calculation.
+    'fast' or 'single+'.  If *dtype* ends with '!', then force the use of the
+    DLL rather than OpenCL for the calculation.
 
     *platform* should be "dll" to force the dll to be used for C models,
     otherwise it uses the default "ocl".
@@ -195,7 +195,11 @@ def build_model(model_info, dtype=None, platform="ocl"):
             return mixture.MixtureModel(model_info, models)
         elif composition_type == 'product':
             P, S = models
-            return product.ProductModel(model_info, P, S)
+            if product.FUSED and product.can_fuse(model_info):
+                fused = _build_kernel_model(model_info, dtype, platform)
+            else:
+                fused = None
+            return product.ProductModel(model_info, P, S, fused=fused)
         else:
             raise ValueError('unknown mixture type %s'%composition_type)
 
@@ -203,15 +207,25 @@ def build_model(model_info, dtype=None, platform="ocl"):
     if callable(model_info.Iq):
         return kernelpy.PyModel(model_info)
 
+    return _build_kernel_model(model_info, dtype, platform)
+
+def _build_kernel_model(model_info, dtype, platform):
+    # type: (modelinfo.ModelInfo, str, str) -> KernelModel
+    """
+    Compile the C source for *model_info* as a DLL or OpenCL model.
+    """
     numpy_dtype, fast, platform = parse_dtype(model_info, dtype, platform)
+    mixed = is_mixed(dtype)
 
     source = generate.make_source(model_info)
     if platform == "dll":
         #print("building dll", numpy_dtype)
-        return kerneldll.load_dll(source['dll'], model_info, numpy_dtype)
+        return kerneldll.load_dll(source['dll'], model_info, numpy_dtype,
+                                  mixed=mixed)
     else:
         #print("building ocl", numpy_dtype)
-        return kernelcl.GpuModel(source, model_info, numpy_dtype, fast=fast)
+        return kernelcl.GpuModel(source, model_info, numpy_dtype, fast=fast,
+                                 mixed=mixed)
 
 def precompile_dlls(path, dtype="double"):
     # type: (str, str) -> List[str]
@@ -244,13 +258,16 @@ def precompile_dlls(path, dtype="double"):
 def parse_dtype(model_info, dtype=None, platform=None):
     # type: (ModelInfo, str, str) -> (np.dtype, bool, str)
     """
-    Interpret dtype string, returning np.dtype and fast flag.
+    Interpret dtype string, returning np.dtype, fast flag and platform.
 
     Possible types include 'half', 'single', 'double' and 'quad'.  If the
     type is 'fast', then this is equivalent to dtype 'single' but using
     fast native functions rather than those with the precision level
-    guaranteed by the OpenCL standard.  'default' will choose the appropriate
-    default for the model and platform.
+    guaranteed by the OpenCL standard.  If the type is 'single+', then the
+    model is evaluated in single precision but the sum over the dispersity
+    mesh is accumulated in double precision; use :func:`is_mixed` to check
+    for it.  'default' will choose the
+    appropriate default for the model and platform.
 
     Platform preference can be specfied ("ocl" vs "dll"), with the default
     being OpenCL if it is availabe.  If the dtype name ends with '!' then
@@ -275,9 +292,10 @@ def parse_dtype(model_info, dtype=None, platform=None):
         platform = "dll"
         dtype = dtype[:-1]
 
-    # Convert special type names "half", "fast", and "quad"
+    # Convert special type names "half", "fast", "single+" and "quad"
     fast = (dtype == "fast")
-    if fast:
+    mixed = is_mixed(dtype)
+    if fast or mixed:
         dtype = "single"
     elif dtype == "quad":
         dtype = "longdouble"
@@ -298,9 +316,20 @@ def parse_dtype(model_info, dtype=None, platform=None):
             platform = "dll"
             if dtype is None:
                 numpy_dtype = generate.F64
+        elif mixed and not env.has_type(generate.F64):
+            # Mixed precision needs double for the accumulators.
+            platform = "dll"
 
     return numpy_dtype, fast, platform
 
+def is_mixed(dtype):
+    # type: (Optional[str]) -> bool
+    """
+    Return True if the dtype string, such as 'single+' or 'single+!',
+    requests single precision with double precision accumulators.
+    """
+    return dtype is not None and dtype.rstrip('!') == "single+"
+
 def list_models_main():
     # type: () -> None
     """
@@ -368,5 +397,14 @@ def test_composite():
               " A_sld A_sld_solvent A_radius").split()
     assert target == actual, "%s != %s"%(target, actual)
 
+def test_parse_dtype():
+    # type: () -> None
+    """Check the dtype strings, including mixed precision"""
+    info = load_model_info('sphere')
+    assert parse_dtype(info, 'single+!') == (generate.F32, False, 'dll')
+    assert parse_dtype(info, 'fast!')[:2] == (generate.F32, True)
+    assert is_mixed('single+') and is_mixed('single+!')
+    assert not is_mixed('single') and not is_mixed(None)
+
 if __name__ == "__main__":
     list_models_main()
@@ -0,0 +1,293 @@
+"""
+Evaluation cost estimates.
+
+:class:`CostModel` predicts the time for one model evaluation from the
+dispersity mesh in the kernel :class:`details.CallDetails`, the number of
+q points, the resolution oversampling and the gaussian quadrature order
+*GAUSS_N* of the model.  The time per q point per dispersity point for
+each model and engine is calibrated from the results of
+:mod:`sasmodels.benchmark`::
+
+    python -m sasmodels.benchmark -out=calibration.json
+
+and then::
+
+    from sasmodels.cost import CostModel, make_call_args
+    costs = CostModel.load('calibration.json')
+    call_details, values = make_call_args(model.info, pars)
+    seconds = costs.estimate(model, call_details, nq,
+                             values=values, cutoff=1e-5)
+
+Use :meth:`CostModel.check` to refuse a calculation which would exceed
+a time budget, or :meth:`CostModel.limit_dispersity` to reduce the number
+of dispersity points until it fits.  Models or engines which are not in
+the calibration use the median rate for the engine, or *DEFAULT_RATE*.
+
+The estimate assumes the time is proportional to the number of q points
+times the number of dispersity points above the weight cutoff, plus a
+fixed overhead per call, and that 1D models with orientation integration
+scale linearly with *GAUSS_N*, except for models with adaptive quadrature.
+Expect it to be within a factor of two or so.
+"""
+from __future__ import print_function, division
+
+import re
+import json
+
+import numpy as np  # type: ignore
+
+from .details import make_details
+from .direct_model import get_mesh
+from .instrument import count_skipped
+
+# pylint: disable=unused-import
+try:
+    from typing import Dict, Any, Optional, Tuple, List
+except ImportError:
+    pass
+else:
+    from .details import CallDetails
+    from .kernel import KernelModel
+    from .modelinfo import ModelInfo
+# pylint: enable=unused-import
+
+#: Seconds per q point per dispersity point for engines that are not
+#: in the calibration.  This is typical of a simple model in a DLL.
+DEFAULT_RATE = 2e-8
+
+_GAUSS_RE = re.compile(r"^lib/gauss(\d+)\.c$")
+
+def gauss_n(model_info):
+    # type: (ModelInfo) -> Optional[int]
+    """
+    Return the gaussian quadrature order *GAUSS_N* used by the model,
+    or None if the model does not use a fixed size gaussian quadrature,
+    such as for models with adaptive quadrature in *lib/gauss_adaptive.c*.
+    """
+    for lib in (model_info.source or []):
+        match = _GAUSS_RE.match(lib)
+        if match:
+            return int(match.group(1))
+    return None
+
+def engine_name(model):
+    # type: (KernelModel) -> str
+    """
+    Return the engine name for a kernel model, such as "DLL[64]", using the
+    same names as :func:`compare.make_engine` and :mod:`benchmark`.
+    """
+    engine_type = model.__class__.__name__.replace('Model', '').upper()
+    bits = model.dtype.itemsize*8
+    precision = "fast" if getattr(model, 'fast', False) else str(bits)
+    if getattr(model, 'mixed', False):
+        precision += "+"
+    return "%s[%s]" % (engine_type, precision)
+
+def make_call_args(model_info, pars, dim='1d'):
+    # type: (ModelInfo, Dict[str, Any], str) -> Tuple[CallDetails, np.ndarray]
+    """
+    Return the :class:`details.CallDetails` and the values vector for
+    evaluating the model with parameters *pars*, without building the
+    model.  This follows :func:`details.make_kernel_args`.
+    """
+    npars = model_info.parameters.npars
+    mesh = get_mesh(model_info, pars, dim=dim)
+    scalars = [value for value, _dispersity, _weight in mesh]
+    _values, dispersity, weights = (zip(*mesh[2:npars+2]) if npars
+                                    else ((), (), ()))
+    length = np.array([len(w) for w in weights], 'i')
+    offset = np.cumsum(np.hstack((0, length)))
+    call_details = make_details(model_info, length, offset[:-1], offset[-1])
+    values = np.hstack((scalars,) + tuple(dispersity) + tuple(weights))
+    return call_details, values
+
+
+class CostModel(object):
+    """
+    Predict the time for a model evaluation.
+
+    *calibration* maps *(model, engine, dim)* to a dictionary with the
+    *rate* in seconds per q point per dispersity point, the *overhead* in
+    seconds per call, and the *gauss_n* used in the calibration.  Use
+    :meth:`from_benchmark` or :meth:`load` to create it from benchmark
+    results.
+    """
+    def __init__(self, calibration=None):
+        # type: (Optional[Dict[Tuple[str, str, str], Dict[str, Any]]]) -> None
+        self.calibration = dict(calibration) if calibration else {}
+        engines = {}  # type: Dict[str, List[float]]
+        for (_, engine, _), entry in self.calibration.items():
+            engines.setdefault(engine, []).append(entry['rate'])
+        #: Median rate for each engine, used for uncalibrated models.
+        self.engine_rates = dict((engine, float(np.median(rates)))
+                                 for engine, rates in engines.items())
+
+    @classmethod
+    def from_benchmark(cls, run):
+        # type: (Dict[str, Any]) -> "CostModel"
+        """
+        Calibrate from the results of :func:`benchmark.run_benchmarks`.
+
+        The rate and overhead for each model, engine and dimension are
+        fitted to the monodisperse and polydisperse timings.
+        """
+        cases = {}  # type: Dict[Tuple[str, str, str], List[Tuple[float, float, Any]]]
+        for result in run['results']:
+            if 'error' in result or not result.get('num_eval'):
+                continue
+            key = result['model'], result['engine_name'], result['dim']
+            work = float(result['npoints'])*result['num_eval']
+            cases.setdefault(key, []).append(
+                (work, result['time_ms']/1000., result.get('gauss_n', None)))
+        calibration = {}
+        for key, points in cases.items():
+            points.sort()
+            (work_lo, time_lo, gauss), (work_hi, time_hi, _) = points[0], points[-1]
+            if work_hi > work_lo and time_hi > time_lo:
+                rate = (time_hi - time_lo)/(work_hi - work_lo)
+                overhead = max(time_lo - rate*work_lo, 0.)
+            else:
+                rate, overhead = time_hi/work_hi, 0.
+            calibration[key] = dict(rate=rate, overhead=overhead, gauss_n=gauss)
+        return cls(calibration)
+
+    @classmethod
+    def load(cls, path):
+        # type: (str) -> "CostModel"
+        """
+        Calibrate from benchmark results saved as JSON in *path*.
+        """
+        with open(path) as fid:
+            return cls.from_benchmark(json.load(fid))
+
+    def _lookup(self, model_id, engine, dim):
+        # type: (str, str, str) -> Dict[str, Any]
+        entry = self.calibration.get((model_id, engine, dim), None)
+        if entry is None:
+            other = '2d' if dim == '1d' else '1d'
+            entry = self.calibration.get((model_id, engine, other), None)
+        if entry is None:
+            rate = self.engine_rates.get(engine, DEFAULT_RATE)
+            entry = dict(rate=rate, overhead=0., gauss_n=None)
+        return entry
+
+    def estimate(self, model, call_details, nq, dim='1d', oversampling=1,
+                 gauss=None, values=None, cutoff=0.):
+        # type: (KernelModel, CallDetails, int, str, int, Optional[int], Optional[np.ndarray], float) -> float
+        """
+        Return the estimated seconds for one evaluation of *model*.
+
+        *call_details* gives the dispersity mesh, *nq* is the number of
+        data points and *oversampling* is the number of q points calculated
+        for each data point for resolution, such as *nr\\*nphi* for 2D
+        pinhole resolution.  *dim* is '1d' or '2d'.  *gauss* overrides
+        the quadrature order of the model.  If the kernel *values* are
+        given, the dispersity points with weight below *cutoff* are not
+        counted.
+        """
+        info = model.info
+        entry = self._lookup(info.id, engine_name(model), dim)
+        num_eval = int(call_details.num_eval)
+        if values is not None and cutoff > 0.:
+            num_eval -= count_skipped(info, call_details, values, cutoff) or 0
+        work = float(nq)*oversampling*max(num_eval, 1)
+        rate = entry['rate']
+        gauss = gauss_n(info) if gauss is None else gauss
+        if dim == '1d' and gauss and entry['gauss_n']:
+            rate *= gauss/entry['gauss_n']
+        return entry['overhead'] + rate*work
+
+    def check(self, model, call_details, nq, budget, **kw):
+        # type: (KernelModel, CallDetails, int, float, **Any) -> float
+        """
+        Raise ValueError if the estimated time for *model* is more than
+        *budget* seconds.  Returns the estimate.  Keyword arguments are
+        passed to :meth:`estimate`.
+        """
+        seconds = self.estimate(model, call_details, nq, **kw)
+        if seconds > budget:
+            raise ValueError(
+                "%s with %d dispersity points at %d q points will take about"
+                " %.3g s, which is more than %.3g s"
+                % (model.info.id, call_details.num_eval, nq, seconds, budget))
+        return seconds
+
+    def limit_dispersity(self, model, pars, nq, budget, dim='1d', **kw):
+        # type: (KernelModel, Dict[str, Any], int, float, str, **Any) -> Dict[str, Any]
+        """
+        Return a copy of *pars* with fewer dispersity points so that the
+        estimated time is within *budget* seconds.
+
+        The number of points *name_pd_n* for each active dispersity
+        parameter is reduced by the same factor.  Raises ValueError if
+        the model does not fit the budget even without dispersity.
+        Keyword arguments are passed to :meth:`estimate`.
+        """
+        pars = dict(pars)
+        info = model.info
+        while True:
+            details, values = make_call_args(info, pars, dim=dim)
+            if 'cutoff' in kw:
+                kw['values'] = values
+            seconds = self.estimate(model, details, nq, dim=dim, **kw)
+            if seconds <= budget:
+                return pars
+            active = [info.parameters.call_parameters[int(k)+2].name
+                      for k in details.pd_par[:details.num_active]]
+            if not active:
+                # Raises the error since no dispersity is left to remove.
+                self.check(model, details, nq, budget, dim=dim, **kw)
+            # Shrink each loop so the total shrinks by about the ratio
+            # of the budget to the estimate.
+            entry = self._lookup(info.id, engine_name(model), dim)
+            overhead = entry['overhead']
+            ratio = max(budget - overhead, 0.)/max(seconds - overhead, 1e-300)
+            scale = ratio**(1./len(active))
+            for name in active:
+                n = int(pars[name + '_pd_n'])
+                pars[name + '_pd_n'] = max(min(int(n*scale), n-1), 0)
+
+
+def test_cost():
+    # type: () -> None
+    """
+    Check calibration, estimates and limiting dispersity.
+    """
+    from .core import load_model_info, build_model
+    from .generate import set_integration_size
+    info = load_model_info('cylinder')
+    assert gauss_n(info) is None
+    set_integration_size(info, 76)
+    model = build_model(info, dtype='double', platform='dll')
+    engine = engine_name(model)
+    assert engine == "DLL[64]"
+    assert gauss_n(model.info) == 76
+    run = {'results': [
+        dict(model='cylinder', engine_name=engine, dim='1d', npoints=100,
+             num_eval=1, gauss_n=76, time_ms=1.1),
+        dict(model='cylinder', engine_name=engine, dim='1d', npoints=100,
+             num_eval=1001, gauss_n=76, time_ms=101.1),
+        ]}
+    costs = CostModel.from_benchmark(run)
+    entry = costs.calibration['cylinder', engine, '1d']
+    assert np.allclose([entry['rate'], entry['overhead']], [1e-6, 1e-3])
+
+    pars = dict(radius=20, radius_pd=0.1, radius_pd_n=40,
+                length=400, length_pd=0.1, length_pd_n=25)
+    details, values = make_call_args(model.info, pars)
+    assert details.num_eval == 1000
+    assert np.allclose(costs.estimate(model, details, 100), 0.101)
+    assert costs.estimate(model, details, 100, values=values,
+                          cutoff=1e-3) < 0.101
+    assert np.allclose(costs.estimate(model, details, 100, gauss=152),
+                       0.201)
+    try:
+        costs.check(model, details, 100, budget=0.05)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("cost check should fail")
+    limited = costs.limit_dispersity(model, pars, 100, budget=0.05)
+    limited_details, _ = make_call_args(model.info, limited)
+    assert 0 < limited_details.num_eval < 500
+    assert costs.check(model, limited_details, 100, budget=0.05) <= 0.05
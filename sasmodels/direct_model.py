@@ -22,6 +22,9 @@ on the individual parameters and send the model to the Bumps optimizers.
 """
 from __future__ import print_function
 
+import threading
+import weakref
+
 import numpy as np  # type: ignore
 
 # TODO: fix sesans module
@@ -29,19 +32,27 @@ from . import sesans  # type: ignore
 from . import weights
 from . import resolution
 from . import resolution2d
+from . import instrument
 from .details import make_kernel_args, dispersion_mesh
+from .kernel import q_vectors_key
 
 # pylint: disable=unused-import
 try:
-    from typing import Optional, Dict, Tuple
+    from typing import Optional, Dict, Tuple, Iterator, List, Any, Set
 except ImportError:
     pass
 else:
     from .data import Data
     from .kernel import Kernel, KernelModel
     from .modelinfo import Parameter, ParameterSet
+    from .resolution import Resolution
 # pylint: enable=unused-import
 
+#: Default number of q points calculated at once when evaluating the theory
+#: in pieces.  Each point needs a few doubles for q and the result, so
+#: this bounds the kernel memory at a few tens of megabytes.
+CHUNK_SIZE = 2**20
+
 def call_kernel(calculator, pars, cutoff=0., mono=False):
     # type: (Kernel, ParameterSet, float, bool) -> np.ndarray
     """
@@ -56,10 +67,15 @@ def call_kernel(calculator, pars, cutoff=0., mono=False):
 
     *mono* is True if polydispersity should be set to none on all parameters.
     """
+    instrumented = instrument.ENABLED
+    if instrumented:
+        start_time = instrument.clock()
     mesh = get_mesh(calculator.info, pars, dim=calculator.dim, mono=mono)
     #print("pars", list(zip(*mesh))[0])
     call_details, values, is_magnetic = make_kernel_args(calculator, mesh)
     #print("values:", values)
+    if instrumented:
+        instrument.add_time(calculator, 'args', instrument.clock()-start_time)
     return calculator(call_details, values, cutoff, is_magnetic)
 
 def call_ER(model_info, pars):
@@ -191,10 +207,86 @@ def _make_sesans_transform(data):
     Rmax = 10000000
     hankel = sesans.SesansTransform(data.x, SElength,
                                     data.source.wavelength,
-                                    zaccept, Rmax)
+                                    zaccept, Rmax, cache=True)
     return hankel
 
 
+class SharedKernel(object):
+    """
+    Kernel for *model* at *q_vectors* shared by all the data sets with
+    the same model and q, such as in a simultaneous fit.  Use
+    :func:`get_shared_kernel` to find or create it.
+
+    The kernel remembers its most recent calculation, which is reused when
+    a call from another data set has the same parameters apart from *scale*
+    and *background*.  This avoids repeating the calculation for data sets
+    which only differ in scale and background.  The result is only reused
+    within one pass over the data sets: a data set calling again with the
+    same parameters, such as when timing repeated evaluations, gets a new
+    calculation.  Calls are serialized by *lock* since the kernel result
+    buffer is shared.
+    """
+    def __init__(self, model, q_vectors):
+        # type: (KernelModel, List[np.ndarray]) -> None
+        # Holding the model keeps its id from being reused for another model
+        # while the kernel is in the shared kernel table.
+        self.model = model
+        self.kernel = model.make_kernel(q_vectors)
+        self.lock = threading.Lock()
+        self._last_key = None  # type: Any
+        self._last_value = None  # type: np.ndarray
+        self._last_users = set()  # type: Set[object]
+
+    def __call__(self, pars, cutoff, user=None):
+        # type: (ParameterSet, float, Any) -> np.ndarray
+        """
+        Return the model at *pars* with *scale=1* and *background=0*.
+
+        *user* is a token identifying the data set making the call.  The
+        previous result is returned if it has the same parameters and *user*
+        has not yet received it.  The tokens are held until the next
+        calculation, so a token can't be confused with one from a data set
+        which has since been freed, as could happen with *id(data)*.
+        """
+        pars = pars.copy()
+        pars['scale'], pars['background'] = 1., 0.
+        key = (cutoff, sorted(pars.items()))
+        with self.lock:
+            if key != self._last_key or user in self._last_users:
+                self._last_value = call_kernel(self.kernel, pars, cutoff=cutoff)
+                self._last_key = key
+                self._last_users = set()
+            self._last_users.add(user)
+            return self._last_value
+
+    def release(self):
+        # type: () -> None
+        """
+        Free the kernel resources.
+        """
+        self.kernel.release()
+        self._last_key = self._last_value = None
+        self._last_users = set()
+
+_SHARED_KERNELS = weakref.WeakValueDictionary()  # type: Dict[Any, SharedKernel]
+_SHARED_KERNELS_LOCK = threading.Lock()
+
+def get_shared_kernel(model, q_vectors):
+    # type: (KernelModel, List[np.ndarray]) -> SharedKernel
+    """
+    Return the :class:`SharedKernel` for *model* at *q_vectors*.
+
+    The kernel is shared for as long as any of its users holds on to it.
+    """
+    key = id(model), q_vectors_key(q_vectors)
+    with _SHARED_KERNELS_LOCK:
+        shared = _SHARED_KERNELS.get(key, None)
+        if shared is None:
+            shared = SharedKernel(model, q_vectors)
+            _SHARED_KERNELS[key] = shared
+    return shared
+
+
 class DataMixin(object):
     """
     DataMixin captures the common aspects of evaluating a SAS model for a
@@ -216,6 +308,9 @@ class DataMixin(object):
     possibly with random noise added.  This is useful for simulating a
     dataset with the results from :meth:`_calc_theory`.
     """
+    _shared_kernel = None  # type: SharedKernel
+    _shared_token = None  # type: object
+
     def _interpret_data(self, data, model):
         # type: (Data, KernelModel) -> None
         # pylint: disable=attribute-defined-outside-init
@@ -259,7 +354,9 @@ class DataMixin(object):
             res = resolution2d.Pinhole2D(data=data, index=index,
                                          nsigma=3.0, accuracy=accuracy)
             #self._theory = np.zeros_like(self.Iq)
-            q_vectors = res.q_calc
+            # The over sampled q_calc can be much larger than the data, so
+            # only build it if the theory is calculated all at once.
+            q_vectors = None
         elif self.data_type == 'Iq':
             index = (data.x >= data.qmin) & (data.x <= data.qmax)
             if data.y is not None:
@@ -307,6 +404,7 @@ class DataMixin(object):
         # so we can save/restore state
         self._kernel_inputs = q_vectors
         self._kernel = None
+        self._shared_kernel = None
         self.Iq, self.dIq, self.index = Iq, dIq, index
         self.resolution = res
 
@@ -341,21 +439,35 @@ class DataMixin(object):
 
     def _calc_theory(self, pars, cutoff=0.0):
         # type: (ParameterSet, float) -> np.ndarray
-        if self._kernel is None:
-            self._kernel = self._model.make_kernel(self._kernel_inputs)
-
-        # Need to pull background out of resolution for multiple scattering
+        if getattr(self, 'chunk_size', None):
+            return self._fill_theory(pars, cutoff=cutoff)
+        if self._kernel_inputs is None:
+            self._kernel_inputs = self.resolution.q_calc
+        if self._kernel is None or self._shared_kernel is None:
+            self._shared_kernel = get_shared_kernel(
+                self._model, self._kernel_inputs)
+            self._kernel = self._shared_kernel.kernel
+            self._shared_token = object()
+
+        # Need to pull background out of resolution for multiple scattering.
+        # Scale is pulled out as well so that data sets which share the
+        # kernel and only differ in scale and background share the result.
         background = pars.get('background', 0.)
-        pars = pars.copy()
-        pars['background'] = 0.
-
-        Iq_calc = call_kernel(self._kernel, pars, cutoff=cutoff)
+        scale = pars.get('scale', 1.)
+        Iq_calc = scale*self._shared_kernel(pars, cutoff,
+                                            user=self._shared_token)
         # Storing the calculated Iq values so that they can be plotted.
         # Only applies to oriented USANS data for now.
         # TODO: extend plotting of calculate Iq to other measurement types
         # TODO: refactor so we don't store the result in the model
         self.Iq_calc = Iq_calc
+        instrumented = instrument.ENABLED
+        if instrumented:
+            start_time = instrument.clock()
         result = self.resolution.apply(Iq_calc)
+        if instrumented:
+            instrument.add_time(self._kernel, 'resolution',
+                                instrument.clock()-start_time)
         if hasattr(self.resolution, 'nx'):
             self.Iq_calc = (
                 self.resolution.qx_calc, self.resolution.qy_calc,
@@ -363,6 +475,62 @@ class DataMixin(object):
             )
         return result + background
 
+    def _iter_theory(self, pars, cutoff=0.0, chunk_size=None):
+        # type: (ParameterSet, float, Optional[int]) -> Iterator[Tuple[slice, np.ndarray]]
+        """
+        Yield *(index, theory)* for successive pieces of the data.
+
+        Each piece calculates at most *chunk_size* q points (default
+        :data:`CHUNK_SIZE`), including the points added for resolution,
+        using a kernel which is released before the next piece starts.
+        Resolution functions which cannot be split, such as 1D pinhole
+        and slit resolution, are evaluated in one piece.
+        """
+        res = self.resolution
+        if not hasattr(res, 'subset'):
+            yield slice(None), self._calc_theory_at(res, pars, cutoff)
+            return
+        chunk_size = chunk_size or CHUNK_SIZE
+        step = max(chunk_size // res.oversampling, 1)
+        n = len(res.qx_data)
+        for start in range(0, n, step):
+            stop = min(start + step, n)
+            part = res.subset(start, stop)
+            yield slice(start, stop), self._calc_theory_at(part, pars, cutoff)
+
+    def _fill_theory(self, pars, cutoff=0.0, out=None, chunk_size=None):
+        # type: (ParameterSet, float, Optional[np.ndarray], Optional[int]) -> np.ndarray
+        """
+        Calculate the theory piece by piece into *out*.
+
+        *out* can be any writable array of the right length, such as
+        a :class:`numpy.memmap`.  If it is None, a new array is returned.
+        """
+        # pylint: disable=attribute-defined-outside-init
+        if chunk_size is None:
+            chunk_size = getattr(self, 'chunk_size', None)
+        if out is None:
+            res = self.resolution
+            npts = len(res.qx_data) if hasattr(res, 'qx_data') else len(res.q)
+            out = np.empty(npts, 'd')
+        for index, theory in self._iter_theory(pars, cutoff, chunk_size):
+            out[index] = theory
+        # The calculated Iq for the full detector is not kept.
+        self.Iq_calc = None
+        return out
+
+    def _calc_theory_at(self, res, pars, cutoff):
+        # type: (Resolution, ParameterSet, float) -> np.ndarray
+        background = pars.get('background', 0.)
+        pars = pars.copy()
+        pars['background'] = 0.
+        kernel = self._model.make_kernel(res.q_calc)
+        try:
+            Iq_calc = call_kernel(kernel, pars, cutoff=cutoff)
+        finally:
+            kernel.release()
+        return res.apply(Iq_calc) + background
+
 
 class DirectModel(DataMixin):
     """
@@ -373,11 +541,17 @@ class DirectModel(DataMixin):
     *model* is a model calculator return from :func:`generate.load_model`
 
     *cutoff* is the polydispersity weight cutoff.
+
+    *chunk_size* is the maximum number of q points to calculate at once,
+    including the points added for resolution.  Use this for very large
+    2D detectors so that memory use does not grow with the detector size.
+    The default is to calculate all points at once.
     """
-    def __init__(self, data, model, cutoff=1e-5):
-        # type: (Data, KernelModel, float) -> None
+    def __init__(self, data, model, cutoff=1e-5, chunk_size=None):
+        # type: (Data, KernelModel, float, Optional[int]) -> None
         self.model = model
         self.cutoff = cutoff
+        self.chunk_size = chunk_size
         # Note: _interpret_data defines the model attributes
         self._interpret_data(data, model)
 
@@ -385,6 +559,27 @@ class DirectModel(DataMixin):
         # type: (**float) -> np.ndarray
         return self._calc_theory(pars, cutoff=self.cutoff)
 
+    def fill(self, out, **pars):
+        # type: (np.ndarray, **float) -> np.ndarray
+        """
+        Calculate the theory into *out* in pieces of at most *chunk_size*
+        q points (default :data:`CHUNK_SIZE`).
+
+        *out* can be a :class:`numpy.memmap` so that the result for a large
+        detector need not fit in memory.  Returns *out*.
+        """
+        return self._fill_theory(pars, cutoff=self.cutoff, out=out)
+
+    def iter_chunks(self, **pars):
+        # type: (**float) -> Iterator[Tuple[slice, np.ndarray]]
+        """
+        Yield *(index, Iq)* for successive pieces of the data, with
+        at most *chunk_size* q points (default :data:`CHUNK_SIZE`)
+        calculated for each piece.
+        """
+        return self._iter_theory(pars, cutoff=self.cutoff,
+                                 chunk_size=self.chunk_size)
+
     def simulate_data(self, noise=None, **pars):
         # type: (Optional[float], **float) -> None
         """
@@ -400,6 +595,57 @@ class DirectModel(DataMixin):
         """
         return call_profile(self.model.info, **pars)
 
+def test_chunked():
+    # type: () -> None
+    """
+    Test that calculating 2D data in pieces matches the full calculation.
+    """
+    import tempfile
+    from .data import empty_data2D
+    from .core import load_model
+    model = load_model('cylinder')
+    pars = dict(radius=20, length=200, theta=30, phi=10, background=0.1)
+    q = np.linspace(-0.1, 0.1, 33)
+    for resolution in (0.0, 0.05):
+        data = empty_data2D(q, resolution=resolution)
+        target = DirectModel(data, model)(**pars)
+        chunked = DirectModel(data, model, chunk_size=500)
+        assert np.allclose(chunked(**pars), target)
+        npieces = len(list(chunked.iter_chunks(**pars)))
+        assert npieces > 1
+        with tempfile.TemporaryFile() as fid:
+            out = np.memmap(fid, dtype='d', shape=target.shape)
+            chunked.fill(out, **pars)
+            assert np.allclose(out, target)
+
+def test_shared_kernel():
+    # type: () -> None
+    """
+    Test that data sets with the same q share the kernel and the results.
+    """
+    from .data import empty_data1D
+    from .core import load_model
+    model = load_model('sphere')
+    q = np.logspace(-3, -1, 50)
+    first = DirectModel(empty_data1D(q), model)
+    second = DirectModel(empty_data1D(q.copy()), model)
+    other = DirectModel(empty_data1D(2*q), model)
+    target = first(radius=50, scale=0.1, background=0.01)
+    shared = first._shared_kernel
+    value = shared._last_value
+    actual = second(radius=50, scale=0.2, background=0.02)
+    assert second._shared_kernel is shared and shared._last_value is value
+    assert shared._last_users == set((first._shared_token,
+                                      second._shared_token))
+    assert np.allclose(actual - 0.02, 2*(target - 0.01))
+    other(radius=50)
+    assert other._shared_kernel is not shared
+    first(radius=50)
+    assert shared._last_value is not value
+    value = shared._last_value
+    second(radius=60)
+    assert shared._last_value is not value
+
 def main():
     # type: () -> None
     """
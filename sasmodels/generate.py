@@ -157,6 +157,15 @@ source files the model depends on, and :func:`timestamp` returns
 the latest time stamp amongst the source files (so you can check if
 the model needs to be rebuilt).
 
+The results of :func:`make_source` and :func:`convert_type` are cached in
+memory, and the converted sources are also cached on disk in
+*SOURCE_CACHE_PATH*, so that building a model a second time, even in a
+new session, does not need to redo the text processing.  Set the
+environment variable SAS_SOURCE_CACHE to the directory for the disk cache,
+or to "none" to disable it.  Only the most recently used
+*SOURCE_CACHE_DISK_SIZE* files are kept in the disk cache.  Use
+:func:`clear_source_cache` to clear the memory cache.
+
 The function :func:`make_doc` extracts the doc string and adds the
 parameter table to the top.  *make_figure* in *sasmodels/doc/genmodel*
 creates the default figure for the model.  [These two sets of code
@@ -168,10 +177,17 @@ from __future__ import print_function
 #__all__ = ["model_info", "make_doc", "make_source", "convert_type"]
 
 import sys
+import os
 from os import environ
-from os.path import abspath, dirname, join as joinpath, exists, getmtime, sep
+from os.path import (abspath, dirname, expanduser, join as joinpath, exists,
+                     getmtime, sep)
+import io
 import re
 import string
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
 from zlib import crc32
 from inspect import currentframe, getframeinfo
 import logging
@@ -183,8 +199,8 @@ from .custom import load_custom_kernel_module
 
 # pylint: disable=unused-import
 try:
-    from typing import Tuple, Sequence, Iterator, Dict
-    from .modelinfo import ModelInfo
+    from typing import Tuple, Sequence, Iterator, Dict, List, Optional, Any
+    from .modelinfo import ModelInfo, ParameterTable
 except ImportError:
     pass
 # pylint: enable=unused-import
@@ -225,6 +241,19 @@ try:  # CRUFT: older numpy does not support float128
 except TypeError:
     F128 = None
 
+#: Directory for the converted sources cached between sessions, or None
+#: if they are only cached in memory.
+SOURCE_CACHE_PATH = environ.get(
+    'SAS_SOURCE_CACHE',
+    joinpath(expanduser("~"), ".sasmodels", "source_cache"))
+if SOURCE_CACHE_PATH.lower() == "none":
+    SOURCE_CACHE_PATH = None
+#: Maximum number of generated and converted sources kept in memory.
+SOURCE_CACHE_SIZE = 64
+#: Maximum number of converted sources kept in *SOURCE_CACHE_PATH*.  The
+#: least recently used files are removed when a new file is saved.
+SOURCE_CACHE_DISK_SIZE = 256
+
 # Conversion from units defined in the parameter table for each model
 # to units displayed in the sphinx documentation.
 # This section associates the unit with the macro to use to produce the LaTex
@@ -280,22 +309,52 @@ DOC_HEADER = """.. _%(id)s:
 """
 
 
+#: Library with the adaptive gaussian quadrature rules from
+#: :func:`gengauss.genadaptive`.
+GAUSS_ADAPTIVE = "lib/gauss_adaptive.c"
+_GAUSS_FIXED_RE = re.compile(r"^lib/gauss\d+\.c$")
+
 def set_integration_size(info, n):
     # type: (ModelInfo, int) -> None
     """
     Update the model definition, replacing the gaussian integration with
-    a gaussian integration of a different size.
+    a gaussian integration of a different size.  Models using the adaptive
+    rules in *lib/gauss_adaptive.c* use the fixed size rule for all q.
 
     Note: this really ought to be a method in modelinfo, but that leads to
     import loops.
     """
-    if info.source and any(lib.startswith('lib/gauss') for lib in info.source):
-        from .gengauss import gengauss
-        path = joinpath(MODEL_PATH, "lib", "gauss%d.c"%n)
-        if not exists(path):
-            gengauss(n, path)
-        info.source = ["lib/gauss%d.c"%n if lib.startswith('lib/gauss')
-                       else lib for lib in info.source]
+    if not info.source:
+        return
+    has_fixed = any(_GAUSS_FIXED_RE.match(lib) for lib in info.source)
+    if not has_fixed and GAUSS_ADAPTIVE not in info.source:
+        return
+    from .gengauss import gengauss
+    lib_n = "lib/gauss%d.c"%n
+    path = joinpath(MODEL_PATH, "lib", "gauss%d.c"%n)
+    if not exists(path):
+        gengauss(n, path)
+    source = [lib_n if _GAUSS_FIXED_RE.match(lib) else lib
+              for lib in info.source]
+    if not has_fixed:
+        # The fixed rule must come first so the adaptive library sees it.
+        source.insert(source.index(GAUSS_ADAPTIVE), lib_n)
+    info.source = source
+
+def forced_integration_size(info):
+    # type: (ModelInfo) -> Optional[int]
+    """
+    Return the size of the gaussian integration set by
+    :func:`set_integration_size` for a model using adaptive quadrature,
+    or None if the model is using the adaptive rules or has no adaptive
+    quadrature.
+    """
+    if not info.source or GAUSS_ADAPTIVE not in info.source:
+        return None
+    for lib in info.source:
+        if _GAUSS_FIXED_RE.match(lib):
+            return int(lib[len("lib/gauss"):-len(".c")])
+    return None
 
 def format_units(units):
     # type: (str) -> str
@@ -366,6 +425,8 @@ def dll_timestamp(model_info):
     Return a timestamp for the model corresponding to the most recently
     changed file or dependency.
     """
+    if model_info.composition is not None:
+        return max(dll_timestamp(part) for part in model_info.composition[1])
     # TODO: fails DRY; templates appear two places.
     model_templates = [joinpath(DATA_PATH, filename)
                        for filename in ('kernel_header.c', 'kernel_iq.c')]
@@ -386,6 +447,8 @@ def ocl_timestamp(model_info):
     Note that this does not look at the time stamps for the OpenCL header
     information since that need not trigger a recompile of the DLL.
     """
+    if model_info.composition is not None:
+        return max(ocl_timestamp(part) for part in model_info.composition[1])
     # TODO: fails DRY; templates appear two places.
     model_templates = [joinpath(DATA_PATH, filename)
                        for filename in ('kernel_header.c', 'kernel_iq.c')]
@@ -409,6 +472,100 @@ def tag_source(source):
         pass
     return "%08X"%(0xffffffff&crc32(source))
 
+_source_cache = OrderedDict()  # type: Dict[Any, Any]
+_source_cache_lock = threading.Lock()
+
+def clear_source_cache():
+    # type: () -> None
+    """
+    Clear the generated and converted sources cached in memory.  The
+    disk cache is not affected.
+    """
+    with _source_cache_lock:
+        _source_cache.clear()
+
+def _cache_get(key):
+    # type: (Any) -> Any
+    with _source_cache_lock:
+        return _source_cache.get(key, None)
+
+def _cache_put(key, value):
+    # type: (Any, Any) -> None
+    with _source_cache_lock:
+        _source_cache[key] = value
+        while len(_source_cache) > SOURCE_CACHE_SIZE:
+            _source_cache.popitem(last=False)
+
+def _converted_source_key(source, dtype):
+    # type: (str, np.dtype) -> str
+    """
+    Return the cache key for *source* converted to *dtype*.  This
+    includes the time stamp of this file so that changes to the
+    conversion don't use stale results.
+    """
+    digest = hashlib.sha1(source.encode('utf8'))
+    digest.update(("%s %s" % (np.dtype(dtype).str, getmtime(__file__)))
+                  .encode('utf8'))
+    return digest.hexdigest()
+
+def _load_cached_source(key):
+    # type: (str) -> Optional[str]
+    if SOURCE_CACHE_PATH is None:
+        return None
+    path = joinpath(SOURCE_CACHE_PATH, key + ".c")
+    try:
+        with io.open(path, encoding='utf8') as fid:
+            source = fid.read()
+        os.utime(path, None)  # mark as recently used
+        return source
+    except (IOError, OSError):
+        return None
+
+def _save_cached_source(key, source):
+    # type: (str, str) -> None
+    """
+    Save the converted source to the disk cache.  The file is written
+    under a temporary name and moved into place so that other processes
+    never see a partial file.  Failure to save is not an error.
+    """
+    if SOURCE_CACHE_PATH is None:
+        return
+    path = joinpath(SOURCE_CACHE_PATH, key + ".c")
+    try:
+        if not exists(SOURCE_CACHE_PATH):
+            os.makedirs(SOURCE_CACHE_PATH)
+        system_fd, filename = tempfile.mkstemp(suffix=".tmp",
+                                               dir=SOURCE_CACHE_PATH)
+        with io.open(system_fd, "w", encoding='utf8') as fid:
+            fid.write(source)
+        getattr(os, 'replace', os.rename)(filename, path)
+        _prune_cached_sources()
+    except (IOError, OSError) as exc:
+        logger.info("could not cache source in %s: %s", path, exc)
+
+def _prune_cached_sources():
+    # type: () -> None
+    """
+    Remove the least recently used files from the disk cache so that at
+    most *SOURCE_CACHE_DISK_SIZE* remain.
+    """
+    paths = [joinpath(SOURCE_CACHE_PATH, f)
+             for f in os.listdir(SOURCE_CACHE_PATH) if f.endswith(".c")]
+    if len(paths) <= SOURCE_CACHE_DISK_SIZE:
+        return
+    times = []
+    for path in paths:
+        try:
+            times.append((getmtime(path), path))
+        except OSError:  # removed by another process
+            pass
+    times.sort()
+    for _, path in times[:len(times) - SOURCE_CACHE_DISK_SIZE]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
 def convert_type(source, dtype):
     # type: (str, np.dtype) -> str
     """
@@ -416,7 +573,21 @@ def convert_type(source, dtype):
 
     Floating point constants are tagged with 'f' for single precision or 'L'
     for long double precision.
+
+    The result is cached in memory and in *SOURCE_CACHE_PATH*.
     """
+    key = _converted_source_key(source, dtype)
+    result = _cache_get(key)
+    if result is None:
+        result = _load_cached_source(key)
+        if result is None:
+            result = _convert_source(source, dtype)
+            _save_cached_source(key, result)
+        _cache_put(key, result)
+    return result
+
+def _convert_source(source, dtype):
+    # type: (str, np.dtype) -> str
     source = _fix_tgmath_int(source)
     if dtype == F16:
         fbytes = 2
@@ -595,14 +766,78 @@ a3.e2 - 0.f
         assert case_out == out, "%r => %r"%(case_in, out)
 
 
-def kernel_name(model_info, variant):
-    # type: (ModelInfo, str) -> str
+def test_source_cache():
+    # type: () -> None
+    """
+    Check that cached sources match and that they follow model changes.
+    """
+    from copy import copy
+    from .core import load_model_info
+    from .modelinfo import ParameterTable
+    info = load_model_info('cylinder')
+    source = make_source(info)
+    assert make_source(info) == source
+    assert make_source(load_model_info('cylinder')) == source
+    set_integration_size(info, 20)
+    assert make_source(info) != source
+    assert info.source.index('lib/gauss20.c') + 1 == info.source.index(GAUSS_ADAPTIVE)
+    assert forced_integration_size(info) == 20
+    set_integration_size(info, 76)
+    assert forced_integration_size(info) == 76 and 'lib/gauss20.c' not in info.source
+
+    # A model with the same name and files but a different parameter table,
+    # such as one built in memory, gets its own source.
+    changed = load_model_info('cylinder')
+    pars = list(changed.parameters.kernel_parameters)
+    pars[0] = copy(pars[0])
+    pars[0].id = pars[0].name = 'contrast'
+    changed.parameters = ParameterTable(pars)
+    assert 'contrast' in make_source(changed)['dll']
+    assert 'contrast' not in make_source(load_model_info('cylinder'))['dll']
+    double = source['dll']
+    single = convert_type(double, F32)
+    assert single == _convert_source(double, F32)
+    clear_source_cache()
+    assert convert_type(double, F32) == single
+    assert convert_type(double, F64) == _convert_source(double, F64)
+
+def test_source_cache_size():
+    # type: () -> None
+    """
+    Check that the disk cache keeps only the most recently used sources.
+    """
+    import shutil
+    global SOURCE_CACHE_PATH, SOURCE_CACHE_DISK_SIZE
+    saved = SOURCE_CACHE_PATH, SOURCE_CACHE_DISK_SIZE
+    SOURCE_CACHE_PATH = tempfile.mkdtemp(prefix="sas_source_cache_")
+    SOURCE_CACHE_DISK_SIZE = 2
+    try:
+        for k in range(4):
+            _save_cached_source("key%d" % k, "source %d" % k)
+            os.utime(joinpath(SOURCE_CACHE_PATH, "key%d.c" % k), (k, k))
+        assert sorted(os.listdir(SOURCE_CACHE_PATH)) == ["key2.c", "key3.c"]
+        assert _load_cached_source("key3") == "source 3"
+    finally:
+        shutil.rmtree(SOURCE_CACHE_PATH, ignore_errors=True)
+        SOURCE_CACHE_PATH, SOURCE_CACHE_DISK_SIZE = saved
+
+
+#: Numbers of active dispersity loops for which the Iq and Iqxy kernels
+#: are specialized, in addition to the generic kernels.
+SPECIALIZED_LOOPS = (0, 1)
+
+def kernel_name(model_info, variant, num_loops=None):
+    # type: (ModelInfo, str, Optional[int]) -> str
     """
     Name of the exported kernel symbol.
 
-    *variant* is "Iq", "Iqxy" or "Imagnetic".
+    *variant* is "Iq", "Iqxy" or "Imagnetic".  If *num_loops* is given,
+    then return the name of the kernel specialized for that number of
+    active dispersity loops.
     """
-    return model_info.name + "_" + variant
+    # Product models are named P@S, but '@' is not valid in a C identifier.
+    name = model_info.name.replace('@', '_') + "_" + variant
+    return name if num_loops is None else "%s_pd%d" % (name, num_loops)
 
 
 def indent(s, depth):
@@ -716,10 +951,62 @@ def make_source(model_info):
 
     Uses source files found in the given search path.  Returns None if this
     is a pure python model, with no C source components.
+
+    If *model_info* is a product model P@S, then this generates a single
+    fused kernel which computes P and multiplies by S at the same q.  See
+    :func:`product.make_fused_parameters` for the parameter table it uses.
+
+    The result is cached in memory, keyed by a hash of the source files,
+    C code and parameter table used to generate it.
     """
     if callable(model_info.Iq):
         raise ValueError("can't compile python model")
         #return None
+    key = ('make_source', model_info.name, PROJECTION,
+           _source_signature(model_info))
+    result = _cache_get(key)
+    if result is None:
+        result = _make_source(model_info)
+        _cache_put(key, result)
+    return dict(result)
+
+def _source_signature(model_info):
+    # type: (ModelInfo) -> Tuple[Any, ...]
+    """
+    Return a hash of the inputs used to generate the source for the model,
+    which are the source files, the kernel templates, the C code and the
+    parameter table.  This uses the file contents rather than their time
+    stamps so that models changed within the time stamp resolution, or
+    built in memory without a file, don't get stale source.
+    """
+    if model_info.composition is not None:
+        composition_type, parts = model_info.composition
+        return (composition_type,) + tuple(_source_signature(part)
+                                           for part in parts)
+    digest = hashlib.sha1()
+    templates = [joinpath(DATA_PATH, filename)
+                 for filename in ('kernel_header.c', 'kernel_iq.c')]
+    for path in model_sources(model_info) + templates:
+        with open(path, 'rb') as fid:
+            digest.update(fid.read())
+    code = tuple(None if callable(value) else value
+                 for value in [getattr(model_info, name, None)
+                               for name in ('c_code',) + _KERNEL_FUNCTIONS])
+    partable = model_info.parameters
+    pars = [sorted(vars(p).items()) for p in partable.kernel_parameters]
+    digest.update(repr((model_info.id, model_info.name, code,
+                        sorted((model_info.lineno or {}).items()), pars,
+                        partable.max_pd, getmtime(__file__)))
+                  .encode('utf8'))
+    return digest.hexdigest()
+
+def _make_source(model_info):
+    # type: (ModelInfo) -> Dict[str, str]
+    if model_info.composition is not None:
+        composition_type, parts = model_info.composition
+        if composition_type != 'product':
+            raise ValueError("can't compile %s model" % composition_type)
+        return _make_product_source(model_info, *parts)
 
     # TODO: need something other than volume to indicate dispersion parameters
     # No volume normalization despite having a volume parameter.
@@ -735,18 +1022,118 @@ def make_source(model_info):
     # Load templates and user code
     kernel_header = load_template('kernel_header.c')
     kernel_code = load_template('kernel_iq.c')
-    user_code = [(f, open(f).read()) for f in model_sources(model_info)]
 
     # Build initial sources
     source = []
     _add_source(source, *kernel_header)
-    for path, code in user_code:
-        _add_source(source, code, path)
+    source.extend(_model_source(model_info))
+    xy_mode = _check_xy_mode(partable, source)
+
+    # Define the parameter table
+    source.extend(_parameter_table(partable))
+
+    # Define the function calls
+    call_volume, call_iq, call_iqxy, clear_iqxy = _call_macros(partable, xy_mode)
+    source.append(call_volume)
+    source.extend(_simd_declarations(partable, xy_mode))
+    source.extend(_parameter_counts(partable))
+
+    # TODO: allow mixed python/opencl kernels?
+
+    ocl = _kernels(kernel_code, call_iq, call_iqxy, clear_iqxy, model_info,
+                   partable.max_pd)
+    dll = _kernels(kernel_code, call_iq, call_iqxy, clear_iqxy, model_info,
+                   partable.max_pd)
+    result = {
+        'dll': '\n'.join(source+dll[0]+dll[1]+dll[2]),
+        'opencl': '\n'.join(source+ocl[0]+ocl[1]+ocl[2]),
+    }
+
+    return result
+
+
+# Kernel functions which need to be renamed when P and S are compiled together.
+_KERNEL_FUNCTIONS = ('form_volume', 'Iq', 'Iqxy', 'Iqac', 'Iqabc')
+def _make_product_source(model_info, p_info, s_info):
+    # type: (ModelInfo, ModelInfo, ModelInfo) -> Dict[str, str]
+    """
+    Generate the fused P@S kernel.
+
+    The P and S sources are included with their kernel functions renamed
+    to P_Iq, S_Iq, etc.  The dispersity loop runs over P only, and the
+    result is multiplied by *CALL_SQ* at each q once the loop is complete.
+    The effective radius and volume fraction for S are supplied by the
+    caller in the parameter table.
+    """
+    from .product import make_fused_parameters
+
+    for part in (p_info, s_info):
+        if callable(part.Iq) or part.composition is not None:
+            raise ValueError("can't fuse %s into a product kernel" % part.name)
+    partable = make_fused_parameters(p_info, s_info)
+    s_table = partable.kernel_parameters[len(p_info.parameters.kernel_parameters):]
+
+    kernel_header = load_template('kernel_header.c')
+    kernel_code = load_template('kernel_iq.c')
+
+    source = []
+    _add_source(source, *kernel_header)
+    # Library files used by both P and S are only included once.
+    seen = set()
+    for prefix, part in (('P_', p_info), ('S_', s_info)):
+        source.extend("#define %s %s%s" % (name, prefix, name)
+                      for name in _KERNEL_FUNCTIONS)
+        part_source = _model_source(part, seen)
+        if part is p_info:
+            xy_mode = _check_xy_mode(p_info.parameters, part_source)
+        source.extend(part_source)
+        source.extend("#undef %s" % name for name in _KERNEL_FUNCTIONS)
+
+    source.extend(_parameter_table(partable))
+    call_volume, call_iq, call_iqxy, clear_iqxy = _call_macros(
+        p_info.parameters, xy_mode, prefix='P_')
+    source.append(call_volume)
+    source.extend(_simd_declarations(p_info.parameters, xy_mode, prefix='P_'))
+    # S only depends on |q| and its own parameters.
+    refs = _call_pars("_v.", s_table)
+    source.append("#define CALL_SQ(_q, _v) S_Iq(%s)" % ",".join(["_q"] + refs))
+    source.extend(_parameter_counts(partable))
+
+    ocl = _kernels(kernel_code, call_iq, call_iqxy, clear_iqxy, model_info,
+                   partable.max_pd)
+    dll = _kernels(kernel_code, call_iq, call_iqxy, clear_iqxy, model_info,
+                   partable.max_pd)
+    result = {
+        'dll': '\n'.join(source+dll[0]+dll[1]+dll[2]),
+        'opencl': '\n'.join(source+ocl[0]+ocl[1]+ocl[2]),
+    }
+
+    return result
+
+
+def _model_source(model_info, seen=None):
+    # type: (ModelInfo, Optional[set]) -> List[str]
+    """
+    Return the user code for the model, followed by the kernel functions
+    that are defined in the model by body only.
+
+    If *seen* is given, source files already in the set are skipped and
+    the new files are added to it.
+    """
+    source = []
+    for path in model_sources(model_info):
+        if seen is not None:
+            if path in seen:
+                continue
+            seen.add(path)
+        with open(path) as fid:
+            _add_source(source, fid.read(), path)
 
     if model_info.c_code:
         _add_source(source, model_info.c_code, model_info.filename,
                     lineno=model_info.lineno.get('c_code', 1))
 
+    partable = model_info.parameters
     # Make parameters for q, qx, qy so that we can use them in declarations
     q, qx, qy, qab, qa, qb, qc \
         = [Parameter(name=v) for v in 'q qx qy qab qa qb qc'.split()]
@@ -766,8 +1153,14 @@ def make_source(model_info):
     if isinstance(model_info.Iqabc, str):
         pars = [qa, qb, qc] + partable.iq_parameters
         source.append(_gen_fn(model_info, 'Iqabc', pars))
+    return source
+
 
-    # What kind of 2D model do we need?  Is it consistent with the parameters?
+def _check_xy_mode(partable, source):
+    # type: (ParameterTable, List[str]) -> str
+    """
+    What kind of 2D model do we need?  Is it consistent with the parameters?
+    """
     xy_mode = find_xy_mode(source)
     if xy_mode == 'qabc' and not partable.is_asymmetric:
         raise ValueError("asymmetric oriented models need to define Iqabc")
@@ -780,45 +1173,60 @@ def make_source(model_info):
             logger.warn("oriented shapes should define Iqac or Iqabc")
         else:
             raise ValueError("Expected function Iqac or Iqabc for oriented shape")
+    return xy_mode
 
-    # Define the parameter table
+
+def _parameter_table(partable):
+    # type: (ParameterTable) -> List[str]
+    """
+    Return the definition of the PARAMETER_TABLE macro.
+    """
     lineno = getframeinfo(currentframe()).lineno + 2
-    source.append('#line %d "sasmodels/generate.py"'%lineno)
+    source = ['#line %d "sasmodels/generate.py"'%lineno]
     #source.append('introduce breakage in generate to test lineno reporting')
     source.append("#define PARAMETER_TABLE \\")
     source.append("\\\n".join(p.as_definition()
                               for p in partable.kernel_parameters))
+    return source
 
-    # Define the function calls
+
+def _call_macros(partable, xy_mode, prefix=''):
+    # type: (ParameterTable, str, str) -> Tuple[str, str, str, str]
+    """
+    Return the CALL_VOLUME, CALL_IQ and CALL_IQ_* macro definitions, and
+    the code to clear CALL_IQ_* after the 2D kernels.
+
+    *prefix* is added to the names of the kernel functions.
+    """
     if partable.form_volume_parameters:
         refs = _call_pars("_v.", partable.form_volume_parameters)
-        call_volume = "#define CALL_VOLUME(_v) form_volume(%s)"%(",".join(refs))
+        call_volume = ("#define CALL_VOLUME(_v) %sform_volume(%s)"
+                       % (prefix, ",".join(refs)))
     else:
         # Model doesn't have volume.  We could make the kernel run a little
         # faster by not using/transferring the volume normalizations, but
         # the ifdef's reduce readability more than is worthwhile.
         call_volume = "#define CALL_VOLUME(v) 1.0"
-    source.append(call_volume)
 
     model_refs = _call_pars("_v.", partable.iq_parameters)
     pars = ",".join(["_q"] + model_refs)
-    call_iq = "#define CALL_IQ(_q, _v) Iq(%s)" % pars
+    call_iq = "#define CALL_IQ(_q, _v) %sIq(%s)" % (prefix, pars)
     if xy_mode == 'qabc':
         pars = ",".join(["_qa", "_qb", "_qc"] + model_refs)
-        call_iqxy = "#define CALL_IQ_ABC(_qa,_qb,_qc,_v) Iqabc(%s)" % pars
+        call_iqxy = "#define CALL_IQ_ABC(_qa,_qb,_qc,_v) %sIqabc(%s)" % (prefix, pars)
         clear_iqxy = "#undef CALL_IQ_ABC"
     elif xy_mode == 'qac':
         pars = ",".join(["_qa", "_qc"] + model_refs)
-        call_iqxy = "#define CALL_IQ_AC(_qa,_qc,_v) Iqac(%s)" % pars
+        call_iqxy = "#define CALL_IQ_AC(_qa,_qc,_v) %sIqac(%s)" % (prefix, pars)
         clear_iqxy = "#undef CALL_IQ_AC"
     elif xy_mode == 'qa':
         pars = ",".join(["_qa"] + model_refs)
-        call_iqxy = "#define CALL_IQ_A(_qa,_v) Iq(%s)" % pars
+        call_iqxy = "#define CALL_IQ_A(_qa,_v) %sIq(%s)" % (prefix, pars)
         clear_iqxy = "#undef CALL_IQ_A"
     elif xy_mode == 'qxy':
         orientation_refs = _call_pars("_v.", partable.orientation_parameters)
         pars = ",".join(["_qx", "_qy"] + model_refs + orientation_refs)
-        call_iqxy = "#define CALL_IQ_XY(_qx,_qy,_v) Iqxy(%s)" % pars
+        call_iqxy = "#define CALL_IQ_XY(_qx,_qy,_v) %sIqxy(%s)" % (prefix, pars)
         clear_iqxy = "#undef CALL_IQ_XY"
         if partable.orientation_parameters:
             call_iqxy += "\n#define HAVE_THETA"
@@ -826,64 +1234,111 @@ def make_source(model_info):
         if partable.is_asymmetric:
             call_iqxy += "\n#define HAVE_PSI"
             clear_iqxy += "\n#undef HAVE_PSI"
+    return call_volume, call_iq, call_iqxy, clear_iqxy
 
 
-    magpars = [k-2 for k, p in enumerate(partable.call_parameters)
-               if p.type == 'sld']
+def _simd_declarations(partable, xy_mode, prefix=''):
+    # type: (ParameterTable, str, str) -> List[str]
+    """
+    Redeclare the kernel functions called in the loop over q with
+    *SIMD_FUNCTION* so that DLLs built with USE_SIMD can vectorize the loop.
 
-    # Fill in definitions for numbers of parameters
-    source.append("#define MAX_PD %s"%partable.max_pd)
-    source.append("#define NUM_PARS %d"%partable.npars)
-    source.append("#define NUM_VALUES %d" % partable.nvalues)
-    source.append("#define NUM_MAGNETIC %d" % partable.nmagnetic)
-    source.append("#define MAGNETIC_PARS %s"%",".join(str(k) for k in magpars))
-    source.append("#define PROJECTION %d"%PROJECTION)
+    Functions with vector parameters are not declared since their
+    argument types depend on how the model author wrote them.
+    *prefix* is added to the names of the kernel functions.
+    """
+    pars = partable.iq_parameters
+    if xy_mode == 'qxy':
+        pars = pars + partable.orientation_parameters
+    if any(p.length > 1 for p in pars):
+        return []
+    q_names = {'qabc': ('qa', 'qb', 'qc'), 'qac': ('qab', 'qc'),
+               'qxy': ('qx', 'qy')}
+    functions = [('Iq', ('q',))]
+    if xy_mode in q_names:
+        functions.append(('I' + xy_mode, q_names[xy_mode]))
+    source = ["#ifdef SIMD_FUNCTION"]
+    for name, q_args in functions:
+        args = ["double %s" % q for q in q_args]
+        args += [p.as_function_argument() for p in pars]
+        source.append("SIMD_FUNCTION double %s%s(%s);"
+                      % (prefix, name, ", ".join(args)))
+    source.append("#endif")
+    return source
 
-    # TODO: allow mixed python/opencl kernels?
 
-    ocl = _kernels(kernel_code, call_iq, call_iqxy, clear_iqxy, model_info.name)
-    dll = _kernels(kernel_code, call_iq, call_iqxy, clear_iqxy, model_info.name)
-    result = {
-        'dll': '\n'.join(source+dll[0]+dll[1]+dll[2]),
-        'opencl': '\n'.join(source+ocl[0]+ocl[1]+ocl[2]),
-    }
+def _parameter_counts(partable):
+    # type: (ParameterTable) -> List[str]
+    """
+    Fill in definitions for numbers of parameters.
+    """
+    magpars = [k-2 for k, p in enumerate(partable.call_parameters)
+               if p.type == 'sld']
+    return [
+        "#define MAX_PD %s"%partable.max_pd,
+        "#define NUM_PARS %d"%partable.npars,
+        "#define NUM_VALUES %d" % partable.nvalues,
+        "#define NUM_MAGNETIC %d" % partable.nmagnetic,
+        "#define MAGNETIC_PARS %s"%",".join(str(k) for k in magpars),
+        "#define PROJECTION %d"%PROJECTION,
+    ]
 
-    return result
 
+def _num_loops(num_loops):
+    # type: (Optional[int]) -> str
+    return "MAX_PD" if num_loops is None else str(num_loops)
+
+def _kernels(kernel, call_iq, call_iqxy, clear_iqxy, model_info, max_pd):
+    # type: ([str,str], str, str, str, ModelInfo, int) -> List[str]
+    """
+    Return the source for the Iq, Iqxy and Imagnetic kernels.
 
-def _kernels(kernel, call_iq, call_iqxy, clear_iqxy, name):
-    # type: ([str,str], str, str, str) -> List[str]
+    The Iq and Iqxy kernels are followed by the kernels specialized for
+    each of *SPECIALIZED_LOOPS* active dispersity loops that is less than
+    *max_pd*.  The kernel loaders use them if they are present.
+    """
     code = kernel[0]
     path = kernel[1].replace('\\', '\\\\')
-    iq = [
-        # define the Iq kernel
-        "#define KERNEL_NAME %s_Iq" % name,
-        call_iq,
-        '#line 1 "%s Iq"' % path,
-        code,
-        "#undef CALL_IQ",
-        "#undef KERNEL_NAME",
-        ]
-
-    iqxy = [
-        # define the Iqxy kernel from the same source with different #defines
-        "#define KERNEL_NAME %s_Iqxy" % name,
-        call_iqxy,
-        '#line 1 "%s Iqxy"' % path,
-        code,
-        clear_iqxy,
-        "#undef KERNEL_NAME",
-    ]
+    loops = [n for n in SPECIALIZED_LOOPS if n < max_pd]
+    iq = []
+    for num_loops in [None] + loops:
+        iq.extend([
+            # define the Iq kernel
+            "#define KERNEL_NAME %s" % kernel_name(model_info, "Iq", num_loops),
+            "#define NUM_LOOPS %s" % _num_loops(num_loops),
+            call_iq,
+            '#line 1 "%s Iq"' % path,
+            code,
+            "#undef CALL_IQ",
+            "#undef NUM_LOOPS",
+            "#undef KERNEL_NAME",
+            ])
+
+    iqxy = []
+    for num_loops in [None] + loops:
+        iqxy.extend([
+            # define the Iqxy kernel from the same source with different #defines
+            "#define KERNEL_NAME %s" % kernel_name(model_info, "Iqxy", num_loops),
+            "#define NUM_LOOPS %s" % _num_loops(num_loops),
+            call_iqxy,
+            '#line 1 "%s Iqxy"' % path,
+            code,
+            clear_iqxy,
+            "#undef NUM_LOOPS",
+            "#undef KERNEL_NAME",
+            ])
 
     imagnetic = [
         # define the Imagnetic kernel
-        "#define KERNEL_NAME %s_Imagnetic" % name,
+        "#define KERNEL_NAME %s" % kernel_name(model_info, "Imagnetic"),
+        "#define NUM_LOOPS MAX_PD",
         "#define MAGNETIC 1",
         call_iqxy,
         '#line 1 "%s Imagnetic"' % path,
         code,
         clear_iqxy,
         "#undef MAGNETIC",
+        "#undef NUM_LOOPS",
         "#undef KERNEL_NAME",
     ]
 
@@ -1038,19 +1493,51 @@ def view_html_from_info(info):
     url = "file://"+dirname(info.filename)+"/"
     rst2html.view_html(make_html(info), url=url)
 
-def demo_time():
-    # type: () -> None
+def demo_time(models=None):
+    # type: (Optional[List[str]]) -> Dict[str, float]
     """
-    Show how long it takes to process a model.
-    """
-    import datetime
-    from .modelinfo import make_model_info
-    from .models import cylinder
+    Show how long it takes to generate the single and double precision
+    dll sources for *models* (default all C models), without caching,
+    with the disk cache only, and with the memory cache.
 
-    tic = datetime.datetime.now()
-    make_source(make_model_info(cylinder))
-    toc = (datetime.datetime.now() - tic).total_seconds()
-    print("time: %g"%toc)
+    Returns the total seconds for each case.
+    """
+    import time
+    import shutil
+    from . import core
+
+    clock = getattr(time, 'perf_counter', time.time)
+    if models is None:
+        models = core.list_models('c')
+    infos = [core.load_model_info(name) for name in models]
+
+    def build(info):
+        # type: (ModelInfo) -> float
+        tic = clock()
+        source = make_source(info)['dll']
+        for dtype in (F32, F64):
+            convert_type(source, dtype)
+        return clock() - tic
+
+    global SOURCE_CACHE_PATH
+    saved_path = SOURCE_CACHE_PATH
+    SOURCE_CACHE_PATH = tempfile.mkdtemp(prefix="sas_source_cache_")
+    times = OrderedDict((cache, 0.) for cache in ('none', 'disk', 'memory'))
+    try:
+        for info in infos:
+            clear_source_cache()
+            times['none'] += build(info)
+            clear_source_cache()
+            times['disk'] += build(info)
+            times['memory'] += build(info)
+    finally:
+        shutil.rmtree(SOURCE_CACHE_PATH, ignore_errors=True)
+        SOURCE_CACHE_PATH = saved_path
+        clear_source_cache()
+    for cache, seconds in times.items():
+        print("%d models, %-6s cache: %8.1f ms"
+              % (len(infos), cache, 1000*seconds))
+    return times
 
 
 def main():
@@ -1062,6 +1549,9 @@ def main():
 
     if len(sys.argv) <= 1:
         print("usage: python -m sasmodels.generate modelname")
+        print("       python -m sasmodels.generate -time [modelname ...]")
+    elif sys.argv[1] == '-time':
+        demo_time(sys.argv[2:] or None)
     else:
         name = sys.argv[1]
         kernel_module = load_kernel_module(name)
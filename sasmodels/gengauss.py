@@ -41,3 +41,105 @@ def gengauss(n, path):
         fid.write("constant double Gauss%dZ[%d]={\n"%(n, array_size))
         fid.write(",\n".join("\t% .15e"%v for v in z))
         fid.write("\n};")
+
+
+#: Gauss-Legendre orders in the adaptive rule generated by :func:`genadaptive`.
+ADAPTIVE_ORDERS = (8, 12, 16, 24, 32, 48, 64, 76, 96, 128, 150)
+#: Relative error target for the adaptive rule.
+ADAPTIVE_TOL = 1e-6
+
+def adaptive_limits(orders=ADAPTIVE_ORDERS, tol=ADAPTIVE_TOL):
+    """
+    Return the largest $qr$ for which each of the gaussian quadrature
+    *orders* computes the orientation average of a cylinder to a relative
+    error of *tol*, where $r = \\sqrt{R^2 + (L/2)^2}$ is the distance from
+    the center to the rim.  The error is the worst case for aspect ratios
+    $L/2R$ from 0.01 to 100 compared to a 1500 point rule.
+    """
+    from scipy.special import j1
+
+    qr = np.logspace(-2, 3.5, 1200)
+    aspects = np.logspace(-2, 2, 41)
+    def average(n, r, half_length):
+        z, w = leggauss(n)
+        theta = np.pi/4*(z + 1)
+        x, y = np.outer(qr*r, np.sin(theta)), np.outer(qr*half_length, np.cos(theta))
+        form = 2*j1(x)/x * np.sinc(y/np.pi)
+        return (form**2*np.sin(theta)).dot(w)
+    error = np.zeros((len(orders), len(qr)))
+    for aspect in aspects:
+        r = 1/np.sqrt(1 + aspect**2)
+        target = average(1500, r, aspect*r)
+        for k, n in enumerate(orders):
+            error[k] = np.maximum(error[k], abs(average(n, r, aspect*r)/target - 1))
+    limits = []
+    for k in range(len(orders)):
+        bad = np.nonzero(error[k] > tol)[0]
+        limits.append(qr[bad[0]-1] if len(bad) and bad[0] > 0
+                      else 0. if len(bad) else qr[-1])
+    return limits
+
+def genadaptive(path, orders=ADAPTIVE_ORDERS, tol=ADAPTIVE_TOL):
+    """
+    Write the adaptive gaussian quadrature library to *path*, with the
+    rules for each of *orders* and the limits from :func:`adaptive_limits`
+    for relative error *tol*.
+    """
+    limits = adaptive_limits(orders, tol)
+    start = np.cumsum([0] + [n + (-n)%4 for n in orders])
+    z, w = [], []
+    for n in orders:
+        zn, wn = leggauss(n)
+        z.extend(zn.tolist() + [0.]*((-n)%4))
+        w.extend(wn.tolist() + [0.]*((-n)%4))
+
+    with open(path, "w") as fid:
+        fid.write("""\
+// Generated by sasmodels.gengauss.genadaptive(tol=%(tol)g)
+//
+// Gauss-Legendre rules chosen by q times the particle size.  Use
+//
+//     int n; constant double *z, *w;
+//     GAUSS_RULE(q*r, n, z, w);
+//
+// to set n to the number of points and z and w to the points and weights
+// of the smallest rule whose relative error is below %(tol)g for the
+// orientation average of a cylinder of any aspect ratio, where r is the
+// distance from the center of the cylinder to the rim.  For other shapes
+// use r as the largest distance from the center to the surface.  Above
+// the last limit the largest rule is used.
+//
+// If a fixed rule such as lib/gauss76.c is included before this file, as
+// done by generate.set_integration_size, then GAUSS_RULE uses it for all q.
+
+#ifdef GAUSS_N
+#define GAUSS_RULE(qr, n, z, w) do { \\
+    n = GAUSS_N; z = GAUSS_Z; w = GAUSS_W; \\
+  } while (0)
+#else
+#define GAUSS_RULE(qr, n, z, w) do { \\
+    int _rule = 0; \\
+    while (_rule < GAUSS_ADAPTIVE_RULES-1 && (qr) > GaussAdaptiveLimit[_rule]) _rule++; \\
+    n = GaussAdaptiveN[_rule]; \\
+    z = GaussAdaptiveZ + GaussAdaptiveStart[_rule]; \\
+    w = GaussAdaptiveWt + GaussAdaptiveStart[_rule]; \\
+  } while (0)
+#endif
+
+#define GAUSS_ADAPTIVE_RULES %(nrules)d
+
+""" % dict(tol=tol, nrules=len(orders)))
+        fid.write("constant int GaussAdaptiveN[%d]={%s};\n"
+                  % (len(orders), ", ".join("%d"%n for n in orders)))
+        fid.write("constant int GaussAdaptiveStart[%d]={%s};\n"
+                  % (len(orders), ", ".join("%d"%k for k in start[:-1])))
+        fid.write("constant double GaussAdaptiveLimit[%d]={%s};\n\n"
+                  % (len(orders), ", ".join("%.4g"%v for v in limits)))
+
+        fid.write("constant double GaussAdaptiveWt[%d]={\n"%start[-1])
+        fid.write(",\n".join("\t% .15e"%v for v in w))
+        fid.write("\n};\n")
+
+        fid.write("constant double GaussAdaptiveZ[%d]={\n"%start[-1])
+        fid.write(",\n".join("\t% .15e"%v for v in z))
+        fid.write("\n};")
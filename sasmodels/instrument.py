@@ -0,0 +1,314 @@
+"""
+Kernel instrumentation
+======================
+
+Optional counters and timers for the model kernels, for seeing where the
+evaluation time goes when choosing the number of dispersity points, the
+weight cutoff and the resolution accuracy.
+
+Instrumentation is off by default, and costs one flag check per kernel
+call while off.  Use :func:`collect` to gather statistics for a block
+of code::
+
+    from sasmodels import instrument
+    with instrument.collect() as stats:
+        model(**pars)
+    print(stats)
+
+or :func:`enable` to gather them into the global statistics returned by
+:func:`get_stats` until :func:`disable` is called.  Setting SAS_INSTRUMENT=1
+in the environment enables the global statistics on import.
+
+Statistics are kept for each model and kernel type, with the number of
+calls, the total number of q points and dispersity points evaluated, the
+number of dispersity points skipped because their weight is below the
+*cutoff*, and the time spent building the kernel arguments, transferring
+data to and from the device, running the kernel and applying resolution.
+Composite models record the argument building and resolution time under
+the composite kernel, and the kernel time under the kernels for the parts.
+"""
+from __future__ import print_function, division
+
+import os
+import time
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import numpy as np  # type: ignore
+
+# pylint: disable=unused-import
+try:
+    from typing import Dict, List, Any, Optional, Tuple, Iterator
+except ImportError:
+    pass
+else:
+    from .details import CallDetails
+    from .kernel import Kernel
+# pylint: enable=unused-import
+
+#: True while statistics are being collected.  The kernels check this
+#: before doing any instrumentation work.
+ENABLED = False
+
+#: Timing phases for each kernel.
+PHASES = ('args', 'transfer', 'kernel', 'resolution')
+
+#: Skip counting the points below the cutoff for dispersity meshes larger
+#: than this, since the count needs the full weight product.
+MAX_SKIP_COUNT = 2**22
+
+#: Timer used for the phases.
+clock = getattr(time, 'perf_counter', time.time)
+
+class KernelStats(object):
+    """
+    Statistics for one model and kernel type.
+    """
+    def __init__(self, model, kernel):
+        # type: (str, str) -> None
+        self.model = model
+        self.kernel = kernel
+        #: Number of kernel calls.
+        self.calls = 0
+        #: Total q points over all calls.
+        self.nq = 0
+        #: Total dispersity points over all calls.
+        self.num_eval = 0
+        #: Total dispersity points with weight below the cutoff, or None
+        #: if the mesh was too large to count.
+        self.skipped = 0  # type: Optional[int]
+        #: Total seconds in each phase.
+        self.time = OrderedDict((phase, 0.) for phase in PHASES)
+
+    def as_dict(self):
+        # type: () -> Dict[str, Any]
+        """
+        Return the statistics as a dictionary.
+        """
+        result = dict(model=self.model, kernel=self.kernel, calls=self.calls,
+                      nq=self.nq, num_eval=self.num_eval,
+                      skipped=self.skipped)
+        result.update(('%s_time' % phase, value)
+                      for phase, value in self.time.items())
+        return result
+
+
+class Stats(object):
+    """
+    Statistics for a set of kernel calls, keyed by *(model, kernel)*.
+    """
+    def __init__(self):
+        # type: () -> None
+        self._entries = OrderedDict()  # type: Dict[Tuple[str, str], KernelStats]
+
+    def entry(self, model, kernel):
+        # type: (str, str) -> KernelStats
+        """
+        Return the statistics for *model* and *kernel*, creating them
+        if needed.
+        """
+        key = model, kernel
+        if key not in self._entries:
+            self._entries[key] = KernelStats(model, kernel)
+        return self._entries[key]
+
+    def __getitem__(self, key):
+        # type: (Tuple[str, str]) -> KernelStats
+        return self._entries[key]
+
+    def __iter__(self):
+        # type: () -> Iterator[KernelStats]
+        return iter(list(self._entries.values()))
+
+    def __len__(self):
+        # type: () -> int
+        return len(self._entries)
+
+    def clear(self):
+        # type: () -> None
+        """
+        Remove all statistics.
+        """
+        self._entries.clear()
+
+    def as_list(self):
+        # type: () -> List[Dict[str, Any]]
+        """
+        Return the statistics as a list of dictionaries.
+        """
+        return [entry.as_dict() for entry in self]
+
+    def __str__(self):
+        # type: () -> str
+        header = ("%-24s %-18s %6s %9s %11s %11s"
+                  % ("model", "kernel", "calls", "nq", "num_eval", "skipped"))
+        header += "".join(" %13s" % ("%s ms" % phase) for phase in PHASES)
+        lines = [header]
+        for entry in self:
+            skipped = "-" if entry.skipped is None else str(entry.skipped)
+            line = ("%-24s %-18s %6d %9d %11d %11s"
+                    % (entry.model, entry.kernel, entry.calls, entry.nq,
+                       entry.num_eval, skipped))
+            line += "".join(" %13.3f" % (1000.*value)
+                            for value in entry.time.values())
+            lines.append(line)
+        return "\n".join(lines)
+
+
+_LOCK = threading.Lock()
+_GLOBAL_STATS = Stats()
+_ACTIVE = []  # type: List[Stats]
+
+def _update_enabled():
+    # type: () -> None
+    global ENABLED
+    ENABLED = bool(_ACTIVE)
+
+def enable():
+    # type: () -> None
+    """
+    Start collecting statistics into the global statistics.
+    """
+    with _LOCK:
+        if _GLOBAL_STATS not in _ACTIVE:
+            _ACTIVE.append(_GLOBAL_STATS)
+        _update_enabled()
+
+def disable():
+    # type: () -> None
+    """
+    Stop collecting the global statistics.  Statistics collected by
+    :func:`collect` are not affected.
+    """
+    with _LOCK:
+        if _GLOBAL_STATS in _ACTIVE:
+            _ACTIVE.remove(_GLOBAL_STATS)
+        _update_enabled()
+
+def get_stats():
+    # type: () -> Stats
+    """
+    Return the global statistics.
+    """
+    return _GLOBAL_STATS
+
+def reset():
+    # type: () -> None
+    """
+    Clear the global statistics.
+    """
+    with _LOCK:
+        _GLOBAL_STATS.clear()
+
+@contextmanager
+def collect():
+    # type: () -> Iterator[Stats]
+    """
+    Collect statistics for the kernel calls in the body of the with
+    statement, including calls from other threads.
+    """
+    stats = Stats()
+    with _LOCK:
+        _ACTIVE.append(stats)
+        _update_enabled()
+    try:
+        yield stats
+    finally:
+        with _LOCK:
+            _ACTIVE.remove(stats)
+            _update_enabled()
+
+def _label(kernel):
+    # type: (Kernel) -> Tuple[str, str]
+    info = getattr(kernel, 'info', None)
+    model = info.id if info is not None else "unknown"
+    return model, kernel.__class__.__name__
+
+def record_call(calculator, call_details, values, cutoff, **times):
+    # type: (Kernel, CallDetails, np.ndarray, float, **float) -> None
+    """
+    Record a call to kernel *calculator* with the given *call_details*,
+    *values* and *cutoff*, along with the seconds spent in each phase
+    given as *phase=seconds*.
+    """
+    q_input = getattr(calculator, 'q_input', None)
+    nq = q_input.nq if q_input is not None else 0
+    num_eval = int(call_details.num_eval)
+    skipped = count_skipped(calculator.info, call_details, values, cutoff)
+    model, name = _label(calculator)
+    with _LOCK:
+        for stats in _ACTIVE:
+            entry = stats.entry(model, name)
+            entry.calls += 1
+            entry.nq += nq
+            entry.num_eval += num_eval
+            if skipped is None or entry.skipped is None:
+                entry.skipped = None
+            else:
+                entry.skipped += skipped
+            for phase, value in times.items():
+                entry.time[phase] += value
+
+def add_time(kernel, phase, seconds):
+    # type: (Kernel, str, float) -> None
+    """
+    Add *seconds* to the time spent in *phase* for *kernel*.
+    """
+    model, name = _label(kernel)
+    with _LOCK:
+        for stats in _ACTIVE:
+            stats.entry(model, name).time[phase] += seconds
+
+def count_skipped(model_info, call_details, values, cutoff):
+    # type: (Any, CallDetails, np.ndarray, float) -> Optional[int]
+    """
+    Return the number of points in the dispersity mesh whose combined
+    weight is at or below *cutoff*, and so are skipped by the kernel.
+
+    This is an estimate since the kernel may scale the weights, such
+    as for the latitude correction when theta is polydisperse.  Returns
+    None if the mesh has more than *MAX_SKIP_COUNT* points.
+    """
+    num_eval = int(call_details.num_eval)
+    if num_eval > MAX_SKIP_COUNT:
+        return None
+    nvalues = model_info.parameters.nvalues
+    num_weights = int(call_details.num_weights)
+    weights = values[nvalues+num_weights:nvalues+2*num_weights]
+    total = np.ones(1)
+    for k in range(int(call_details.num_active)):
+        offset, length = call_details.pd_offset[k], call_details.pd_length[k]
+        total = np.multiply.outer(weights[offset:offset+length], total).ravel()
+    return int(np.sum(total <= cutoff))
+
+if os.environ.get("SAS_INSTRUMENT", "0") != "0":
+    enable()
+
+def test_collect():
+    # type: () -> None
+    """
+    Check the counts for a polydisperse model with a cutoff.
+    """
+    from .core import load_model
+    from .data import empty_data1D
+    from .direct_model import DirectModel
+    model = load_model('cylinder', dtype='double', platform='dll')
+    q = np.logspace(-3, -1, 50)
+    calculator = DirectModel(empty_data1D(q, resolution=0.05), model,
+                             cutoff=1e-3)
+    pars = dict(radius=20, radius_pd=0.2, radius_pd_n=10,
+                length=100, length_pd=0.2, length_pd_n=10)
+    with collect() as stats:
+        calculator(**pars)
+        calculator(**dict(pars, radius=25))
+    calculator(**dict(pars, radius=30))
+    entry, = list(stats)
+    assert (entry.model, entry.calls) == ('cylinder', 2)
+    assert entry.nq == 2*len(calculator.resolution.q_calc)
+    assert entry.num_eval == 2*10*10
+    assert 0 < entry.skipped < entry.num_eval
+    assert all(entry.time[phase] > 0 for phase in ('args', 'kernel',
+                                                   'resolution'))
+    assert str(stats).splitlines()[1].startswith('cylinder')
+    assert not ENABLED
@@ -7,17 +7,28 @@ In particular, each model should provide a :meth:`KernelModel.make_kernel`
 call which returns an executable kernel, :class:`Kernel`, that operates
 on the given set of *q_vector* inputs.  On completion of the computation,
 the kernel should be released, which also releases the inputs.
+
+Kernels for the parts of a composite model can share their *q* inputs.
+Models which support this provide :meth:`KernelModel.make_input` and an
+*input_key* identifying the kind of input they need, and accept the
+resulting input in place of the *q_vectors* in :meth:`KernelModel.make_kernel`.
+Use :func:`make_shared_kernels` to build a set of kernels that share inputs.
+The inputs are reference counted, so each kernel releases its own use
+of the input, and the input is freed with the last kernel.
 """
 
 from __future__ import division, print_function
 
+import hashlib
+
+import numpy as np  # type: ignore
+
 # pylint: disable=unused-import
 try:
-    from typing import List
+    from typing import List, Any, Tuple
 except ImportError:
     pass
 else:
-    import numpy as np
     from .details import CallDetails
     from .modelinfo import ModelInfo
 # pylint: enable=unused-import
@@ -25,10 +36,18 @@ else:
 class KernelModel(object):
     info = None  # type: ModelInfo
     dtype = None # type: np.dtype
+    #: Kernels from models with the same input key can share q inputs.
+    #: None if the model does not support :meth:`make_input`.
+    input_key = None  # type: Any
+
     def make_kernel(self, q_vectors):
         # type: (List[np.ndarray]) -> "Kernel"
         raise NotImplementedError("need to implement make_kernel")
 
+    def make_input(self, q_vectors):
+        # type: (List[np.ndarray]) -> Any
+        raise NotImplementedError("need to implement make_input")
+
     def release(self):
         # type: () -> None
         pass
@@ -47,3 +66,41 @@ class Kernel(object):
     def release(self):
         # type: () -> None
         pass
+
+
+def make_shared_kernels(models, q_vectors):
+    # type: (List[KernelModel], List[np.ndarray]) -> List[Kernel]
+    """
+    Return kernels for each of *models* at *q_vectors*.
+
+    The q inputs are created once for each distinct *input_key* and shared
+    between the kernels, so for example a product of two double precision
+    DLL models only sends one copy of q to the kernels.
+    """
+    inputs = {}
+    kernels = []
+    for model in models:
+        key = model.input_key
+        if key is None:
+            kernels.append(model.make_kernel(q_vectors))
+            continue
+        if key not in inputs:
+            inputs[key] = model.make_input(q_vectors)
+        kernels.append(model.make_kernel(inputs[key]))
+    # The kernels hold their own references to the inputs, so release ours.
+    for q_input in inputs.values():
+        q_input.release()
+    return kernels
+
+
+def q_vectors_key(q_vectors):
+    # type: (List[np.ndarray]) -> Tuple[Tuple[Tuple[int, ...], str, str], ...]
+    """
+    Return a key for *q_vectors* based on their shape, type and values,
+    so that kernels for the same q can be found and reused.
+    """
+    key = []
+    for q in q_vectors:
+        q = np.ascontiguousarray(q)
+        key.append((q.shape, q.dtype.str, hashlib.sha1(q).hexdigest()))
+    return tuple(key)
@@ -85,6 +85,35 @@
 #  define pown(a,b) pow(a,b)
 #endif // !USE_OPENCL
 
+// The dispersity sums are accumulated in ACCUM_TYPE.  Mixed precision
+// kernels evaluate the model in single precision, but accumulate in double
+// so that large dispersity meshes don't lose precision.  The type is built
+// by token pasting so that it isn't converted along with the model.
+#ifdef USE_MIXED_PRECISION
+#  define ACCUM_TYPE dou ## ble
+#else
+#  define ACCUM_TYPE double
+#endif
+
+// The kernel q and result vectors never alias, which lets the compiler
+// vectorize the loop over q.  C++ compilers spell restrict as __restrict.
+#ifdef __cplusplus
+#  define RESTRICT __restrict
+#else
+#  define RESTRICT restrict
+#endif
+
+// With USE_SIMD the DLL loop over q is marked for vectorization, with the
+// per-q temporaries private to each lane.  Requires -fopenmp-simd or
+// equivalent, which kerneldll adds for the native and fastmath profiles.
+// SIMD_FUNCTION marks the model functions called in the loop so that the
+// compiler generates vector versions of them.
+#if defined(USE_SIMD) && !defined(USE_OPENCL)
+#  define _SAS_PRAGMA(x) _Pragma(#x)
+#  define SIMD_PRIVATE(...) _SAS_PRAGMA(omp simd private(__VA_ARGS__))
+#  define SIMD_FUNCTION _SAS_PRAGMA(omp declare simd)
+#endif
+
 #if defined(NEED_EXPM1)
    // TODO: precision is a half digit lower than numpy on mac in [1e-7, 0.5]
    // Run "explore/precision.py sas_expm1" to see this (may have to fiddle
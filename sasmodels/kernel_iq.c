@@ -14,6 +14,10 @@
 //
 //  MAX_PD : the maximum number of dispersity loops allowed for this model,
 //      which will be at most modelinfo.MAX_PD.
+//  NUM_LOOPS : the number of dispersity loops in this kernel, which is
+//      MAX_PD for the generic kernel.  Kernels specialized for fewer active
+//      loops set the values and weights for the remaining levels once,
+//      so they can only be called when those levels have length 1.
 //  NUM_PARS : the number of parameters in the parameter table
 //  NUM_VALUES : the number of values to skip at the start of the
 //      values array before you get to the dispersity values.
@@ -31,6 +35,9 @@
 //  CALL_IQ_AC(qa, qc, table) : call the Iqxy function for symmetric shapes
 //  CALL_IQ_ABC(qa, qc, table) : call the Iqxy function for asymmetric shapes
 //  CALL_IQ_XY(qx, qy, table) : call the Iqxy function for arbitrary models
+//  CALL_SQ(q, table) : call the structure factor for fused P@S product
+//      models.  The result is multiplied by S(|q|) at the end of the
+//      dispersity loop.
 //  INVALID(table) : test if the current point is feesible to calculate.  This
 //      will be defined in the kernel definition file.
 //  PROJECTION : equirectangular=1, sinusoidal=2
@@ -271,8 +278,8 @@ void KERNEL_NAME(
     const int32_t pd_stop,      // where we are stopping in the dispersity loop
     global const ProblemDetails *details,
     global const double *values,
-    global const double *q, // nq q values, with padding to boundary
-    global double *result,  // nq+1 return values, again with padding
+    global const double *RESTRICT q, // nq q values, with padding to boundary
+    global ACCUM_TYPE *RESTRICT result,  // nq+1 return values, again with padding
     const double cutoff     // cutoff in the dispersity weight product
     )
 {
@@ -332,10 +339,10 @@ void KERNEL_NAME(
   // seeing one q value (stored in the variable "this_result") while the dll
   // version must loop over all q.
   #ifdef USE_OPENCL
-    double pd_norm = (pd_start == 0 ? 0.0 : result[nq]);
-    double this_result = (pd_start == 0 ? 0.0 : result[q_index]);
+    ACCUM_TYPE pd_norm = (pd_start == 0 ? 0.0 : result[nq]);
+    ACCUM_TYPE this_result = (pd_start == 0 ? 0.0 : result[q_index]);
   #else // !USE_OPENCL
-    double pd_norm = (pd_start == 0 ? 0.0 : result[nq]);
+    ACCUM_TYPE pd_norm = (pd_start == 0 ? 0.0 : result[nq]);
     if (pd_start == 0) {
       #ifdef USE_OPENMP
       #pragma omp parallel for
@@ -361,6 +368,11 @@ level-specific looping variables, including these from loop level 3:
        as weight5*weight4*w3[i3].  Note that we need an outermost
        value weight5 set to 1.0 for this to work properly.
 
+Kernels with NUM_LOOPS less than MAX_PD only open the loops below
+NUM_LOOPS.  The levels from NUM_LOOPS up have a single point, so PD_FIXED
+sets their values in the parameter table before the loops, and the
+outermost weight is the product of their weights rather than 1.0.
+
 After expansion, the loop struction will look like the following:
 
   // --- PD_INIT(4) ---
@@ -380,7 +392,7 @@ After expansion, the loop struction will look like the following:
   PD_INIT(0)
 
   // --- PD_OUTERMOST_WEIGHT(5) ---
-  const double weight5 = 1.0;
+  const double weight5 = fixed_weight;  // 1.0 when NUM_LOOPS == MAX_PD
 
   // --- PD_OPEN(4,5) ---
   while (i4 < n4) {
@@ -436,6 +448,7 @@ After expansion, the loop struction will look like the following:
 #if defined(CALL_IQ)
   // unoriented 1D
   double qk;
+  #define Q_PRIVATE qk
   #define FETCH_Q() do { qk = q[q_index]; } while (0)
   #define BUILD_ROTATION() do {} while(0)
   #define APPLY_ROTATION() do {} while(0)
@@ -447,6 +460,7 @@ After expansion, the loop struction will look like the following:
   #define FETCH_Q() do { qx = q[2*q_index]; qy = q[2*q_index+1]; } while (0)
   #define BUILD_ROTATION() do {} while(0)
   #define APPLY_ROTATION() do {} while(0)
+  #define Q_PRIVATE qx, qy
   #define CALL_KERNEL() CALL_IQ_A(sqrt(qx*qx+qy*qy), local_values.table)
 
 #elif defined(CALL_IQ_AC)
@@ -458,6 +472,7 @@ After expansion, the loop struction will look like the following:
   // theta, phi, dtheta, dphi are defined below in projection to avoid repeated code.
   #define BUILD_ROTATION() qac_rotation(&rotation, theta, phi, dtheta, dphi);
   #define APPLY_ROTATION() qac_apply(&rotation, qx, qy, &qa, &qc)
+  #define Q_PRIVATE qx, qy, qa, qc
   #define CALL_KERNEL() CALL_IQ_AC(qa, qc, local_values.table)
 
 #elif defined(CALL_IQ_ABC)
@@ -472,6 +487,7 @@ After expansion, the loop struction will look like the following:
   local_values.table.psi = 0.;
   #define BUILD_ROTATION() qabc_rotation(&rotation, theta, phi, psi, dtheta, dphi, local_values.table.psi)
   #define APPLY_ROTATION() qabc_apply(&rotation, qx, qy, &qa, &qb, &qc)
+  #define Q_PRIVATE qx, qy, qa, qb, qc
   #define CALL_KERNEL() CALL_IQ_ABC(qa, qb, qc, local_values.table)
 #elif defined(CALL_IQ_XY)
   // direct call to qx,qy calculator
@@ -479,6 +495,7 @@ After expansion, the loop struction will look like the following:
   #define FETCH_Q() do { qx = q[2*q_index]; qy = q[2*q_index+1]; } while (0)
   #define BUILD_ROTATION() do {} while(0)
   #define APPLY_ROTATION() do {} while(0)
+  #define Q_PRIVATE qx, qy
   #define CALL_KERNEL() CALL_IQ_XY(qx, qy, local_values.table)
 #endif
 
@@ -563,10 +580,6 @@ After expansion, the loop struction will look like the following:
     local_values.vector[p##_LOOP] = v##_LOOP[i##_LOOP]; \
     const double weight##_LOOP = w##_LOOP[i##_LOOP] * weight##_OUTER;
 
-// create the variable "weight#=1.0" where # is the outermost level+1 (=MAX_PD).
-#define _PD_OUTERMOST_WEIGHT(_n) const double weight##_n = 1.0;
-#define PD_OUTERMOST_WEIGHT(_n) _PD_OUTERMOST_WEIGHT(_n)
-
 // Close out the loop
 #define PD_CLOSE(_LOOP) \
     if (step >= pd_stop) break; \
@@ -574,6 +587,17 @@ After expansion, the loop struction will look like the following:
   } \
   i##_LOOP = 0;
 
+// Set the value and weight for a level without a loop in this kernel.
+// The level has a single point, so this is done once outside the loops.
+#define PD_FIXED(_LOOP) \
+  local_values.vector[details->pd_par[_LOOP]] = pd_value[details->pd_offset[_LOOP]]; \
+  fixed_weight *= pd_weight[details->pd_offset[_LOOP]];
+
+// create the variable "weight#=fixed_weight" where # is the outermost loop
+// level+1 (=NUM_LOOPS).
+#define _PD_OUTERMOST_WEIGHT(_n) const double weight##_n = fixed_weight;
+#define PD_OUTERMOST_WEIGHT(_n) _PD_OUTERMOST_WEIGHT(_n)
+
 // ====== construct the loops =======
 
 // Pointers to the start of the dispersity and weight vectors, if needed.
@@ -587,40 +611,58 @@ After expansion, the loop struction will look like the following:
 // and used to test whether we have reached pd_stop.
 int step = pd_start;
 
-// *** define loops for each of 0, 1, 2, ..., modelinfo.MAX_PD-1 ***
+// *** define loops for each of 0, 1, 2, ..., NUM_LOOPS-1 ***
+
+// set the levels from NUM_LOOPS to MAX_PD-1, which have a single point
+double fixed_weight = 1.0;
+#if MAX_PD>4 && NUM_LOOPS<=4
+  PD_FIXED(4)
+#endif
+#if MAX_PD>3 && NUM_LOOPS<=3
+  PD_FIXED(3)
+#endif
+#if MAX_PD>2 && NUM_LOOPS<=2
+  PD_FIXED(2)
+#endif
+#if MAX_PD>1 && NUM_LOOPS<=1
+  PD_FIXED(1)
+#endif
+#if MAX_PD>0 && NUM_LOOPS<=0
+  PD_FIXED(0)
+#endif
 
 // define looping variables
-#if MAX_PD>4
+#if NUM_LOOPS>4
   PD_INIT(4)
 #endif
-#if MAX_PD>3
+#if NUM_LOOPS>3
   PD_INIT(3)
 #endif
-#if MAX_PD>2
+#if NUM_LOOPS>2
   PD_INIT(2)
 #endif
-#if MAX_PD>1
+#if NUM_LOOPS>1
   PD_INIT(1)
 #endif
-#if MAX_PD>0
+#if NUM_LOOPS>0
   PD_INIT(0)
 #endif
 
 // open nested loops
-PD_OUTERMOST_WEIGHT(MAX_PD)
-#if MAX_PD>4
+PD_OUTERMOST_WEIGHT(NUM_LOOPS)
+#if NUM_LOOPS>4
   PD_OPEN(4,5)
 #endif
-#if MAX_PD>3
+#if NUM_LOOPS>3
   PD_OPEN(3,4)
 #endif
-#if MAX_PD>2
+#if NUM_LOOPS>2
   PD_OPEN(2,3)
 #endif
-#if MAX_PD>1
+#if NUM_LOOPS>1
   PD_OPEN(1,2)
 #endif
-#if MAX_PD>0
+#if NUM_LOOPS>0
   PD_OPEN(0,1)
 #endif
 
@@ -643,6 +685,10 @@ PD_OUTERMOST_WEIGHT(MAX_PD)
       // DLL needs to explicitly loop over the q values.
       #ifdef USE_OPENMP
       #pragma omp parallel for
+      #elif defined(USE_SIMD) && !(defined(MAGNETIC) && NUM_MAGNETIC > 0)
+      // The magnetic kernel updates the slds in the parameter table for
+      // each q, so the q values can't be evaluated in parallel.
+      SIMD_PRIVATE(Q_PRIVATE)
       #endif
       for (q_index=0; q_index<nq; q_index++)
 #endif // !USE_OPENCL
@@ -699,22 +745,50 @@ PD_OUTERMOST_WEIGHT(MAX_PD)
 
 // close nested loops
 ++step;
-#if MAX_PD>0
+#if NUM_LOOPS>0
   PD_CLOSE(0)
 #endif
-#if MAX_PD>1
+#if NUM_LOOPS>1
   PD_CLOSE(1)
 #endif
-#if MAX_PD>2
+#if NUM_LOOPS>2
   PD_CLOSE(2)
 #endif
-#if MAX_PD>3
+#if NUM_LOOPS>3
   PD_CLOSE(3)
 #endif
-#if MAX_PD>4
+#if NUM_LOOPS>4
   PD_CLOSE(4)
 #endif
 
+// Product models multiply by the structure factor S(|q|) once the dispersity
+// loop is complete.  The structure factor parameters are not dispersed, so
+// they still hold their initial values in the parameter table.
+#ifdef CALL_SQ
+  #if defined(CALL_IQ)
+    #define CALL_STRUCTURE() CALL_SQ(qk, local_values.table)
+  #else
+    #define CALL_STRUCTURE() CALL_SQ(sqrt(qx*qx+qy*qy), local_values.table)
+  #endif
+  if (pd_stop >= details->num_eval) {
+#ifndef USE_OPENCL
+    #ifdef USE_OPENMP
+    #pragma omp parallel for
+    #endif
+    for (q_index=0; q_index<nq; q_index++)
+#endif // !USE_OPENCL
+    {
+      FETCH_Q();
+      #ifdef USE_OPENCL
+        this_result *= CALL_STRUCTURE();
+      #else // !USE_OPENCL
+        result[q_index] *= CALL_STRUCTURE();
+      #endif // !USE_OPENCL
+    }
+  }
+  #undef CALL_STRUCTURE
+#endif // CALL_SQ
+
 // Remember the current result and the updated norm.
 #ifdef USE_OPENCL
   result[q_index] = this_result;
@@ -729,7 +803,11 @@ PD_OUTERMOST_WEIGHT(MAX_PD)
 #undef PD_INIT
 #undef PD_OPEN
 #undef PD_CLOSE
+#undef PD_FIXED
+#undef _PD_OUTERMOST_WEIGHT
+#undef PD_OUTERMOST_WEIGHT
 #undef FETCH_Q
+#undef Q_PRIVATE
 #undef APPLY_PROJECTION
 #undef BUILD_ROTATION
 #undef APPLY_ROTATION
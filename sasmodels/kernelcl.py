@@ -54,6 +54,7 @@ import os
 import warnings
 import logging
 import time
+import threading
 
 import numpy as np  # type: ignore
 
@@ -73,11 +74,12 @@ except Exception as exc:
     OPENCL_ERROR = str(exc)
 
 from . import generate
+from . import instrument
 from .kernel import KernelModel, Kernel
 
 # pylint: disable=unused-import
 try:
-    from typing import Tuple, Callable, Any
+    from typing import Tuple, Callable, Any, Union, Dict, Optional
     from .modelinfo import ModelInfo
     from .details import CallDetails
 except ImportError:
@@ -133,6 +135,7 @@ def use_opencl():
     return HAVE_OPENCL and os.environ.get("SAS_OPENCL", "").lower() != "none"
 
 ENV = None
+_env_lock = threading.Lock()
 def reset_environment():
     """
     Call to create a new OpenCL context, such as after a change to SAS_OPENCL.
@@ -151,7 +154,9 @@ def environment():
         if not HAVE_OPENCL:
             raise RuntimeError("OpenCL startup failed with ***"
                                + OPENCL_ERROR + "***; using C compiler instead")
-        reset_environment()
+        with _env_lock:
+            if ENV is None:
+                reset_environment()
         if ENV is None:
             raise RuntimeError("SAS_OPENCL=None in environment")
     return ENV
@@ -202,25 +207,31 @@ def _stretch_input(vector, dtype, extra=1e-3, boundary=32):
     return np.ascontiguousarray(vector, dtype=dtype)
 
 
-def compile_model(context, source, dtype, fast=False):
-    # type: (cl.Context, str, np.dtype, bool) -> cl.Program
+def compile_model(context, source, dtype, fast=False, mixed=False):
+    # type: (cl.Context, str, np.dtype, bool, bool) -> cl.Program
     """
     Build a model to run on the gpu.
 
-    Returns the compiled program and its type.
+    Returns the compiled program and its type.  If *mixed* then the
+    dispersity sums are accumulated in double precision.
 
     Raises an error if the desired precision is not available.
     """
     dtype = np.dtype(dtype)
     if not all(has_type(d, dtype) for d in context.devices):
         raise RuntimeError("%s not supported for devices"%dtype)
+    mixed = mixed and dtype == generate.F32
+    if mixed and not all(has_type(d, generate.F64) for d in context.devices):
+        raise RuntimeError("mixed precision not supported for devices")
 
     source_list = [generate.convert_type(source, dtype)]
 
     if dtype == generate.F16:
         source_list.insert(0, _F16_PRAGMA)
-    elif dtype == generate.F64:
+    elif dtype == generate.F64 or mixed:
         source_list.insert(0, _F64_PRAGMA)
+    if mixed:
+        source_list.insert(0, "#define USE_MIXED_PRECISION\n")
 
     # Note: USE_SINCOS makes the intel cpu slower under opencl
     if context.devices[0].type == cl.device_type.GPU:
@@ -260,6 +271,7 @@ class GpuEnvironment(object):
         self.queues = [cl.CommandQueue(context, context.devices[0])
                        for context in self.context]
         self.compiled = {}
+        self._compile_lock = threading.Lock()
 
     def has_type(self, dtype):
         # type: (np.dtype) -> bool
@@ -302,8 +314,9 @@ class GpuEnvironment(object):
             warnings.warn("pyopencl.create_some_context() failed")
             warnings.warn("the environment variable 'SAS_OPENCL' might not be set correctly")
 
-    def compile_program(self, name, source, dtype, fast, timestamp):
-        # type: (str, str, np.dtype, bool, float) -> cl.Program
+    def compile_program(self, name, source, dtype, fast, timestamp,
+                        mixed=False):
+        # type: (str, str, np.dtype, bool, float, bool) -> cl.Program
         """
         Compile the program for the device in the given context.
         """
@@ -311,18 +324,20 @@ class GpuEnvironment(object):
         # so we don't really need to cache things for ourselves.  I'll do so
         # anyway just to save some data munging time.
         tag = generate.tag_source(source)
-        key = "%s-%s-%s%s"%(name, dtype, tag, ("-fast" if fast else ""))
-        # Check timestamp on program
-        program, program_timestamp = self.compiled.get(key, (None, np.inf))
-        if program_timestamp < timestamp:
-            del self.compiled[key]
-        if key not in self.compiled:
-            context = self.get_context(dtype)
-            logging.info("building %s for OpenCL %s", key,
-                         context.devices[0].name.strip())
-            program = compile_model(self.get_context(dtype),
-                                    str(source), dtype, fast)
-            self.compiled[key] = (program, timestamp)
+        key = "%s-%s-%s%s%s"%(name, dtype, tag, ("-fast" if fast else ""),
+                              ("-mixed" if mixed else ""))
+        with self._compile_lock:
+            # Check timestamp on program
+            program, program_timestamp = self.compiled.get(key, (None, np.inf))
+            if program_timestamp < timestamp:
+                del self.compiled[key]
+            if key not in self.compiled:
+                context = self.get_context(dtype)
+                logging.info("building %s for OpenCL %s", key,
+                             context.devices[0].name.strip())
+                program = compile_model(self.get_context(dtype),
+                                        str(source), dtype, fast, mixed)
+                self.compiled[key] = (program, timestamp)
         return program
 
 def _get_default_context():
@@ -395,28 +410,45 @@ class GpuModel(KernelModel):
     is an optional extension which may not be available on all devices.
     Half precision ('float16','half') may be available on some devices.
     Fast precision ('fast') is a loose version of single precision, indicating
-    that the compiler is allowed to take shortcuts.
+    that the compiler is allowed to take shortcuts.  If *mixed* is True then
+    a single precision model accumulates the dispersity sums in double
+    precision, which needs a device with double precision support.
     """
-    def __init__(self, source, model_info, dtype=generate.F32, fast=False):
-        # type: (Dict[str,str], ModelInfo, np.dtype, bool) -> None
+    def __init__(self, source, model_info, dtype=generate.F32, fast=False,
+                 mixed=False):
+        # type: (Dict[str,str], ModelInfo, np.dtype, bool, bool) -> None
         self.info = model_info
         self.source = source
         self.dtype = dtype
         self.fast = fast
+        self.mixed = mixed and np.dtype(dtype) == generate.F32
         self.program = None # delay program creation
         self._kernels = None
+        self._specialized = None
+        self.input_key = ('gpu', np.dtype(dtype))
 
     def __getstate__(self):
-        # type: () -> Tuple[ModelInfo, str, np.dtype, bool]
-        return self.info, self.source, self.dtype, self.fast
+        # type: () -> Tuple[ModelInfo, str, np.dtype, bool, bool]
+        return self.info, self.source, self.dtype, self.fast, self.mixed
 
     def __setstate__(self, state):
-        # type: (Tuple[ModelInfo, str, np.dtype, bool]) -> None
-        self.info, self.source, self.dtype, self.fast = state
+        # type: (Tuple[ModelInfo, str, np.dtype, bool, bool]) -> None
+        self.info, self.source, self.dtype, self.fast, self.mixed = state
         self.program = None
+        self._kernels = None
+        self._specialized = None
+        self.input_key = ('gpu', np.dtype(self.dtype))
+
+    def make_input(self, q_vectors):
+        # type: (List[np.ndarray]) -> "GpuInput"
+        return GpuInput(q_vectors, self.dtype)
 
     def make_kernel(self, q_vectors):
-        # type: (List[np.ndarray]) -> "GpuKernel"
+        # type: (Union[List[np.ndarray], GpuInput]) -> "GpuKernel"
+        if isinstance(q_vectors, GpuInput):
+            q_input = q_vectors.acquire()
+        else:
+            q_input = self.make_input(q_vectors)
         if self.program is None:
             compile_program = environment().compile_program
             timestamp = generate.ocl_timestamp(self.info)
@@ -425,17 +457,32 @@ class GpuModel(KernelModel):
                 self.source['opencl'],
                 self.dtype,
                 self.fast,
-                timestamp)
+                timestamp,
+                mixed=self.mixed)
             variants = ['Iq', 'Iqxy', 'Imagnetic']
             names = [generate.kernel_name(self.info, k) for k in variants]
-            kernels = [getattr(self.program, k) for k in names]
-            self._kernels = dict((k, v) for k, v in zip(variants, kernels))
-        is_2d = len(q_vectors) == 2
-        if is_2d:
-            kernel = [self._kernels['Iqxy'], self._kernels['Imagnetic']]
+            self._kernels = dict((k, v) for k, v in zip(variants, names))
+            # Kernels specialized for few active dispersity loops, keyed
+            # by the number of loops, if the program has them.
+            available = set(k.function_name for k in self.program.all_kernels())
+            self._specialized = {}
+            for variant in ('Iq', 'Iqxy'):
+                loops = [(n, generate.kernel_name(self.info, variant, n))
+                         for n in generate.SPECIALIZED_LOOPS]
+                self._specialized[variant] = dict(
+                    (n, name) for n, name in loops if name in available)
+        # Each kernel gets its own cl.Kernel objects since setting the
+        # kernel arguments is not thread safe.
+        if q_input.is_2d:
+            names = [self._kernels['Iqxy'], self._kernels['Imagnetic']]
+            kernel = [cl.Kernel(self.program, name) for name in names]
         else:
-            kernel = [self._kernels['Iq']]*2
-        return GpuKernel(kernel, self.dtype, self.info, q_vectors)
+            kernel = [cl.Kernel(self.program, self._kernels['Iq'])]*2
+        variant = 'Iqxy' if q_input.is_2d else 'Iq'
+        specialized = dict((n, cl.Kernel(self.program, name))
+                           for n, name in self._specialized[variant].items())
+        return GpuKernel(kernel, self.dtype, self.info, q_input,
+                         specialized=specialized, mixed=self.mixed)
 
     def release(self):
         # type: () -> None
@@ -466,12 +513,17 @@ class GpuInput(object):
     precision, so even if the program was created for double precision,
     the *GpuProgram.dtype* may be single precision.
 
+    The input may be shared by several kernels.  Each additional user should
+    call :meth:`acquire`, and the buffer is freed once every user has
+    called :meth:`release`.
+
     Call :meth:`release` when complete.  Even if not called directly, the
     buffer will be released when the data object is freed.
     """
     def __init__(self, q_vectors, dtype=generate.F32):
         # type: (List[np.ndarray], np.dtype) -> None
         # TODO: do we ever need double precision q?
+        self._refcount = 1
         env = environment()
         self.nq = q_vectors[0].size
         self.dtype = np.dtype(dtype)
@@ -497,18 +549,32 @@ class GpuInput(object):
         self.q_b = cl.Buffer(context, mf.READ_ONLY | mf.COPY_HOST_PTR,
                              hostbuf=self.q)
 
+    def acquire(self):
+        # type: () -> "GpuInput"
+        """
+        Add a user of the buffer, returning the input.
+        """
+        self._refcount += 1
+        return self
+
     def release(self):
         # type: () -> None
         """
-        Free the memory.
+        Free the memory once all users have released it.
         """
+        self._refcount -= 1
+        if self._refcount <= 0:
+            self._free()
+
+    def _free(self):
+        # type: () -> None
         if self.q_b is not None:
             self.q_b.release()
             self.q_b = None
 
     def __del__(self):
         # type: () -> None
-        self.release()
+        self._free()
 
 class GpuKernel(Kernel):
     """
@@ -518,27 +584,38 @@ class GpuKernel(Kernel):
 
     *model_info* is the module information
 
-    *q_vectors* is the q vectors at which the kernel should be evaluated
+    *q_input* is the :class:`GpuInput` at which the kernel should be
+    evaluated.  The kernel takes ownership of the reference to the input.
 
     *dtype* is the kernel precision
 
+    If *mixed* is True then the kernel accumulates the results in double
+    precision.
+
     The resulting call method takes the *pars*, a list of values for
     the fixed parameters to the kernel, and *pd_pars*, a list of (value,weight)
     vectors for the polydisperse parameters.  *cutoff* determines the
     integration limits: any points with combined weight less than *cutoff*
     will not be calculated.
 
+    *specialized* maps the number of active dispersity loops to the kernel
+    specialized for that number, which is used instead of the generic
+    kernel for non-magnetic calculations when available.
+
     Call :meth:`release` when done with the kernel instance.
     """
-    def __init__(self, kernel, dtype, model_info, q_vectors):
-        # type: (cl.Kernel, np.dtype, ModelInfo, List[np.ndarray]) -> None
-        q_input = GpuInput(q_vectors, dtype)
+    def __init__(self, kernel, dtype, model_info, q_input, specialized=None,
+                 mixed=False):
+        # type: (cl.Kernel, np.dtype, ModelInfo, GpuInput, Optional[Dict[int, cl.Kernel]], bool) -> None
         self.kernel = kernel
+        self.specialized = specialized if specialized is not None else {}
         self.info = model_info
         self.dtype = dtype
         self.dim = '2d' if q_input.is_2d else '1d'
         # plus three for the normalization values
-        self.result = np.empty(q_input.nq+1, dtype)
+        # Mixed precision kernels accumulate the result in double.
+        self.result = np.empty(q_input.nq+1,
+                               generate.F64 if mixed else dtype)
 
         # Inputs and outputs for each kernel call
         # Note: res may be shorter than res_b if global_size != nq
@@ -546,8 +623,9 @@ class GpuKernel(Kernel):
         self.queue = env.get_queue(dtype)
 
         self.result_b = cl.Buffer(self.queue.context, mf.READ_WRITE,
-                                  q_input.global_size[0] * dtype.itemsize)
-        self.q_input = q_input # allocated by GpuInput above
+                                  q_input.global_size[0]
+                                  * self.result.dtype.itemsize)
+        self.q_input = q_input
 
         self._need_release = [self.result_b, self.q_input]
         self.real = (np.float32 if dtype == generate.F32
@@ -558,6 +636,9 @@ class GpuKernel(Kernel):
     def __call__(self, call_details, values, cutoff, magnetic):
         # type: (CallDetails, np.ndarray, np.ndarray, float, bool) -> np.ndarray
         context = self.queue.context
+        instrumented = instrument.ENABLED
+        if instrumented:
+            start_time = instrument.clock()
         # Arrange data transfer to card
         details_b = cl.Buffer(context, mf.READ_ONLY | mf.COPY_HOST_PTR,
                               hostbuf=call_details.buffer)
@@ -565,6 +646,8 @@ class GpuKernel(Kernel):
                              hostbuf=values)
 
         kernel = self.kernel[1 if magnetic else 0]
+        if not magnetic and call_details.num_eval > 0:
+            kernel = self.specialized.get(int(call_details.num_active), kernel)
         args = [
             np.uint32(self.q_input.nq), None, None,
             details_b, values_b, self.q_input.q_b, self.result_b,
@@ -572,6 +655,8 @@ class GpuKernel(Kernel):
         ]
         #print("Calling OpenCL")
         #call_details.show(values)
+        if instrumented:
+            kernel_time = instrument.clock()
         # Call kernel and retrieve results
         wait_for = None
         last_nap = time.clock()
@@ -589,6 +674,11 @@ class GpuKernel(Kernel):
                 if current_time - last_nap > 0.5:
                     time.sleep(0.05)
                     last_nap = current_time
+        if instrumented:
+            # Wait for the kernel so the copy time is only the transfer.
+            if wait_for is not None:
+                wait_for[0].wait()
+            copy_time = instrument.clock()
         cl.enqueue_copy(self.queue, self.result, self.result_b)
         #print("result", self.result)
 
@@ -597,6 +687,12 @@ class GpuKernel(Kernel):
             if v is not None:
                 v.release()
 
+        if instrumented:
+            end_time = instrument.clock()
+            instrument.record_call(
+                self, call_details, values, cutoff,
+                transfer=(kernel_time - start_time) + (end_time - copy_time),
+                kernel=copy_time - kernel_time)
         pd_norm = self.result[self.q_input.nq]
         scale = values[0]/(pd_norm if pd_norm != 0.0 else 1.0)
         background = values[1]
@@ -607,7 +703,8 @@ class GpuKernel(Kernel):
     def release(self):
         # type: () -> None
         """
-        Release resources associated with the kernel.
+        Release resources associated with the kernel.  Releasing it again
+        does nothing, so a shared q input is only released once.
         """
         for v in self._need_release:
             v.release()
@@ -57,10 +57,30 @@ If you copy this to somewhere on your path, such as the python directory or
 the install directory for this application, then OpenMP should be supported.
 
 For full control of the compiler, define a function
-*compile_command(source,output)* which takes the name of the source file
-and the name of the output file and returns a compile command that can be
-evaluated in the shell.  For even more control, replace the entire
-*compile(source,output)* function.
+*compile_command(source,output,profile)* which takes the name of the source
+file, the name of the output file and the compiler profile, and returns a
+compile command that can be evaluated in the shell.  For even more control,
+replace the entire *compile(source,output,profile)* function.
+
+The optimization level is selected by setting SAS_DLL_PROFILE in the
+environment:
+
+  - portable: the default compiler flags, giving dlls that run on any
+    machine with the same architecture.
+  - native: optimize for the processor doing the compile (*-O3
+    -march=native*) and vectorize the loop over q.  The dlls may crash
+    with an illegal instruction on older processors.
+  - fastmath: the native profile with *-ffast-math*, allowing the
+    compiler to reorder floating point operations and to use the vector
+    math library.  Results differ from the portable dlls in the last few
+    digits.  Models which are not accurate in single precision are too
+    sensitive to rounding for this, and are built with the native
+    profile instead.  Check the models against the portable profile with::
+
+        python -m sasmodels.compare_many -profile=fastmath all 100 1d100 mono double! double!
+
+The profile is included in the dll name, so dlls built with different
+profiles can coexist in the cache.  TinyCC ignores the profile.
 
 The global attribute *ALLOW_SINGLE_PRECISION_DLLS* should be set to *False* if
 you wish to prevent single precision floating point evaluation for the compiled
@@ -73,6 +93,7 @@ import os
 from os.path import join as joinpath, splitext
 import subprocess
 import tempfile
+import threading
 import ctypes as ct  # type: ignore
 import _ctypes as _ct
 import logging
@@ -85,6 +106,7 @@ except ImportError:
     tinycc = None
 
 from . import generate
+from . import instrument
 from .kernel import KernelModel, Kernel
 from .kernelpy import PyInput
 from .exception import annotate_exception
@@ -92,7 +114,7 @@ from .generate import F16, F32, F64
 
 # pylint: disable=unused-import
 try:
-    from typing import Tuple, Callable, Any
+    from typing import Tuple, Callable, Any, Union, Dict, List, Optional
     from .modelinfo import ModelInfo
     from .details import CallDetails
 except ImportError:
@@ -115,6 +137,46 @@ else:
     COMPILER = "unix"
 
 ARCH = "" if ct.sizeof(ct.c_void_p) > 4 else "x86"  # 4 byte pointers on x86
+
+#: Compiler optimization profile, from SAS_DLL_PROFILE.
+DLL_PROFILE = os.environ.get("SAS_DLL_PROFILE", "portable")
+
+# Extra compiler flags for each profile in *PROFILES*.  These are added
+# to the flags in *CC* by :func:`compile_command`.
+if COMPILER in ("unix", "mingw"):
+    _NATIVE_FLAGS = "-O3 -march=native -fopenmp-simd -DUSE_SIMD".split()
+    PROFILE_FLAGS = {
+        "portable": [],
+        "native": _NATIVE_FLAGS,
+        "fastmath": _NATIVE_FLAGS + ["-ffast-math"],
+    }
+elif COMPILER == "msvc":
+    PROFILE_FLAGS = {
+        "portable": [],
+        "native": ["/arch:AVX2"],
+        "fastmath": ["/arch:AVX2", "/fp:fast"],
+    }
+else:
+    PROFILE_FLAGS = {"portable": [], "native": [], "fastmath": []}
+
+#: Available compiler optimization profiles.
+PROFILES = ("portable", "native", "fastmath")
+
+def profile_flags(profile=None):
+    # type: (Optional[str]) -> List[str]
+    """
+    Return the extra compiler flags for *profile*, which defaults to
+    *DLL_PROFILE*.
+
+    Raises ValueError if the profile is not one of *PROFILES*.
+    """
+    if profile is None:
+        profile = DLL_PROFILE
+    if profile not in PROFILE_FLAGS:
+        raise ValueError("unknown dll profile %r; use one of %s"
+                         % (profile, ", ".join(PROFILES)))
+    return PROFILE_FLAGS[profile]
+
 if COMPILER == "unix":
     # Generic unix compile
     # On mac users will need the X code command line tools installed
@@ -126,9 +188,9 @@ if COMPILER == "unix":
         # Shut it off for all unix until we can investigate.
         #CC.append("-fopenmp")
         pass
-    def compile_command(source, output):
+    def compile_command(source, output, profile=None):
         """unix compiler command"""
-        return CC + [source, "-o", output, "-lm"]
+        return CC + profile_flags(profile) + [source, "-o", output, "-lm"]
 elif COMPILER == "msvc":
     # Call vcvarsall.bat before compiling to set path, headers, libs, etc.
     # MSVC compiler is available, so use it.  OpenMP requires a copy of
@@ -142,37 +204,38 @@ elif COMPILER == "msvc":
     if "SAS_OPENMP" in os.environ:
         CC.append("/openmp")
     LN = "/link /DLL /INCREMENTAL:NO /MANIFEST".split()
-    def compile_command(source, output):
+    def compile_command(source, output, profile=None):
         """MSVC compiler command"""
-        return CC + ["/Tp%s"%source] + LN + ["/OUT:%s"%output]
+        return CC + profile_flags(profile) + ["/Tp%s"%source] + LN + ["/OUT:%s"%output]
 elif COMPILER == "tinycc":
     # TinyCC compiler.
     CC = [tinycc.TCC] + "-shared -rdynamic -Wall".split()
-    def compile_command(source, output):
+    def compile_command(source, output, profile=None):
         """tinycc compiler command"""
-        return CC + [source, "-o", output]
+        return CC + profile_flags(profile) + [source, "-o", output]
 elif COMPILER == "mingw":
     # MinGW compiler.
     CC = "gcc -shared -std=c99 -O2 -Wall".split()
     if "SAS_OPENMP" in os.environ:
         CC.append("-fopenmp")
-    def compile_command(source, output):
+    def compile_command(source, output, profile=None):
         """mingw compiler command"""
-        return CC + [source, "-o", output, "-lm"]
+        return CC + profile_flags(profile) + [source, "-o", output, "-lm"]
 
 # Assume the default location of module DLLs is in .sasmodels/compiled_models.
 DLL_PATH = os.path.join(os.path.expanduser("~"), ".sasmodels", "compiled_models")
 
 ALLOW_SINGLE_PRECISION_DLLS = True
 
-def compile(source, output):
-    # type: (str, str) -> None
+def compile(source, output, profile=None):
+    # type: (str, str, Optional[str]) -> None
     """
-    Compile *source* producing *output*.
+    Compile *source* producing *output* using the compiler *profile*, which
+    defaults to *DLL_PROFILE*.
 
     Raises RuntimeError if the compile failed or the output wasn't produced.
     """
-    command = compile_command(source=source, output=output)
+    command = compile_command(source=source, output=output, profile=profile)
     command_str = " ".join('"%s"'%p if ' ' in p else p for p in command)
     logging.info(command_str)
     try:
@@ -184,35 +247,62 @@ def compile(source, output):
     if not os.path.exists(output):
         raise RuntimeError("compile failed.  File is in %r"%source)
 
-def dll_name(model_info, dtype):
-    # type: (ModelInfo, np.dtype) ->  str
+def dll_name(model_info, dtype, mixed=False):
+    # type: (ModelInfo, np.dtype, bool) ->  str
     """
-    Name of the dll containing the model.  This is the base file name without
-    any path or extension, with a form such as 'sas_sphere32'.
+    Name of the dll containing the model.  This is the base file name
+    with a form such as 'sas64_sphere.so', or 'sas64-native_sphere.so' for
+    dlls built with a profile other than portable.  Mixed precision dlls
+    have names such as 'sas32mixed_sphere.so'.  Models with adaptive
+    quadrature forced to a fixed size by :func:`generate.set_integration_size`
+    have names such as 'sas64_cylinder-gauss76.so'.
     """
     bits = 8*dtype.itemsize
-    basename = "sas%d_%s"%(bits, model_info.id)
+    precision = "%d%s" % (bits, "mixed" if mixed else "")
+    profile = dll_profile(model_info)
+    profile = "" if profile == "portable" else "-" + profile
+    gauss = generate.forced_integration_size(model_info)
+    gauss = "" if gauss is None else "-gauss%d" % gauss
+    basename = "sas%s%s_%s%s"%(precision, profile, model_info.id, gauss)
     basename += ARCH + ".so"
 
     # Hack to find precompiled dlls
     path = joinpath(generate.DATA_PATH, '..', 'compiled_models', basename)
-    if os.path.exists(path):
+    if not profile and not gauss and os.path.exists(path):
         return path
 
     return joinpath(DLL_PATH, basename)
 
 
-def dll_path(model_info, dtype):
-    # type: (ModelInfo, np.dtype) -> str
+def dll_profile(model_info):
+    # type: (ModelInfo) -> str
+    """
+    Compiler profile for the model.  This is *DLL_PROFILE*, except that
+    models which are not accurate in single precision use the native
+    profile rather than fastmath.
+
+    Raises ValueError if *DLL_PROFILE* is not one of *PROFILES*.
+    """
+    profile_flags()  # check the profile is valid
+    if DLL_PROFILE == "fastmath" and not model_info.single:
+        return "native"
+    return DLL_PROFILE
+
+
+def dll_path(model_info, dtype, mixed=False):
+    # type: (ModelInfo, np.dtype, bool) -> str
     """
     Complete path to the dll for the model.  Note that the dll may not
     exist yet if it hasn't been compiled.
     """
-    return os.path.join(DLL_PATH, dll_name(model_info, dtype))
+    return os.path.join(DLL_PATH, dll_name(model_info, dtype, mixed))
+
 
+# Models built in different threads may need the same dll.
+_compile_lock = threading.Lock()
 
-def make_dll(source, model_info, dtype=F64):
-    # type: (str, ModelInfo, np.dtype) -> str
+def make_dll(source, model_info, dtype=F64, mixed=False):
+    # type: (str, ModelInfo, np.dtype, bool) -> str
     """
     Returns the path to the compiled model defined by *kernel_module*.
 
@@ -222,7 +312,9 @@ def make_dll(source, model_info, dtype=F64):
 
     *dtype* is a numpy floating point precision specifier indicating whether
     the model should be single, double or long double precision.  The default
-    is double precision, *np.dtype('d')*.
+    is double precision, *np.dtype('d')*.  If *mixed* is True then a
+    single precision model accumulates the dispersity sums in double
+    precision.
 
     Set *sasmodels.ALLOW_SINGLE_PRECISION_DLLS* to False if single precision
     models are not allowed as DLLs.
@@ -235,35 +327,60 @@ def make_dll(source, model_info, dtype=F64):
     if dtype == F32 and not ALLOW_SINGLE_PRECISION_DLLS:
         dtype = F64  # Force 64-bit dll
     # Note: dtype may be F128 for long double precision
+    # Only single precision models need separate accumulators.
+    mixed = mixed and dtype == F32
 
-    dll = dll_path(model_info, dtype)
+    dll = dll_path(model_info, dtype, mixed)
 
-    if not os.path.exists(dll):
-        need_recompile = True
-    else:
-        dll_time = os.path.getmtime(dll)
-        newest_source = generate.dll_timestamp(model_info)
-        need_recompile = dll_time < newest_source
-    if need_recompile:
-        # Make sure the DLL path exists
-        if not os.path.exists(DLL_PATH):
-            os.makedirs(DLL_PATH)
-        basename = splitext(os.path.basename(dll))[0] + "_"
-        system_fd, filename = tempfile.mkstemp(suffix=".c", prefix=basename)
-        source = generate.convert_type(source, dtype)
-        with os.fdopen(system_fd, "w") as file_handle:
-            file_handle.write(source)
-        compile(source=filename, output=dll)
-        # comment the following to keep the generated c file
-        # Note: if there is a syntax error then compile raises an error
-        # and the source file will not be deleted.
-        os.unlink(filename)
-        #print("saving compiled file in %r"%filename)
+    with _compile_lock:
+        if not os.path.exists(dll):
+            need_recompile = True
+        else:
+            dll_time = os.path.getmtime(dll)
+            newest_source = generate.dll_timestamp(model_info)
+            need_recompile = dll_time < newest_source
+        if need_recompile:
+            # Make sure the DLL path exists
+            if not os.path.exists(DLL_PATH):
+                os.makedirs(DLL_PATH)
+            basename = splitext(os.path.basename(dll))[0] + "_"
+            system_fd, filename = tempfile.mkstemp(suffix=".c", prefix=basename)
+            source = generate.convert_type(source, dtype)
+            if mixed:
+                source = "#define USE_MIXED_PRECISION\n" + source
+            with os.fdopen(system_fd, "w") as file_handle:
+                file_handle.write(source)
+            # Compile to a private file and move it into place so that other
+            # processes building the same model never load a partial dll.
+            output = "%s.%d.tmp" % (dll, os.getpid())
+            compile(source=filename, output=output,
+                    profile=dll_profile(model_info))
+            _replace(output, dll)
+            # comment the following to keep the generated c file
+            # Note: if there is a syntax error then compile raises an error
+            # and the source file will not be deleted.
+            os.unlink(filename)
+            #print("saving compiled file in %r"%filename)
     return dll
 
 
-def load_dll(source, model_info, dtype=F64):
-    # type: (str, ModelInfo, np.dtype) -> "DllModel"
+def _replace(src, dst):
+    # type: (str, str) -> None
+    """
+    Move *src* to *dst*, replacing *dst* if it exists.
+    """
+    try:
+        getattr(os, 'replace', os.rename)(src, dst)
+    except OSError:
+        # python 2 on windows can't rename over an existing file; if another
+        # process has already produced the dll then use theirs.
+        if not os.path.exists(dst):
+            raise
+        os.unlink(src)
+
+
+def load_dll(source, model_info, dtype=F64, mixed=False):
+    # type: (str, ModelInfo, np.dtype, bool) -> "DllModel"
     """
     Create and load a dll corresponding to the source, info pair returned
     from :func:`sasmodels.generate.make` compiled for the target precision.
@@ -271,8 +388,9 @@ def load_dll(source, model_info, dtype=F64):
     See :func:`make_dll` for details on controlling the dll path and the
     allowed floating point precision.
     """
-    filename = make_dll(source, model_info, dtype=dtype)
-    return DllModel(filename, model_info, dtype=dtype)
+    filename = make_dll(source, model_info, dtype=dtype, mixed=mixed)
+    return DllModel(filename, model_info, dtype=dtype,
+                    mixed=mixed and np.dtype(dtype) == F32)
 
 
 class DllModel(KernelModel):
@@ -287,15 +405,21 @@ class DllModel(KernelModel):
     for single and 'd', 'float64' or 'double' for double.  Double precision
     is an optional extension which may not be available on all devices.
 
+    *mixed* is True if the dll accumulates the dispersity sums in double
+    precision, as built by :func:`make_dll` with *mixed=True*.
+
     Call :meth:`release` when done with the kernel.
     """
-    def __init__(self, dllpath, model_info, dtype=generate.F32):
-        # type: (str, ModelInfo, np.dtype) -> None
+    def __init__(self, dllpath, model_info, dtype=generate.F32, mixed=False):
+        # type: (str, ModelInfo, np.dtype, bool) -> None
         self.info = model_info
         self.dllpath = dllpath
         self._dll = None  # type: ct.CDLL
         self._kernels = None # type: List[Callable, Callable]
+        self._specialized = None # type: List[Dict[int, Callable]]
         self.dtype = np.dtype(dtype)
+        self.mixed = mixed
+        self.input_key = ('py', self.dtype)
 
     def _load_dll(self):
         # type: () -> None
@@ -316,25 +440,49 @@ class DllModel(KernelModel):
         self._kernels = [self._dll[name] for name in names]
         for k in self._kernels:
             k.argtypes = argtypes
+        # Kernels specialized for few active dispersity loops, keyed by the
+        # number of loops.  Older dlls and models with fewer loops don't
+        # have them.
+        self._specialized = []
+        for variant in ("Iq", "Iqxy"):
+            specialized = {}
+            for num_loops in generate.SPECIALIZED_LOOPS:
+                name = generate.kernel_name(self.info, variant, num_loops)
+                try:
+                    specialized[num_loops] = self._dll[name]
+                except AttributeError:
+                    continue
+                specialized[num_loops].argtypes = argtypes
+            self._specialized.append(specialized)
 
     def __getstate__(self):
-        # type: () -> Tuple[ModelInfo, str]
-        return self.info, self.dllpath
+        # type: () -> Tuple[ModelInfo, str, np.dtype, bool]
+        return self.info, self.dllpath, self.dtype, self.mixed
 
     def __setstate__(self, state):
-        # type: (Tuple[ModelInfo, str]) -> None
-        self.info, self.dllpath = state
+        # type: (Tuple[ModelInfo, str, np.dtype, bool]) -> None
+        self.info, self.dllpath, self.dtype, self.mixed = state
         self._dll = None
+        self.input_key = ('py', self.dtype)
+
+    def make_input(self, q_vectors):
+        # type: (List[np.ndarray]) -> PyInput
+        return PyInput(q_vectors, self.dtype)
 
     def make_kernel(self, q_vectors):
-        # type: (List[np.ndarray]) -> DllKernel
-        q_input = PyInput(q_vectors, self.dtype)
+        # type: (Union[List[np.ndarray], PyInput]) -> DllKernel
+        if isinstance(q_vectors, PyInput):
+            q_input = q_vectors.acquire()
+        else:
+            q_input = self.make_input(q_vectors)
         # Note: pickle not supported for DllKernel
         if self._dll is None:
             self._load_dll()
-        is_2d = len(q_vectors) == 2
+        is_2d = q_input.is_2d
         kernel = self._kernels[1:3] if is_2d else [self._kernels[0]]*2
-        return DllKernel(kernel, self.info, q_input)
+        specialized = self._specialized[1 if is_2d else 0]
+        return DllKernel(kernel, self.info, q_input, specialized=specialized,
+                         mixed=self.mixed)
 
     def release(self):
         # type: () -> None
@@ -366,16 +514,25 @@ class DllKernel(Kernel):
     integration limits: any points with combined weight less than *cutoff*
     will not be calculated.
 
+    *specialized* maps the number of active dispersity loops to the c
+    function specialized for that number, which is used instead of the
+    generic kernel for non-magnetic calculations when available.
+
+    If *mixed* is True then the kernel accumulates the results in double
+    precision.
+
     Call :meth:`release` when done with the kernel instance.
     """
-    def __init__(self, kernel, model_info, q_input):
-        # type: (Callable[[], np.ndarray], ModelInfo, PyInput) -> None
+    def __init__(self, kernel, model_info, q_input, specialized=None,
+                 mixed=False):
+        # type: (Callable[[], np.ndarray], ModelInfo, PyInput, Optional[Dict[int, Callable]], bool) -> None
         self.kernel = kernel
+        self.specialized = specialized if specialized is not None else {}
         self.info = model_info
         self.q_input = q_input
         self.dtype = q_input.dtype
         self.dim = '2d' if q_input.is_2d else '1d'
-        self.result = np.empty(q_input.nq+1, q_input.dtype)
+        self.result = np.empty(q_input.nq+1, F64 if mixed else q_input.dtype)
         self.real = (np.float32 if self.q_input.dtype == generate.F32
                      else np.float64 if self.q_input.dtype == generate.F64
                      else np.float128)
@@ -384,6 +541,8 @@ class DllKernel(Kernel):
         # type: (CallDetails, np.ndarray, np.ndarray, float, bool) -> np.ndarray
 
         kernel = self.kernel[1 if magnetic else 0]
+        if not magnetic and call_details.num_eval > 0:
+            kernel = self.specialized.get(int(call_details.num_active), kernel)
         args = [
             self.q_input.nq, # nq
             None, # pd_start
@@ -396,11 +555,17 @@ class DllKernel(Kernel):
         ]
         #print("Calling DLL")
         #call_details.show(values)
+        instrumented = instrument.ENABLED
+        if instrumented:
+            start_time = instrument.clock()
         step = 100
         for start in range(0, call_details.num_eval, step):
             stop = min(start + step, call_details.num_eval)
             args[1:3] = [start, stop]
             kernel(*args) # type: ignore
+        if instrumented:
+            instrument.record_call(self, call_details, values, cutoff,
+                                   kernel=instrument.clock()-start_time)
 
         #print("returned",self.q_input.q, self.result)
         pd_norm = self.result[self.q_input.nq]
@@ -412,6 +577,122 @@ class DllKernel(Kernel):
     def release(self):
         # type: () -> None
         """
-        Release any resources associated with the kernel.
+        Release any resources associated with the kernel.  Releasing it
+        again does nothing, so a shared q input is only released once.
         """
-        self.q_input.release()
+        if self.q_input is not None:
+            self.q_input.release()
+            self.q_input = None
+
+
+def test_specialized_kernels():
+    # type: () -> None
+    """
+    Check that the kernels specialized for few dispersity loops match the
+    generic kernel.
+    """
+    from .core import load_model
+    from .direct_model import call_kernel
+    model = load_model('cylinder', dtype='double', platform='dll')
+    q = np.logspace(-3, -1, 20)
+    qx, qy = np.meshgrid(np.linspace(-0.1, 0.1, 5), np.linspace(-0.1, 0.1, 5))
+    cases = [
+        ([q], {}),
+        ([q], dict(radius_pd=0.1, radius_pd_n=10)),
+        ([q], dict(radius_pd=0.1, radius_pd_n=10, length_pd=0.1, length_pd_n=5)),
+        ([qx.flatten(), qy.flatten()], dict(theta=30, phi=20)),
+        ([qx.flatten(), qy.flatten()], dict(theta=30, theta_pd=5, theta_pd_n=7)),
+        ]
+    for q_vectors, pars in cases:
+        kernel = model.make_kernel(q_vectors)
+        assert sorted(kernel.specialized.keys()) == [0, 1]
+        specialized = call_kernel(kernel, pars)
+        kernel.specialized = {}
+        generic = call_kernel(kernel, pars)
+        assert np.allclose(specialized, generic, rtol=1e-14, atol=0), pars
+
+def test_profiles():
+    # type: () -> None
+    """
+    Check that the compiler profile is part of the dll name, and that the
+    native profile matches the portable profile.
+    """
+    global DLL_PROFILE
+    from .core import load_model_info, build_model
+    from .direct_model import call_kernel
+    sphere, hardsphere = load_model_info('sphere'), load_model_info('hardsphere')
+    q = np.logspace(-3, -1, 20)
+    pars = dict(radius=50, radius_pd=0.1, radius_pd_n=10)
+    old_profile = DLL_PROFILE
+    try:
+        results = {}
+        for profile in ('portable', 'native'):
+            DLL_PROFILE = profile
+            model = build_model(sphere, dtype='double', platform='dll')
+            results[profile] = call_kernel(model.make_kernel([q]), pars)
+            assert model.dllpath == dll_path(sphere, F64)
+            model.release()
+        assert np.allclose(results['portable'], results['native'],
+                           rtol=1e-14, atol=0)
+        DLL_PROFILE = 'fastmath'
+        assert dll_profile(sphere) == 'fastmath'
+        # Models which need double precision are not built with fast math.
+        assert dll_profile(hardsphere) == 'native'
+        assert os.path.basename(dll_name(hardsphere, F64)) == "sas64-native_hardsphere%s.so" % ARCH
+        DLL_PROFILE = 'bogus'
+        try:
+            dll_name(sphere, F64)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("unknown profile should fail")
+    finally:
+        DLL_PROFILE = old_profile
+
+def test_mixed_precision():
+    # type: () -> None
+    """
+    Check that mixed precision dlls are more accurate than single precision
+    for a large dispersity mesh.
+    """
+    from .core import load_model_info, build_model
+    from .direct_model import call_kernel
+    info = load_model_info('core_shell_sphere')
+    q = np.logspace(-3, -1, 50)
+    pars = dict(radius=60, radius_pd=0.3, radius_pd_n=300,
+                thickness=10, thickness_pd=0.3, thickness_pd_n=300)
+    results = {}
+    for dtype in ('double', 'single', 'single+'):
+        model = build_model(info, dtype=dtype, platform='dll')
+        kernel = model.make_kernel([q])
+        results[dtype] = call_kernel(kernel, pars)
+    assert model.mixed and kernel.result.dtype == F64
+    assert 'sas32mixed_' in model.dllpath
+    target = results['double']
+    single = np.max(abs(results['single'] - target)/target)
+    mixed = np.max(abs(results['single+'] - target)/target)
+    assert mixed < 1e-5 and mixed < single/4, (mixed, single)
+
+def test_adaptive_quadrature():
+    # type: () -> None
+    """
+    Check that adaptive quadrature matches a large fixed size quadrature
+    and that the fixed size dlls are kept separate.
+    """
+    from .core import load_model_info, build_model
+    from .direct_model import call_kernel
+    q = np.logspace(-3, -1, 50)
+    pars = dict(radius=20, length=800)  # q*r up to 40
+    results = {}
+    for n in (None, 20, 150):
+        info = load_model_info('cylinder')
+        if n is not None:
+            generate.set_integration_size(info, n)
+        model = build_model(info, dtype='double', platform='dll')
+        assert model.dllpath == dll_path(info, F64)
+        results[n] = call_kernel(model.make_kernel([q]), pars)
+    assert model.dllpath.endswith('_cylinder-gauss150' + ARCH + '.so')
+    target = results[150]
+    adaptive = np.max(abs(results[None] - target)/target)
+    fixed = np.max(abs(results[20] - target)/target)
+    assert adaptive < 1e-6 < fixed, (adaptive, fixed)
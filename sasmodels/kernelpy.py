@@ -12,6 +12,7 @@ import logging
 
 import numpy as np  # type: ignore
 
+from . import instrument
 from .generate import F64
 from .kernel import KernelModel, Kernel
 
@@ -36,10 +37,17 @@ class PyModel(KernelModel):
         _create_default_functions(model_info)
         self.info = model_info
         self.dtype = np.dtype('d')
+        self.input_key = ('py', F64)
         logger.info("load python model " + self.info.name)
 
+    def make_input(self, q_vectors):
+        return PyInput(q_vectors, dtype=F64)
+
     def make_kernel(self, q_vectors):
-        q_input = PyInput(q_vectors, dtype=F64)
+        if isinstance(q_vectors, PyInput):
+            q_input = q_vectors.acquire()
+        else:
+            q_input = self.make_input(q_vectors)
         return PyKernel(self.info, q_input)
 
     def release(self):
@@ -64,10 +72,15 @@ class PyInput(object):
     precision, so even if the program was created for double precision,
     the *GpuProgram.dtype* may be single precision.
 
+    The input may be shared by several kernels.  Each additional user should
+    call :meth:`acquire`, and the q vectors are freed once every user has
+    called :meth:`release`.
+
     Call :meth:`release` when complete.  Even if not called directly, the
     buffer will be released when the data object is freed.
     """
     def __init__(self, q_vectors, dtype):
+        self._refcount = 1
         self.nq = q_vectors[0].size
         self.dtype = dtype
         self.is_2d = (len(q_vectors) == 2)
@@ -79,11 +92,20 @@ class PyInput(object):
             self.q = np.empty(self.nq, dtype=dtype)
             self.q[:self.nq] = q_vectors[0]
 
+    def acquire(self):
+        """
+        Add a user of the inputs, returning the inputs.
+        """
+        self._refcount += 1
+        return self
+
     def release(self):
         """
         Free resources associated with the model inputs.
         """
-        self.q = None
+        self._refcount -= 1
+        if self._refcount <= 0:
+            self.q = None
 
 class PyKernel(Kernel):
     """
@@ -167,17 +189,25 @@ class PyKernel(Kernel):
             raise NotImplementedError("Magnetism not implemented for pure python models")
         #print("Calling python kernel")
         #call_details.show(values)
+        instrumented = instrument.ENABLED
+        if instrumented:
+            start_time = instrument.clock()
         res = _loops(self._parameter_vector, self._form, self._volume,
                      self.q_input.nq, call_details, values, cutoff)
+        if instrumented:
+            instrument.record_call(self, call_details, values, cutoff,
+                                   kernel=instrument.clock()-start_time)
         return res
 
     def release(self):
         # type: () -> None
         """
-        Free resources associated with the kernel.
+        Free resources associated with the kernel.  Releasing it again
+        does nothing, so a shared q input is only released once.
         """
-        self.q_input.release()
-        self.q_input = None
+        if self.q_input is not None:
+            self.q_input.release()
+            self.q_input = None
 
 def _loops(parameters,    # type: np.ndarray
            form,          # type: Callable[[], np.ndarray]
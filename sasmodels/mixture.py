@@ -12,20 +12,30 @@ To use it, first load form factor P and structure factor S, then create
 """
 from __future__ import print_function
 
+import os
 from copy import copy
+from multiprocessing.pool import ThreadPool
+
 import numpy as np  # type: ignore
 
 from .modelinfo import Parameter, ParameterTable, ModelInfo
-from .kernel import KernelModel, Kernel
+from .kernel import KernelModel, Kernel, make_shared_kernels
 from .details import make_details
 
 # pylint: disable=unused-import
 try:
-    from typing import List
+    from typing import List, Optional
 except ImportError:
     pass
 # pylint: enable=unused-import
 
+#: Number of threads used to evaluate the parts of a mixture concurrently.
+#: The default of 0 evaluates the parts one after another.  This is set
+#: from SAS_MIXTURE_THREADS in the environment, and can be overridden for
+#: a particular model with *MixtureModel(..., threads=n)*.  Threads only
+#: help for kernels which release the GIL, such as the DLL kernels.
+THREADS = int(os.environ.get("SAS_MIXTURE_THREADS", "0"))
+
 def make_mixture_info(parts, operation='+'):
     # type: (List[ModelInfo]) -> ModelInfo
     """
@@ -149,22 +159,23 @@ def make_mixture_info(parts, operation='+'):
 
 
 class MixtureModel(KernelModel):
-    def __init__(self, model_info, parts):
-        # type: (ModelInfo, List[KernelModel]) -> None
+    def __init__(self, model_info, parts, threads=None):
+        # type: (ModelInfo, List[KernelModel], Optional[int]) -> None
         self.info = model_info
         self.parts = parts
         self.dtype = parts[0].dtype
+        #: Number of threads for evaluating the parts, or None for THREADS.
+        self.threads = threads
 
     def make_kernel(self, q_vectors):
         # type: (List[np.ndarray]) -> MixtureKernel
-        # Note: may be sending the q_vectors to the n times even though they
-        # are only needed once.  It would mess up modularity quite a bit to
-        # handle this optimally, especially since there are many cases where
-        # separate q vectors are needed (e.g., form in python and structure
-        # in opencl; or both in opencl, but one in single precision and the
-        # other in double precision).
-        kernels = [part.make_kernel(q_vectors) for part in self.parts]
-        return MixtureKernel(self.info, kernels)
+        # Parts share the q input if they use the same kind of input.
+        # Separate inputs are still needed if, e.g., one part is in python
+        # and another in opencl, or both are in opencl but one is in single
+        # precision and the other in double precision.
+        kernels = make_shared_kernels(self.parts, q_vectors)
+        threads = THREADS if self.threads is None else self.threads
+        return MixtureKernel(self.info, kernels, threads=threads)
 
     def release(self):
         # type: () -> None
@@ -176,14 +187,23 @@ class MixtureModel(KernelModel):
 
 
 class MixtureKernel(Kernel):
-    def __init__(self, model_info, kernels):
-        # type: (ModelInfo, List[Kernel]) -> None
+    """
+    Evaluate a mixture by calling the kernels for each part.
+
+    If *threads* is more than one, the parts are evaluated concurrently
+    on a pool of up to *threads* threads belonging to this kernel, and
+    the results are combined in the original order.
+    """
+    def __init__(self, model_info, kernels, threads=0):
+        # type: (ModelInfo, List[Kernel], int) -> None
         self.dim = kernels[0].dim
         self.info = model_info
         self.kernels = kernels
         self.dtype = self.kernels[0].dtype
         self.operation = model_info.operation
         self.results = []  # type: List[np.ndarray]
+        self.threads = min(threads, len(kernels))
+        self._pool = None  # type: ThreadPool
 
     def __call__(self, call_details, values, cutoff, magnetic):
         # type: (CallDetails, np.ndarray, np.ndarry, float, bool) -> np.ndarray
@@ -191,10 +211,18 @@ class MixtureKernel(Kernel):
         total = 0.0
         # remember the parts for plotting later
         self.results = []  # type: List[np.ndarray]
-        parts = MixtureParts(self.info, self.kernels, call_details, values)
-        for kernel, kernel_details, kernel_values in parts:
+        parts = list(MixtureParts(self.info, self.kernels, call_details, values))
+        def call_part(part):
+            kernel, kernel_details, kernel_values = part
             #print("calling kernel", kernel.info.name)
-            result = kernel(kernel_details, kernel_values, cutoff, magnetic)
+            return kernel(kernel_details, kernel_values, cutoff, magnetic)
+        if self.threads > 1:
+            if self._pool is None:
+                self._pool = ThreadPool(self.threads)
+            part_results = self._pool.map(call_part, parts)
+        else:
+            part_results = [call_part(part) for part in parts]
+        for (kernel, _, _), result in zip(parts, part_results):
             result = np.array(result).astype(kernel.dtype)
             # print(kernel.info.name, result)
             if self.operation == '+':
@@ -210,6 +238,9 @@ class MixtureKernel(Kernel):
 
     def release(self):
         # type: () -> None
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
         for k in self.kernels:
             k.release()
 
@@ -296,3 +327,24 @@ class MixtureParts(object):
         values.append([zero]*spacer)
         values = np.hstack(values).astype(self.kernels[0].dtype)
         return values
+
+
+def test_threads():
+    """
+    Check that evaluating the parts on threads gives the same result.
+    """
+    from .core import load_model_info, build_model
+    from .direct_model import call_kernel
+
+    q = np.logspace(-3, -1, 200)
+    model_info = load_model_info('sphere+cylinder+lorentz')
+    pars = {'A_radius': 60., 'B_radius': 20., 'B_length': 400.,
+            'A_radius_pd': 0.1, 'A_radius_pd_n': 35}
+    serial = build_model(model_info, platform='dll')
+    parallel = MixtureModel(model_info, serial.parts, threads=3)
+    kernel = parallel.make_kernel([q])
+    assert kernel.threads == 3
+    target = call_kernel(serial.make_kernel([q]), pars)
+    for _ in range(3):
+        assert (call_kernel(kernel, pars) == target).all()
+    kernel.release()
@@ -41,11 +41,19 @@ model and value is the value to use for the test.  Any parameters not given
 in the parameter list will take on the default parameter value.
 
 Precision defaults to 5 digits (relative).
+
+Use *-nproc=n* to test the models in *n* processes, or one per cpu if *n*
+is 0.  This reports the time to build each model and to run its tests.
+Use *-budget=seconds* to fail any model which takes longer than that in
+total; a model which is still running after that time is stopped.
+Compiled models are shared between the processes through the dll cache.
 """
 from __future__ import print_function
 
 import sys
+import time
 import unittest
+import traceback
 
 try:
     from StringIO import StringIO
@@ -65,7 +73,7 @@ from .kernelcl import use_opencl
 
 # pylint: disable=unused-import
 try:
-    from typing import List, Iterator, Callable
+    from typing import List, Iterator, Callable, Dict, Any, Optional, Tuple
 except ImportError:
     pass
 else:
@@ -88,14 +96,7 @@ def make_suite(loaders, models):
     ModelTestCase = _hide_model_case_from_nose()
     suite = unittest.TestSuite()
 
-    if models[0] in core.KINDS:
-        skip = models[1:]
-        models = list_models(models[0])
-    else:
-        skip = []
-    for model_name in models:
-        if model_name in skip:
-            continue
+    for model_name in expand_models(models):
         model_info = load_model_info(model_name)
 
         #print('------')
@@ -161,6 +162,22 @@ def make_suite(loaders, models):
 
     return suite
 
+def expand_models(models):
+    # type: (List[str]) -> List[str]
+    """
+    Return the list of model names to test.  If the first entry in
+    *models* is a model kind such as 'all', then return the models of
+    that kind except for the remaining models in the list.
+    """
+    if models[0] in core.KINDS:
+        skip = models[1:]
+        return [name for name in list_models(models[0]) if name not in skip]
+    return list(models)
+
+def _clock():
+    # type: () -> float
+    return getattr(time, 'perf_counter', time.time)()
+
 def _hide_model_case_from_nose():
     # type: () -> type
     class ModelTestCase(unittest.TestCase):
@@ -179,6 +196,8 @@ def _hide_model_case_from_nose():
             self.platform = platform
             self.dtype = dtype
             self.stash = stash  # container for the results of the first run
+            self.build_time = 0.  # seconds to build the model
+            self.eval_time = 0.  # seconds to run the tests
 
             setattr(self, test_method_name, self.run_all)
             unittest.TestCase.__init__(self, test_method_name)
@@ -207,9 +226,15 @@ def _hide_model_case_from_nose():
             if self.info.tests is not None:
                 tests += self.info.tests
             try:
+                start = _clock()
                 model = build_model(self.info, dtype=self.dtype,
                                     platform=self.platform)
-                results = [self.run_one(model, test) for test in tests]
+                self.build_time = _clock() - start
+                start = _clock()
+                try:
+                    results = [self.run_one(model, test) for test in tests]
+                finally:
+                    self.eval_time = _clock() - start
                 if self.stash:
                     for test, target, actual in zip(tests, self.stash[0], results):
                         assert np.all(abs(target-actual) < 5e-5*abs(actual)), \
@@ -404,6 +429,161 @@ def run_one(model):
     return output
 
 
+def time_model(loaders, model):
+    # type: (List[str], str) -> Dict[str, Any]
+    """
+    Run the tests for *model* with each of *loaders*.
+
+    Returns a dictionary with the *model* name, the *build_time* and
+    *eval_time* in seconds summed over the loaders, the *tests* with the
+    *name*, *build_time* and *eval_time* for each loader, and a list of
+    *errors* as formatted tracebacks.
+    """
+    report = dict(model=model, build_time=0., eval_time=0., tests=[],
+                  errors=[])
+    try:
+        suite = make_suite(loaders, [model])
+    except Exception:
+        report['errors'].append(traceback.format_exc())
+        return report
+    # Note: the suite releases its tests as they are run.
+    tests = list(suite)
+    result = unittest.TestResult()
+    suite.run(result)
+    for test in tests:
+        report['build_time'] += test.build_time
+        report['eval_time'] += test.eval_time
+        report['tests'].append(dict(name=test.test_name,
+                                    build_time=test.build_time,
+                                    eval_time=test.eval_time))
+    for test, trace in result.errors + result.failures:
+        report['errors'].append("%s\n%s" % (test.test_name, trace))
+    return report
+
+def _time_model_process(loaders, model, conn):
+    # type: (List[str], str, Any) -> None
+    conn.send(time_model(loaders, model))
+    conn.close()
+
+def _failed_report(model, error):
+    # type: (str, str) -> Dict[str, Any]
+    return dict(model=model, build_time=0., eval_time=0., tests=[],
+                errors=[error])
+
+def _run_processes(tasks, nproc, budget):
+    # type: (List[Tuple[List[str], str]], int, Optional[float]) -> Iterator[Dict[str, Any]]
+    """
+    Yield the reports from :func:`time_model` for each of *tasks*, with
+    each task run in its own process and up to *nproc* running at once.
+    A task still running after *budget* seconds is stopped and reported
+    as failed.
+    """
+    import multiprocessing
+    pending = list(tasks)
+    running = []  # type: List[Tuple[Any, Any, str, float]]
+    try:
+        while pending or running:
+            while pending and len(running) < nproc:
+                loaders, model = pending.pop(0)
+                conn, child_conn = multiprocessing.Pipe(duplex=False)
+                process = multiprocessing.Process(
+                    target=_time_model_process,
+                    args=(loaders, model, child_conn))
+                process.daemon = True
+                process.start()
+                child_conn.close()
+                running.append((process, conn, model, time.time()))
+            finished = False
+            for item in running[:]:
+                process, conn, model, start = item
+                elapsed = time.time() - start
+                if conn.poll():
+                    try:
+                        report = conn.recv()
+                    except EOFError:
+                        report = _failed_report(
+                            model, "%s: test process ended with exit code %s"
+                            % (model, process.exitcode))
+                elif not process.is_alive() and not conn.poll():
+                    report = _failed_report(
+                        model, "%s: test process ended with exit code %s"
+                        % (model, process.exitcode))
+                elif budget is not None and elapsed > budget:
+                    process.terminate()
+                    report = _failed_report(
+                        model, "%s was stopped after %.2f s, which is more"
+                        " than the budget of %.2f s" % (model, elapsed, budget))
+                else:
+                    continue
+                running.remove(item)
+                process.join()
+                conn.close()
+                finished = True
+                yield report
+            if not finished:
+                time.sleep(0.01)
+    finally:
+        for process, conn, _, _ in running:
+            process.terminate()
+            process.join()
+            conn.close()
+
+def run_models(loaders, models, nproc=1, budget=None, verbose=True):
+    # type: (List[str], List[str], int, Optional[float], int) -> List[Dict[str, Any]]
+    """
+    Run the tests for *models* using *nproc* processes.
+
+    *models* is as for :func:`make_suite`.  Each model is tested in
+    its own process, with up to *nproc* models tested at once.  Models
+    which take longer than *budget* seconds to build and test have an
+    error added to their report, and a model which is still running after
+    *budget* seconds is stopped and reported as failed.  The models are
+    tested in this process if *nproc* is 1 and there is no *budget*.  If
+    *verbose*, print a line for each model as it completes, then the
+    errors.  If *verbose* is 2 or more, also print a line for each loader
+    tested.
+
+    Returns the reports from :func:`time_model` in the order that the
+    models completed.
+    """
+    tasks = [(loaders, name) for name in expand_models(models)]
+    if nproc > 1 or budget is not None:
+        results = _run_processes(tasks, nproc, budget)
+    else:
+        results = (time_model(*task) for task in tasks)
+    if verbose:
+        print("%-30s %10s %10s" % ("model", "build s", "test s"))
+    reports = []
+    try:
+        for report in results:
+            total = report['build_time'] + report['eval_time']
+            if budget is not None and total > budget:
+                report['errors'].append(
+                    "%s took %.2f s, which is more than the budget of %.2f s"
+                    % (report['model'], total, budget))
+            if verbose:
+                print("%-30s %10.3f %10.3f %s"
+                      % (report['model'], report['build_time'],
+                         report['eval_time'],
+                         "FAIL" if report['errors'] else "ok"))
+                if verbose > 1:
+                    for test in report['tests']:
+                        print("  %-28s %10.3f %10.3f"
+                              % (test['name'], test['build_time'],
+                                 test['eval_time']))
+                sys.stdout.flush()
+            reports.append(report)
+    finally:
+        # Stop the processes which are still running.
+        results.close()
+    if verbose:
+        failed = [report for report in reports if report['errors']]
+        for report in failed:
+            print("\n"+"="*70)
+            print("\n".join(report['errors']))
+        print("\n%d models, %d failed" % (len(reports), len(failed)))
+    return reports
+
 def main(*models):
     # type: (*str) -> int
     """
@@ -418,6 +598,18 @@ def main(*models):
         from unittest import TextTestRunner as TestRunner
         test_args = {}
 
+    nproc, budget = None, None
+    options = [arg for arg in models if arg.startswith('-nproc=')
+               or arg.startswith('-budget=')]
+    models = tuple(arg for arg in models if arg not in options)
+    for opt in options:
+        key, value = opt[1:].split('=', 1)
+        if key == 'nproc':
+            import multiprocessing
+            nproc = int(value) or multiprocessing.cpu_count()
+        else:
+            budget = float(value)
+
     if models and models[0] == '-v':
         verbosity = 2
         models = models[1:]
@@ -441,9 +633,14 @@ def main(*models):
     if not models:
         print("""\
 usage:
-  python -m sasmodels.model_test [-v] [opencl|dll] model1 model2 ...
+  python -m sasmodels.model_test [-v] [-nproc=n] [-budget=s] [opencl|dll] model1 model2 ...
 
-If -v is included on the command line, then use verbose output.
+If -v is included on the command line, then use verbose output.  With
+-nproc or -budget this lists the times for each compute target.
+
+If -nproc or -budget is included, then test the models in n processes
+(0 for one per cpu) and report the build and test time for each model,
+failing any which take longer than s seconds.
 
 If neither opencl nor dll is specified, then models will be tested with
 both OpenCL and dll; the compute target is ignored for pure python models.
@@ -454,11 +651,35 @@ If model1 is 'all', then all except the remaining models will be tested.
 
         return 1
 
+    if nproc is not None or budget is not None:
+        reports = run_models(loaders, list(models), nproc=nproc or 1,
+                             budget=budget, verbose=verbosity)
+        return 1 if any(report['errors'] for report in reports) else 0
+
     runner = TestRunner(verbosity=verbosity, **test_args)
     result = runner.run(make_suite(loaders, models))
     return 1 if result.failures or result.errors else 0
 
 
+def test_time_model():
+    # type: () -> None
+    """
+    Check the timing report for a model and the time budget.
+    """
+    report = time_model(['dll'], 'sphere')
+    assert set(report) == set(('model', 'build_time', 'eval_time', 'tests',
+                               'errors'))
+    assert report['model'] == 'sphere' and not report['errors']
+    assert report['build_time'] > 0 and report['eval_time'] > 0
+    assert len(report['tests']) == 1
+    assert np.isclose(report['tests'][0]['eval_time'], report['eval_time'])
+    report, = run_models(['dll'], ['sphere'], budget=60., verbose=False)
+    assert not report['errors'] and report['eval_time'] > 0
+    # The model is stopped before it can finish.
+    report, = run_models(['dll'], ['sphere'], budget=0., verbose=False)
+    assert any('stopped' in error for error in report['errors'])
+
+
 def model_tests():
     # type: () -> Iterator[Callable[[], None]]
     """
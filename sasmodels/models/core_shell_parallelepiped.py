@@ -182,7 +182,7 @@ parameters = [["sld_core", "1e-6/Ang^2", 1, [-inf, inf], "sld",
                "rotation about c axis"],
              ]
 
-source = ["lib/gauss76.c", "core_shell_parallelepiped.c"]
+source = ["lib/gauss_adaptive.c", "core_shell_parallelepiped.c"]
 
 
 def ER(length_a, length_b, length_c, thick_rim_a, thick_rim_b, thick_rim_c):
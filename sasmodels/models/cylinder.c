@@ -19,14 +19,19 @@ orient_avg_1D(double q, double radius, double length)
     const double zm = M_PI_4;
     const double zb = M_PI_4;
 
+    // choose the number of points from q times the distance to the rim
+    int n;
+    constant double *z, *w;
+    GAUSS_RULE(q*sqrt(radius*radius + 0.25*length*length), n, z, w);
+
     double total = 0.0;
-    for (int i=0; i<GAUSS_N ;i++) {
-        const double theta = GAUSS_Z[i]*zm + zb;
+    for (int i=0; i<n ;i++) {
+        const double theta = z[i]*zm + zb;
         double sin_theta, cos_theta; // slots to hold sincos function output
         // theta (theta,phi) the projection of the cylinder on the detector plane
         SINCOS(theta , sin_theta, cos_theta);
         const double form = fq(q*sin_theta, q*cos_theta, radius, length);
-        total += GAUSS_W[i] * form * form * sin_theta;
+        total += w[i] * form * form * sin_theta;
     }
     // translate dx in [-1,1] to dx in [lower,upper]
     return total*zm;
@@ -24,12 +24,15 @@ Iq(double q,
     // const double u = GAUSS_Z[i]*(upper-lower)/2 + (upper+lower)/2;
     const double zm = 0.5;
     const double zb = 0.5;
+    int n;
+    constant double *z, *w;
+    GAUSS_RULE(q*fmax(radius_polar, radius_equatorial), n, z, w);
     double total = 0.0;
-    for (int i=0;i<GAUSS_N;i++) {
-        const double u = GAUSS_Z[i]*zm + zb;
+    for (int i=0;i<n;i++) {
+        const double u = z[i]*zm + zb;
         const double r = radius_equatorial*sqrt(1.0 + u*u*v_square_minus_one);
         const double f = sas_3j1x_x(q*r);
-        total += GAUSS_W[i] * f * f;
+        total += w[i] * f * f;
     }
     // translate dx in [-1,1] to dx in [lower,upper]
     const double form = total*zm;
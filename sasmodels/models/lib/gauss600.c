@@ -0,0 +1,1215 @@
+// Generated by sasmodels.gengauss.gengauss(600)
+
+#ifdef GAUSS_N
+# undef GAUSS_N
+# undef GAUSS_Z
+# undef GAUSS_W
+#endif
+#define GAUSS_N 600
+#define GAUSS_Z Gauss600Z
+#define GAUSS_W Gauss600Wt
+
+constant double Gauss600Wt[600]={
+	 2.057885378710974e-05,
+	 4.790310784967142e-05,
+	 7.526651167192402e-05,
+	 1.026313698086411e-04,
+	 1.299941245042197e-04,
+	 1.573535326274099e-04,
+	 1.847087143180935e-04,
+	 2.120588763153333e-04,
+	 2.394032521348101e-04,
+	 2.667410852168931e-04,
+	 2.940716232574191e-04,
+	 3.213941160540307e-04,
+	 3.487078145421951e-04,
+	 3.760119704150055e-04,
+	 4.033058358917884e-04,
+	 4.305886636474861e-04,
+	 4.578597067554326e-04,
+	 4.851182186807244e-04,
+	 5.123634532584119e-04,
+	 5.395946647327314e-04,
+	 5.668111077339601e-04,
+	 5.940120373160433e-04,
+	 6.211967089703015e-04,
+	 6.483643786302320e-04,
+	 6.755143027071614e-04,
+	 7.026457380987277e-04,
+	 7.297579422115372e-04,
+	 7.568501729793872e-04,
+	 7.839216888864768e-04,
+	 8.109717489863956e-04,
+	 8.379996129153992e-04,
+	 8.650045409207330e-04,
+	 8.919857938811452e-04,
+	 9.189426333183609e-04,
+	 9.458743214282974e-04,
+	 9.727801210900403e-04,
+	 9.996592958942667e-04,
+	 1.026511110162646e-03,
+	 1.053334828960432e-03,
+	 1.080129718127268e-03,
+	 1.106895044290637e-03,
+	 1.133630074882933e-03,
+	 1.160334078173745e-03,
+	 1.187006323274492e-03,
+	 1.213646080168456e-03,
+	 1.240252619731501e-03,
+	 1.266825213743555e-03,
+	 1.293363134918149e-03,
+	 1.319865656913004e-03,
+	 1.346332054357900e-03,
+	 1.372761602872492e-03,
+	 1.399153579081589e-03,
+	 1.425507260640611e-03,
+	 1.451821926253474e-03,
+	 1.478096855689553e-03,
+	 1.504331329808907e-03,
+	 1.530524630576348e-03,
+	 1.556676041084361e-03,
+	 1.582784845572809e-03,
+	 1.608850329447431e-03,
+	 1.634871779297925e-03,
+	 1.660848482921567e-03,
+	 1.686779729338396e-03,
+	 1.712664808815241e-03,
+	 1.738503012879603e-03,
+	 1.764293634342480e-03,
+	 1.790035967318867e-03,
+	 1.815729307244912e-03,
+	 1.841372950896037e-03,
+	 1.866966196410259e-03,
+	 1.892508343301895e-03,
+	 1.917998692488188e-03,
+	 1.943436546299096e-03,
+	 1.968821208505612e-03,
+	 1.994151984332513e-03,
+	 2.019428180478667e-03,
+	 2.044649105139089e-03,
+	 2.069814068020601e-03,
+	 2.094922380359695e-03,
+	 2.119973354946659e-03,
+	 2.144966306139129e-03,
+	 2.169900549883020e-03,
+	 2.194775403731512e-03,
+	 2.219590186863216e-03,
+	 2.244344220100789e-03,
+	 2.269036825929466e-03,
+	 2.293667328515586e-03,
+	 2.318235053725483e-03,
+	 2.342739329143721e-03,
+	 2.367179484092076e-03,
+	 2.391554849646598e-03,
+	 2.415864758655855e-03,
+	 2.440108545761217e-03,
+	 2.464285547413566e-03,
+	 2.488395101891835e-03,
+	 2.512436549319859e-03,
+	 2.536409231686460e-03,
+	 2.560312492863308e-03,
+	 2.584145678619947e-03,
+	 2.607908136646587e-03,
+	 2.631599216566752e-03,
+	 2.655218269959312e-03,
+	 2.678764650373357e-03,
+	 2.702237713347817e-03,
+	 2.725636816428142e-03,
+	 2.748961319183355e-03,
+	 2.772210583225084e-03,
+	 2.795383972224725e-03,
+	 2.818480851928577e-03,
+	 2.841500590179230e-03,
+	 2.864442556928366e-03,
+	 2.887306124257419e-03,
+	 2.910090666394146e-03,
+	 2.932795559727967e-03,
+	 2.955420182829360e-03,
+	 2.977963916465327e-03,
+	 3.000426143616611e-03,
+	 3.022806249494883e-03,
+	 3.045103621559911e-03,
+	 3.067317649535481e-03,
+	 3.089447725426043e-03,
+	 3.111493243534792e-03,
+	 3.133453600478499e-03,
+	 3.155328195205367e-03,
+	 3.177116429010313e-03,
+	 3.198817705552108e-03,
+	 3.220431430870027e-03,
+	 3.241957013398786e-03,
+	 3.263393863986597e-03,
+	 3.284741395909029e-03,
+	 3.305999024887290e-03,
+	 3.327166169102526e-03,
+	 3.348242249213196e-03,
+	 3.369226688369182e-03,
+	 3.390118912229651e-03,
+	 3.410918348976902e-03,
+	 3.431624429333294e-03,
+	 3.452236586575280e-03,
+	 3.472754256551745e-03,
+	 3.493176877696540e-03,
+	 3.513503891044724e-03,
+	 3.533734740249339e-03,
+	 3.553868871593605e-03,
+	 3.573905734010016e-03,
+	 3.593844779091765e-03,
+	 3.613685461109977e-03,
+	 3.633427237027447e-03,
+	 3.653069566514697e-03,
+	 3.672611911963371e-03,
+	 3.692053738502364e-03,
+	 3.711394514011293e-03,
+	 3.730633709135593e-03,
+	 3.749770797301154e-03,
+	 3.768805254727837e-03,
+	 3.787736560445919e-03,
+	 3.806564196307254e-03,
+	 3.825287647002245e-03,
+	 3.843906400072234e-03,
+	 3.862419945924848e-03,
+	 3.880827777846191e-03,
+	 3.899129392016871e-03,
+	 3.917324287523564e-03,
+	 3.935411966374545e-03,
+	 3.953391933512760e-03,
+	 3.971263696828076e-03,
+	 3.989026767173251e-03,
+	 4.006680658375398e-03,
+	 4.024224887249270e-03,
+	 4.041658973612153e-03,
+	 4.058982440295293e-03,
+	 4.076194813157428e-03,
+	 4.093295621098410e-03,
+	 4.110284396071084e-03,
+	 4.127160673094858e-03,
+	 4.143923990268695e-03,
+	 4.160573888782387e-03,
+	 4.177109912930258e-03,
+	 4.193531610124004e-03,
+	 4.209838530903579e-03,
+	 4.226030228950449e-03,
+	 4.242106261100473e-03,
+	 4.258066187354412e-03,
+	 4.273909570891231e-03,
+	 4.289635978079425e-03,
+	 4.305244978489672e-03,
+	 4.320736144905268e-03,
+	 4.336109053335280e-03,
+	 4.351363283025044e-03,
+	 4.366498416468224e-03,
+	 4.381514039418550e-03,
+	 4.396409740899845e-03,
+	 4.411185113219089e-03,
+	 4.425839751976218e-03,
+	 4.440373256075377e-03,
+	 4.454785227736848e-03,
+	 4.469075272506767e-03,
+	 4.483242999268269e-03,
+	 4.497288020252655e-03,
+	 4.511209951049515e-03,
+	 4.525008410617256e-03,
+	 4.538683021294136e-03,
+	 4.552233408807660e-03,
+	 4.565659202285514e-03,
+	 4.578960034265478e-03,
+	 4.592135540705430e-03,
+	 4.605185360993637e-03,
+	 4.618109137958169e-03,
+	 4.630906517876907e-03,
+	 4.643577150487129e-03,
+	 4.656120688995474e-03,
+	 4.668536790086747e-03,
+	 4.680825113933973e-03,
+	 4.692985324207213e-03,
+	 4.705017088083270e-03,
+	 4.716920076254275e-03,
+	 4.728693962936953e-03,
+	 4.740338425881487e-03,
+	 4.751853146380603e-03,
+	 4.763237809277783e-03,
+	 4.774492102976324e-03,
+	 4.785615719447723e-03,
+	 4.796608354240008e-03,
+	 4.807469706486190e-03,
+	 4.818199478912402e-03,
+	 4.828797377846229e-03,
+	 4.839263113224588e-03,
+	 4.849596398601627e-03,
+	 4.859796951156695e-03,
+	 4.869864491702021e-03,
+	 4.879798744690259e-03,
+	 4.889599438222188e-03,
+	 4.899266304054239e-03,
+	 4.908799077605414e-03,
+	 4.918197497964977e-03,
+	 4.927461307899396e-03,
+	 4.936590253859457e-03,
+	 4.945584085987004e-03,
+	 4.954442558122097e-03,
+	 4.963165427809434e-03,
+	 4.971752456305284e-03,
+	 4.980203408583719e-03,
+	 4.988518053343305e-03,
+	 4.996696163013323e-03,
+	 5.004737513760010e-03,
+	 5.012641885492486e-03,
+	 5.020409061869301e-03,
+	 5.028038830303761e-03,
+	 5.035530981970157e-03,
+	 5.042885311809208e-03,
+	 5.050101618533874e-03,
+	 5.057179704634807e-03,
+	 5.064119376385652e-03,
+	 5.070920443848624e-03,
+	 5.077582720879263e-03,
+	 5.084106025131969e-03,
+	 5.090490178064743e-03,
+	 5.096735004944185e-03,
+	 5.102840334850129e-03,
+	 5.108806000680555e-03,
+	 5.114631839155935e-03,
+	 5.120317690823837e-03,
+	 5.125863400063240e-03,
+	 5.131268815088761e-03,
+	 5.136533787954979e-03,
+	 5.141658174560191e-03,
+	 5.146641834650681e-03,
+	 5.151484631824244e-03,
+	 5.156186433534206e-03,
+	 5.160747111092845e-03,
+	 5.165166539675022e-03,
+	 5.169444598321543e-03,
+	 5.173581169942470e-03,
+	 5.177576141320436e-03,
+	 5.181429403113564e-03,
+	 5.185140849858581e-03,
+	 5.188710379973650e-03,
+	 5.192137895761254e-03,
+	 5.195423303410708e-03,
+	 5.198566513000769e-03,
+	 5.201567438502287e-03,
+	 5.204425997780275e-03,
+	 5.207142112596377e-03,
+	 5.209715708610834e-03,
+	 5.212146715384693e-03,
+	 5.214435066381589e-03,
+	 5.216580698969701e-03,
+	 5.218583554423280e-03,
+	 5.220443577924474e-03,
+	 5.222160718564666e-03,
+	 5.223734929345974e-03,
+	 5.225166167182394e-03,
+	 5.226454392901195e-03,
+	 5.227599571243753e-03,
+	 5.228601670866729e-03,
+	 5.229460664342756e-03,
+	 5.230176528161328e-03,
+	 5.230749242729295e-03,
+	 5.231178792371574e-03,
+	 5.231465165331440e-03,
+	 5.231608353770880e-03,
+	 5.231608353770880e-03,
+	 5.231465165331440e-03,
+	 5.231178792371574e-03,
+	 5.230749242729295e-03,
+	 5.230176528161328e-03,
+	 5.229460664342756e-03,
+	 5.228601670866729e-03,
+	 5.227599571243753e-03,
+	 5.226454392901195e-03,
+	 5.225166167182394e-03,
+	 5.223734929345974e-03,
+	 5.222160718564666e-03,
+	 5.220443577924474e-03,
+	 5.218583554423280e-03,
+	 5.216580698969701e-03,
+	 5.214435066381589e-03,
+	 5.212146715384693e-03,
+	 5.209715708610834e-03,
+	 5.207142112596377e-03,
+	 5.204425997780275e-03,
+	 5.201567438502287e-03,
+	 5.198566513000769e-03,
+	 5.195423303410708e-03,
+	 5.192137895761254e-03,
+	 5.188710379973650e-03,
+	 5.185140849858581e-03,
+	 5.181429403113564e-03,
+	 5.177576141320436e-03,
+	 5.173581169942470e-03,
+	 5.169444598321543e-03,
+	 5.165166539675022e-03,
+	 5.160747111092845e-03,
+	 5.156186433534206e-03,
+	 5.151484631824244e-03,
+	 5.146641834650681e-03,
+	 5.141658174560191e-03,
+	 5.136533787954979e-03,
+	 5.131268815088761e-03,
+	 5.125863400063240e-03,
+	 5.120317690823837e-03,
+	 5.114631839155935e-03,
+	 5.108806000680555e-03,
+	 5.102840334850129e-03,
+	 5.096735004944185e-03,
+	 5.090490178064743e-03,
+	 5.084106025131969e-03,
+	 5.077582720879263e-03,
+	 5.070920443848624e-03,
+	 5.064119376385652e-03,
+	 5.057179704634807e-03,
+	 5.050101618533874e-03,
+	 5.042885311809208e-03,
+	 5.035530981970157e-03,
+	 5.028038830303761e-03,
+	 5.020409061869301e-03,
+	 5.012641885492486e-03,
+	 5.004737513760010e-03,
+	 4.996696163013323e-03,
+	 4.988518053343305e-03,
+	 4.980203408583719e-03,
+	 4.971752456305284e-03,
+	 4.963165427809434e-03,
+	 4.954442558122097e-03,
+	 4.945584085987004e-03,
+	 4.936590253859457e-03,
+	 4.927461307899396e-03,
+	 4.918197497964977e-03,
+	 4.908799077605414e-03,
+	 4.899266304054239e-03,
+	 4.889599438222188e-03,
+	 4.879798744690259e-03,
+	 4.869864491702021e-03,
+	 4.859796951156695e-03,
+	 4.849596398601627e-03,
+	 4.839263113224588e-03,
+	 4.828797377846229e-03,
+	 4.818199478912402e-03,
+	 4.807469706486190e-03,
+	 4.796608354240008e-03,
+	 4.785615719447723e-03,
+	 4.774492102976324e-03,
+	 4.763237809277783e-03,
+	 4.751853146380603e-03,
+	 4.740338425881487e-03,
+	 4.728693962936953e-03,
+	 4.716920076254275e-03,
+	 4.705017088083270e-03,
+	 4.692985324207213e-03,
+	 4.680825113933973e-03,
+	 4.668536790086747e-03,
+	 4.656120688995474e-03,
+	 4.643577150487129e-03,
+	 4.630906517876907e-03,
+	 4.618109137958169e-03,
+	 4.605185360993637e-03,
+	 4.592135540705430e-03,
+	 4.578960034265478e-03,
+	 4.565659202285514e-03,
+	 4.552233408807660e-03,
+	 4.538683021294136e-03,
+	 4.525008410617256e-03,
+	 4.511209951049515e-03,
+	 4.497288020252655e-03,
+	 4.483242999268269e-03,
+	 4.469075272506767e-03,
+	 4.454785227736848e-03,
+	 4.440373256075377e-03,
+	 4.425839751976218e-03,
+	 4.411185113219089e-03,
+	 4.396409740899845e-03,
+	 4.381514039418550e-03,
+	 4.366498416468224e-03,
+	 4.351363283025044e-03,
+	 4.336109053335280e-03,
+	 4.320736144905268e-03,
+	 4.305244978489672e-03,
+	 4.289635978079425e-03,
+	 4.273909570891231e-03,
+	 4.258066187354412e-03,
+	 4.242106261100473e-03,
+	 4.226030228950449e-03,
+	 4.209838530903579e-03,
+	 4.193531610124004e-03,
+	 4.177109912930258e-03,
+	 4.160573888782387e-03,
+	 4.143923990268695e-03,
+	 4.127160673094858e-03,
+	 4.110284396071084e-03,
+	 4.093295621098410e-03,
+	 4.076194813157428e-03,
+	 4.058982440295293e-03,
+	 4.041658973612153e-03,
+	 4.024224887249270e-03,
+	 4.006680658375398e-03,
+	 3.989026767173251e-03,
+	 3.971263696828076e-03,
+	 3.953391933512760e-03,
+	 3.935411966374545e-03,
+	 3.917324287523564e-03,
+	 3.899129392016871e-03,
+	 3.880827777846191e-03,
+	 3.862419945924848e-03,
+	 3.843906400072234e-03,
+	 3.825287647002245e-03,
+	 3.806564196307254e-03,
+	 3.787736560445919e-03,
+	 3.768805254727837e-03,
+	 3.749770797301154e-03,
+	 3.730633709135593e-03,
+	 3.711394514011293e-03,
+	 3.692053738502364e-03,
+	 3.672611911963371e-03,
+	 3.653069566514697e-03,
+	 3.633427237027447e-03,
+	 3.613685461109977e-03,
+	 3.593844779091765e-03,
+	 3.573905734010016e-03,
+	 3.553868871593605e-03,
+	 3.533734740249339e-03,
+	 3.513503891044724e-03,
+	 3.493176877696540e-03,
+	 3.472754256551745e-03,
+	 3.452236586575280e-03,
+	 3.431624429333294e-03,
+	 3.410918348976902e-03,
+	 3.390118912229651e-03,
+	 3.369226688369182e-03,
+	 3.348242249213196e-03,
+	 3.327166169102526e-03,
+	 3.305999024887290e-03,
+	 3.284741395909029e-03,
+	 3.263393863986597e-03,
+	 3.241957013398786e-03,
+	 3.220431430870027e-03,
+	 3.198817705552108e-03,
+	 3.177116429010313e-03,
+	 3.155328195205367e-03,
+	 3.133453600478499e-03,
+	 3.111493243534792e-03,
+	 3.089447725426043e-03,
+	 3.067317649535481e-03,
+	 3.045103621559911e-03,
+	 3.022806249494883e-03,
+	 3.000426143616611e-03,
+	 2.977963916465327e-03,
+	 2.955420182829360e-03,
+	 2.932795559727967e-03,
+	 2.910090666394146e-03,
+	 2.887306124257419e-03,
+	 2.864442556928366e-03,
+	 2.841500590179230e-03,
+	 2.818480851928577e-03,
+	 2.795383972224725e-03,
+	 2.772210583225084e-03,
+	 2.748961319183355e-03,
+	 2.725636816428142e-03,
+	 2.702237713347817e-03,
+	 2.678764650373357e-03,
+	 2.655218269959312e-03,
+	 2.631599216566752e-03,
+	 2.607908136646587e-03,
+	 2.584145678619947e-03,
+	 2.560312492863308e-03,
+	 2.536409231686460e-03,
+	 2.512436549319859e-03,
+	 2.488395101891835e-03,
+	 2.464285547413566e-03,
+	 2.440108545761217e-03,
+	 2.415864758655855e-03,
+	 2.391554849646598e-03,
+	 2.367179484092076e-03,
+	 2.342739329143721e-03,
+	 2.318235053725483e-03,
+	 2.293667328515586e-03,
+	 2.269036825929466e-03,
+	 2.244344220100789e-03,
+	 2.219590186863216e-03,
+	 2.194775403731512e-03,
+	 2.169900549883020e-03,
+	 2.144966306139129e-03,
+	 2.119973354946659e-03,
+	 2.094922380359695e-03,
+	 2.069814068020601e-03,
+	 2.044649105139089e-03,
+	 2.019428180478667e-03,
+	 1.994151984332513e-03,
+	 1.968821208505612e-03,
+	 1.943436546299096e-03,
+	 1.917998692488188e-03,
+	 1.892508343301895e-03,
+	 1.866966196410259e-03,
+	 1.841372950896037e-03,
+	 1.815729307244912e-03,
+	 1.790035967318867e-03,
+	 1.764293634342480e-03,
+	 1.738503012879603e-03,
+	 1.712664808815241e-03,
+	 1.686779729338396e-03,
+	 1.660848482921567e-03,
+	 1.634871779297925e-03,
+	 1.608850329447431e-03,
+	 1.582784845572809e-03,
+	 1.556676041084361e-03,
+	 1.530524630576348e-03,
+	 1.504331329808907e-03,
+	 1.478096855689553e-03,
+	 1.451821926253474e-03,
+	 1.425507260640611e-03,
+	 1.399153579081589e-03,
+	 1.372761602872492e-03,
+	 1.346332054357900e-03,
+	 1.319865656913004e-03,
+	 1.293363134918149e-03,
+	 1.266825213743555e-03,
+	 1.240252619731501e-03,
+	 1.213646080168456e-03,
+	 1.187006323274492e-03,
+	 1.160334078173745e-03,
+	 1.133630074882933e-03,
+	 1.106895044290637e-03,
+	 1.080129718127268e-03,
+	 1.053334828960432e-03,
+	 1.026511110162646e-03,
+	 9.996592958942667e-04,
+	 9.727801210900403e-04,
+	 9.458743214282974e-04,
+	 9.189426333183609e-04,
+	 8.919857938811452e-04,
+	 8.650045409207330e-04,
+	 8.379996129153992e-04,
+	 8.109717489863956e-04,
+	 7.839216888864768e-04,
+	 7.568501729793872e-04,
+	 7.297579422115372e-04,
+	 7.026457380987277e-04,
+	 6.755143027071614e-04,
+	 6.483643786302320e-04,
+	 6.211967089703015e-04,
+	 5.940120373160433e-04,
+	 5.668111077339601e-04,
+	 5.395946647327314e-04,
+	 5.123634532584119e-04,
+	 4.851182186807244e-04,
+	 4.578597067554326e-04,
+	 4.305886636474861e-04,
+	 4.033058358917884e-04,
+	 3.760119704150055e-04,
+	 3.487078145421951e-04,
+	 3.213941160540307e-04,
+	 2.940716232574191e-04,
+	 2.667410852168931e-04,
+	 2.394032521348101e-04,
+	 2.120588763153333e-04,
+	 1.847087143180935e-04,
+	 1.573535326274099e-04,
+	 1.299941245042197e-04,
+	 1.026313698086411e-04,
+	 7.526651167192402e-05,
+	 4.790310784967142e-05,
+	 2.057885378710974e-05
+};
+constant double Gauss600Z[600]={
+	-9.999919811801331e-01,
+	-9.999577495568427e-01,
+	-9.998961652224424e-01,
+	-9.998072161836326e-01,
+	-9.996909031994098e-01,
+	-9.995472290531084e-01,
+	-9.993761975437475e-01,
+	-9.991778132979662e-01,
+	-9.989520817199469e-01,
+	-9.986990089746568e-01,
+	-9.984186019812190e-01,
+	-9.981108684099005e-01,
+	-9.977758166805535e-01,
+	-9.974134559616917e-01,
+	-9.970237961698619e-01,
+	-9.966068479691558e-01,
+	-9.961626227707894e-01,
+	-9.956911327327107e-01,
+	-9.951923907592165e-01,
+	-9.946664105005647e-01,
+	-9.941132063525796e-01,
+	-9.935327934562412e-01,
+	-9.929251876972608e-01,
+	-9.922904057056383e-01,
+	-9.916284648552014e-01,
+	-9.909393832631260e-01,
+	-9.902231797894375e-01,
+	-9.894798740364921e-01,
+	-9.887094863484386e-01,
+	-9.879120378106601e-01,
+	-9.870875502491963e-01,
+	-9.862360462301449e-01,
+	-9.853575490590435e-01,
+	-9.844520827802311e-01,
+	-9.835196721761896e-01,
+	-9.825603427668655e-01,
+	-9.815741208089708e-01,
+	-9.805610332952639e-01,
+	-9.795211079538115e-01,
+	-9.784543732472287e-01,
+	-9.773608583719001e-01,
+	-9.762405932571810e-01,
+	-9.750936085645774e-01,
+	-9.739199356869074e-01,
+	-9.727196067474416e-01,
+	-9.714926545990238e-01,
+	-9.702391128231720e-01,
+	-9.689590157291589e-01,
+	-9.676523983530734e-01,
+	-9.663192964568610e-01,
+	-9.649597465273452e-01,
+	-9.635737857752291e-01,
+	-9.621614521340767e-01,
+	-9.607227842592744e-01,
+	-9.592578215269736e-01,
+	-9.577666040330124e-01,
+	-9.562491725918185e-01,
+	-9.547055687352921e-01,
+	-9.531358347116689e-01,
+	-9.515400134843638e-01,
+	-9.499181487307956e-01,
+	-9.482702848411907e-01,
+	-9.465964669173687e-01,
+	-9.448967407715074e-01,
+	-9.431711529248900e-01,
+	-9.414197506066305e-01,
+	-9.396425817523820e-01,
+	-9.378396950030241e-01,
+	-9.360111397033323e-01,
+	-9.341569659006264e-01,
+	-9.322772243434019e-01,
+	-9.303719664799399e-01,
+	-9.284412444569001e-01,
+	-9.264851111178924e-01,
+	-9.245036200020315e-01,
+	-9.224968253424709e-01,
+	-9.204647820649190e-01,
+	-9.184075457861354e-01,
+	-9.163251728124092e-01,
+	-9.142177201380173e-01,
+	-9.120852454436648e-01,
+	-9.099278070949063e-01,
+	-9.077454641405484e-01,
+	-9.055382763110333e-01,
+	-9.033063040168046e-01,
+	-9.010496083466532e-01,
+	-8.987682510660455e-01,
+	-8.964622946154334e-01,
+	-8.941318021085444e-01,
+	-8.917768373306548e-01,
+	-8.893974647368440e-01,
+	-8.869937494502300e-01,
+	-8.845657572601872e-01,
+	-8.821135546205454e-01,
+	-8.796372086477716e-01,
+	-8.771367871191327e-01,
+	-8.746123584708402e-01,
+	-8.720639917961773e-01,
+	-8.694917568436084e-01,
+	-8.668957240148687e-01,
+	-8.642759643630390e-01,
+	-8.616325495905997e-01,
+	-8.589655520474688e-01,
+	-8.562750447290219e-01,
+	-8.535611012740939e-01,
+	-8.508237959629638e-01,
+	-8.480632037153214e-01,
+	-8.452794000882170e-01,
+	-8.424724612739936e-01,
+	-8.396424640982006e-01,
+	-8.367894860174927e-01,
+	-8.339136051175082e-01,
+	-8.310149001107329e-01,
+	-8.280934503343453e-01,
+	-8.251493357480455e-01,
+	-8.221826369318662e-01,
+	-8.191934350839678e-01,
+	-8.161818120184157e-01,
+	-8.131478501629408e-01,
+	-8.100916325566843e-01,
+	-8.070132428479240e-01,
+	-8.039127652917853e-01,
+	-8.007902847479355e-01,
+	-7.976458866782601e-01,
+	-7.944796571445251e-01,
+	-7.912916828060205e-01,
+	-7.880820509171887e-01,
+	-7.848508493252369e-01,
+	-7.815981664677315e-01,
+	-7.783240913701791e-01,
+	-7.750287136435887e-01,
+	-7.717121234820196e-01,
+	-7.683744116601126e-01,
+	-7.650156695306057e-01,
+	-7.616359890218337e-01,
+	-7.582354626352120e-01,
+	-7.548141834427050e-01,
+	-7.513722450842789e-01,
+	-7.479097417653382e-01,
+	-7.444267682541479e-01,
+	-7.409234198792396e-01,
+	-7.373997925268020e-01,
+	-7.338559826380572e-01,
+	-7.302920872066201e-01,
+	-7.267082037758448e-01,
+	-7.231044304361540e-01,
+	-7.194808658223550e-01,
+	-7.158376091109393e-01,
+	-7.121747600173688e-01,
+	-7.084924187933461e-01,
+	-7.047906862240712e-01,
+	-7.010696636254825e-01,
+	-6.973294528414838e-01,
+	-6.935701562411577e-01,
+	-6.897918767159622e-01,
+	-6.859947176769162e-01,
+	-6.821787830517682e-01,
+	-6.783441772821519e-01,
+	-6.744910053207279e-01,
+	-6.706193726283113e-01,
+	-6.667293851709845e-01,
+	-6.628211494171978e-01,
+	-6.588947723348551e-01,
+	-6.549503613883855e-01,
+	-6.509880245358034e-01,
+	-6.470078702257523e-01,
+	-6.430100073945375e-01,
+	-6.389945454631443e-01,
+	-6.349615943342426e-01,
+	-6.309112643891799e-01,
+	-6.268436664849593e-01,
+	-6.227589119512058e-01,
+	-6.186571125871193e-01,
+	-6.145383806584143e-01,
+	-6.104028288942471e-01,
+	-6.062505704841313e-01,
+	-6.020817190748390e-01,
+	-5.978963887672901e-01,
+	-5.936946941134305e-01,
+	-5.894767501130956e-01,
+	-5.852426722108636e-01,
+	-5.809925762928952e-01,
+	-5.767265786837625e-01,
+	-5.724447961432646e-01,
+	-5.681473458632319e-01,
+	-5.638343454643192e-01,
+	-5.595059129927857e-01,
+	-5.551621669172647e-01,
+	-5.508032261255207e-01,
+	-5.464292099211954e-01,
+	-5.420402380205430e-01,
+	-5.376364305491529e-01,
+	-5.332179080386621e-01,
+	-5.287847914234566e-01,
+	-5.243372020373607e-01,
+	-5.198752616103168e-01,
+	-5.153990922650536e-01,
+	-5.109088165137432e-01,
+	-5.064045572546482e-01,
+	-5.018864377687581e-01,
+	-4.973545817164148e-01,
+	-4.928091131339285e-01,
+	-4.882501564301824e-01,
+	-4.836778363832279e-01,
+	-4.790922781368694e-01,
+	-4.744936071972390e-01,
+	-4.698819494293615e-01,
+	-4.652574310537095e-01,
+	-4.606201786427489e-01,
+	-4.559703191174743e-01,
+	-4.513079797439356e-01,
+	-4.466332881297543e-01,
+	-4.419463722206312e-01,
+	-4.372473602968445e-01,
+	-4.325363809697386e-01,
+	-4.278135631782045e-01,
+	-4.230790361851500e-01,
+	-4.183329295739626e-01,
+	-4.135753732449622e-01,
+	-4.088064974118460e-01,
+	-4.040264325981248e-01,
+	-3.992353096335499e-01,
+	-3.944332596505332e-01,
+	-3.896204140805575e-01,
+	-3.847969046505793e-01,
+	-3.799628633794236e-01,
+	-3.751184225741707e-01,
+	-3.702637148265345e-01,
+	-3.653988730092341e-01,
+	-3.605240302723566e-01,
+	-3.556393200397129e-01,
+	-3.507448760051860e-01,
+	-3.458408321290720e-01,
+	-3.409273226344131e-01,
+	-3.360044820033245e-01,
+	-3.310724449733132e-01,
+	-3.261313465335907e-01,
+	-3.211813219213777e-01,
+	-3.162225066182034e-01,
+	-3.112550363461971e-01,
+	-3.062790470643733e-01,
+	-3.012946749649106e-01,
+	-2.963020564694245e-01,
+	-2.913013282252331e-01,
+	-2.862926271016175e-01,
+	-2.812760901860750e-01,
+	-2.762518547805679e-01,
+	-2.712200583977651e-01,
+	-2.661808387572784e-01,
+	-2.611343337818933e-01,
+	-2.560806815937938e-01,
+	-2.510200205107824e-01,
+	-2.459524890424938e-01,
+	-2.408782258866046e-01,
+	-2.357973699250367e-01,
+	-2.307100602201561e-01,
+	-2.256164360109671e-01,
+	-2.205166367093012e-01,
+	-2.154108018960010e-01,
+	-2.102990713171008e-01,
+	-2.051815848800007e-01,
+	-2.000584826496384e-01,
+	-1.949299048446547e-01,
+	-1.897959918335565e-01,
+	-1.846568841308744e-01,
+	-1.795127223933170e-01,
+	-1.743636474159214e-01,
+	-1.692098001281991e-01,
+	-1.640513215902795e-01,
+	-1.588883529890484e-01,
+	-1.537210356342841e-01,
+	-1.485495109547900e-01,
+	-1.433739204945230e-01,
+	-1.381944059087203e-01,
+	-1.330111089600216e-01,
+	-1.278241715145894e-01,
+	-1.226337355382264e-01,
+	-1.174399430924893e-01,
+	-1.122429363308012e-01,
+	-1.070428574945604e-01,
+	-1.018398489092476e-01,
+	-9.663405298053028e-02,
+	-9.142561219036521e-02,
+	-8.621466909309866e-02,
+	-8.100136631156468e-02,
+	-7.578584653318163e-02,
+	-7.056825250604672e-02,
+	-6.534872703502911e-02,
+	-6.012741297786137e-02,
+	-5.490445324122935e-02,
+	-4.967999077686102e-02,
+	-4.445416857761375e-02,
+	-3.922712967356071e-02,
+	-3.399901712807610e-02,
+	-2.876997403391958e-02,
+	-2.354014350931976e-02,
+	-1.830966869405716e-02,
+	-1.307869274554644e-02,
+	-7.847358834918192e-03,
+	-2.615810143100405e-03,
+	 2.615810143100405e-03,
+	 7.847358834918192e-03,
+	 1.307869274554644e-02,
+	 1.830966869405716e-02,
+	 2.354014350931976e-02,
+	 2.876997403391958e-02,
+	 3.399901712807610e-02,
+	 3.922712967356071e-02,
+	 4.445416857761375e-02,
+	 4.967999077686102e-02,
+	 5.490445324122935e-02,
+	 6.012741297786137e-02,
+	 6.534872703502911e-02,
+	 7.056825250604672e-02,
+	 7.578584653318163e-02,
+	 8.100136631156468e-02,
+	 8.621466909309866e-02,
+	 9.142561219036521e-02,
+	 9.663405298053028e-02,
+	 1.018398489092476e-01,
+	 1.070428574945604e-01,
+	 1.122429363308012e-01,
+	 1.174399430924893e-01,
+	 1.226337355382264e-01,
+	 1.278241715145894e-01,
+	 1.330111089600216e-01,
+	 1.381944059087203e-01,
+	 1.433739204945230e-01,
+	 1.485495109547900e-01,
+	 1.537210356342841e-01,
+	 1.588883529890484e-01,
+	 1.640513215902795e-01,
+	 1.692098001281991e-01,
+	 1.743636474159214e-01,
+	 1.795127223933170e-01,
+	 1.846568841308744e-01,
+	 1.897959918335565e-01,
+	 1.949299048446547e-01,
+	 2.000584826496384e-01,
+	 2.051815848800007e-01,
+	 2.102990713171008e-01,
+	 2.154108018960010e-01,
+	 2.205166367093012e-01,
+	 2.256164360109671e-01,
+	 2.307100602201561e-01,
+	 2.357973699250367e-01,
+	 2.408782258866046e-01,
+	 2.459524890424938e-01,
+	 2.510200205107824e-01,
+	 2.560806815937938e-01,
+	 2.611343337818933e-01,
+	 2.661808387572784e-01,
+	 2.712200583977651e-01,
+	 2.762518547805679e-01,
+	 2.812760901860750e-01,
+	 2.862926271016175e-01,
+	 2.913013282252331e-01,
+	 2.963020564694245e-01,
+	 3.012946749649106e-01,
+	 3.062790470643733e-01,
+	 3.112550363461971e-01,
+	 3.162225066182034e-01,
+	 3.211813219213777e-01,
+	 3.261313465335907e-01,
+	 3.310724449733132e-01,
+	 3.360044820033245e-01,
+	 3.409273226344131e-01,
+	 3.458408321290720e-01,
+	 3.507448760051860e-01,
+	 3.556393200397129e-01,
+	 3.605240302723566e-01,
+	 3.653988730092341e-01,
+	 3.702637148265345e-01,
+	 3.751184225741707e-01,
+	 3.799628633794236e-01,
+	 3.847969046505793e-01,
+	 3.896204140805575e-01,
+	 3.944332596505332e-01,
+	 3.992353096335499e-01,
+	 4.040264325981248e-01,
+	 4.088064974118460e-01,
+	 4.135753732449622e-01,
+	 4.183329295739626e-01,
+	 4.230790361851500e-01,
+	 4.278135631782045e-01,
+	 4.325363809697386e-01,
+	 4.372473602968445e-01,
+	 4.419463722206312e-01,
+	 4.466332881297543e-01,
+	 4.513079797439356e-01,
+	 4.559703191174743e-01,
+	 4.606201786427489e-01,
+	 4.652574310537095e-01,
+	 4.698819494293615e-01,
+	 4.744936071972390e-01,
+	 4.790922781368694e-01,
+	 4.836778363832279e-01,
+	 4.882501564301824e-01,
+	 4.928091131339285e-01,
+	 4.973545817164148e-01,
+	 5.018864377687581e-01,
+	 5.064045572546482e-01,
+	 5.109088165137432e-01,
+	 5.153990922650536e-01,
+	 5.198752616103168e-01,
+	 5.243372020373607e-01,
+	 5.287847914234566e-01,
+	 5.332179080386621e-01,
+	 5.376364305491529e-01,
+	 5.420402380205430e-01,
+	 5.464292099211954e-01,
+	 5.508032261255207e-01,
+	 5.551621669172647e-01,
+	 5.595059129927857e-01,
+	 5.638343454643192e-01,
+	 5.681473458632319e-01,
+	 5.724447961432646e-01,
+	 5.767265786837625e-01,
+	 5.809925762928952e-01,
+	 5.852426722108636e-01,
+	 5.894767501130956e-01,
+	 5.936946941134305e-01,
+	 5.978963887672901e-01,
+	 6.020817190748390e-01,
+	 6.062505704841313e-01,
+	 6.104028288942471e-01,
+	 6.145383806584143e-01,
+	 6.186571125871193e-01,
+	 6.227589119512058e-01,
+	 6.268436664849593e-01,
+	 6.309112643891799e-01,
+	 6.349615943342426e-01,
+	 6.389945454631443e-01,
+	 6.430100073945375e-01,
+	 6.470078702257523e-01,
+	 6.509880245358034e-01,
+	 6.549503613883855e-01,
+	 6.588947723348551e-01,
+	 6.628211494171978e-01,
+	 6.667293851709845e-01,
+	 6.706193726283113e-01,
+	 6.744910053207279e-01,
+	 6.783441772821519e-01,
+	 6.821787830517682e-01,
+	 6.859947176769162e-01,
+	 6.897918767159622e-01,
+	 6.935701562411577e-01,
+	 6.973294528414838e-01,
+	 7.010696636254825e-01,
+	 7.047906862240712e-01,
+	 7.084924187933461e-01,
+	 7.121747600173688e-01,
+	 7.158376091109393e-01,
+	 7.194808658223550e-01,
+	 7.231044304361540e-01,
+	 7.267082037758448e-01,
+	 7.302920872066201e-01,
+	 7.338559826380572e-01,
+	 7.373997925268020e-01,
+	 7.409234198792396e-01,
+	 7.444267682541479e-01,
+	 7.479097417653382e-01,
+	 7.513722450842789e-01,
+	 7.548141834427050e-01,
+	 7.582354626352120e-01,
+	 7.616359890218337e-01,
+	 7.650156695306057e-01,
+	 7.683744116601126e-01,
+	 7.717121234820196e-01,
+	 7.750287136435887e-01,
+	 7.783240913701791e-01,
+	 7.815981664677315e-01,
+	 7.848508493252369e-01,
+	 7.880820509171887e-01,
+	 7.912916828060205e-01,
+	 7.944796571445251e-01,
+	 7.976458866782601e-01,
+	 8.007902847479355e-01,
+	 8.039127652917853e-01,
+	 8.070132428479240e-01,
+	 8.100916325566843e-01,
+	 8.131478501629408e-01,
+	 8.161818120184157e-01,
+	 8.191934350839678e-01,
+	 8.221826369318662e-01,
+	 8.251493357480455e-01,
+	 8.280934503343453e-01,
+	 8.310149001107329e-01,
+	 8.339136051175082e-01,
+	 8.367894860174927e-01,
+	 8.396424640982006e-01,
+	 8.424724612739936e-01,
+	 8.452794000882170e-01,
+	 8.480632037153214e-01,
+	 8.508237959629638e-01,
+	 8.535611012740939e-01,
+	 8.562750447290219e-01,
+	 8.589655520474688e-01,
+	 8.616325495905997e-01,
+	 8.642759643630390e-01,
+	 8.668957240148687e-01,
+	 8.694917568436084e-01,
+	 8.720639917961773e-01,
+	 8.746123584708402e-01,
+	 8.771367871191327e-01,
+	 8.796372086477716e-01,
+	 8.821135546205454e-01,
+	 8.845657572601872e-01,
+	 8.869937494502300e-01,
+	 8.893974647368440e-01,
+	 8.917768373306548e-01,
+	 8.941318021085444e-01,
+	 8.964622946154334e-01,
+	 8.987682510660455e-01,
+	 9.010496083466532e-01,
+	 9.033063040168046e-01,
+	 9.055382763110333e-01,
+	 9.077454641405484e-01,
+	 9.099278070949063e-01,
+	 9.120852454436648e-01,
+	 9.142177201380173e-01,
+	 9.163251728124092e-01,
+	 9.184075457861354e-01,
+	 9.204647820649190e-01,
+	 9.224968253424709e-01,
+	 9.245036200020315e-01,
+	 9.264851111178924e-01,
+	 9.284412444569001e-01,
+	 9.303719664799399e-01,
+	 9.322772243434019e-01,
+	 9.341569659006264e-01,
+	 9.360111397033323e-01,
+	 9.378396950030241e-01,
+	 9.396425817523820e-01,
+	 9.414197506066305e-01,
+	 9.431711529248900e-01,
+	 9.448967407715074e-01,
+	 9.465964669173687e-01,
+	 9.482702848411907e-01,
+	 9.499181487307956e-01,
+	 9.515400134843638e-01,
+	 9.531358347116689e-01,
+	 9.547055687352921e-01,
+	 9.562491725918185e-01,
+	 9.577666040330124e-01,
+	 9.592578215269736e-01,
+	 9.607227842592744e-01,
+	 9.621614521340767e-01,
+	 9.635737857752291e-01,
+	 9.649597465273452e-01,
+	 9.663192964568610e-01,
+	 9.676523983530734e-01,
+	 9.689590157291589e-01,
+	 9.702391128231720e-01,
+	 9.714926545990238e-01,
+	 9.727196067474416e-01,
+	 9.739199356869074e-01,
+	 9.750936085645774e-01,
+	 9.762405932571810e-01,
+	 9.773608583719001e-01,
+	 9.784543732472287e-01,
+	 9.795211079538115e-01,
+	 9.805610332952639e-01,
+	 9.815741208089708e-01,
+	 9.825603427668655e-01,
+	 9.835196721761896e-01,
+	 9.844520827802311e-01,
+	 9.853575490590435e-01,
+	 9.862360462301449e-01,
+	 9.870875502491963e-01,
+	 9.879120378106601e-01,
+	 9.887094863484386e-01,
+	 9.894798740364921e-01,
+	 9.902231797894375e-01,
+	 9.909393832631260e-01,
+	 9.916284648552014e-01,
+	 9.922904057056383e-01,
+	 9.929251876972608e-01,
+	 9.935327934562412e-01,
+	 9.941132063525796e-01,
+	 9.946664105005647e-01,
+	 9.951923907592165e-01,
+	 9.956911327327107e-01,
+	 9.961626227707894e-01,
+	 9.966068479691558e-01,
+	 9.970237961698619e-01,
+	 9.974134559616917e-01,
+	 9.977758166805535e-01,
+	 9.981108684099005e-01,
+	 9.984186019812190e-01,
+	 9.986990089746568e-01,
+	 9.989520817199469e-01,
+	 9.991778132979662e-01,
+	 9.993761975437475e-01,
+	 9.995472290531084e-01,
+	 9.996909031994098e-01,
+	 9.998072161836326e-01,
+	 9.998961652224424e-01,
+	 9.999577495568427e-01,
+	 9.999919811801331e-01
+};
\ No newline at end of file
@@ -0,0 +1,1353 @@
+// Generated by sasmodels.gengauss.genadaptive(tol=1e-06)
+//
+// Gauss-Legendre rules chosen by q times the particle size.  Use
+//
+//     int n; constant double *z, *w;
+//     GAUSS_RULE(q*r, n, z, w);
+//
+// to set n to the number of points and z and w to the points and weights
+// of the smallest rule whose relative error is below 1e-06 for the
+// orientation average of a cylinder of any aspect ratio, where r is the
+// distance from the center of the cylinder to the rim.  For other shapes
+// use r as the largest distance from the center to the surface.  Above
+// the last limit the largest rule is used.
+//
+// If a fixed rule such as lib/gauss76.c is included before this file, as
+// done by generate.set_integration_size, then GAUSS_RULE uses it for all q.
+
+#ifdef GAUSS_N
+#define GAUSS_RULE(qr, n, z, w) do { \
+    n = GAUSS_N; z = GAUSS_Z; w = GAUSS_W; \
+  } while (0)
+#else
+#define GAUSS_RULE(qr, n, z, w) do { \
+    int _rule = 0; \
+    while (_rule < GAUSS_ADAPTIVE_RULES-1 && (qr) > GaussAdaptiveLimit[_rule]) _rule++; \
+    n = GaussAdaptiveN[_rule]; \
+    z = GaussAdaptiveZ + GaussAdaptiveStart[_rule]; \
+    w = GaussAdaptiveWt + GaussAdaptiveStart[_rule]; \
+  } while (0)
+#endif
+
+#define GAUSS_ADAPTIVE_RULES 11
+
+constant int GaussAdaptiveN[11]={8, 12, 16, 24, 32, 48, 64, 76, 96, 128, 150};
+constant int GaussAdaptiveStart[11]={0, 8, 20, 36, 60, 92, 140, 204, 280, 376, 504};
+constant double GaussAdaptiveLimit[11]={3.745, 7.44, 11.59, 20.51, 29.37, 47.74, 68.37, 81.82, 106.5, 146.3, 175};
+
+constant double GaussAdaptiveWt[656]={
+	 1.012285362903767e-01,
+	 2.223810344533743e-01,
+	 3.137066458778870e-01,
+	 3.626837833783618e-01,
+	 3.626837833783618e-01,
+	 3.137066458778870e-01,
+	 2.223810344533743e-01,
+	 1.012285362903767e-01,
+	 4.717533638651202e-02,
+	 1.069393259953189e-01,
+	 1.600783285433461e-01,
+	 2.031674267230656e-01,
+	 2.334925365383546e-01,
+	 2.491470458134027e-01,
+	 2.491470458134027e-01,
+	 2.334925365383546e-01,
+	 2.031674267230656e-01,
+	 1.600783285433461e-01,
+	 1.069393259953189e-01,
+	 4.717533638651202e-02,
+	 2.715245941175404e-02,
+	 6.225352393864771e-02,
+	 9.515851168249259e-02,
+	 1.246289712555340e-01,
+	 1.495959888165768e-01,
+	 1.691565193950026e-01,
+	 1.826034150449236e-01,
+	 1.894506104550686e-01,
+	 1.894506104550686e-01,
+	 1.826034150449236e-01,
+	 1.691565193950026e-01,
+	 1.495959888165768e-01,
+	 1.246289712555340e-01,
+	 9.515851168249259e-02,
+	 6.225352393864771e-02,
+	 2.715245941175404e-02,
+	 1.234122979998709e-02,
+	 2.853138862893374e-02,
+	 4.427743881741955e-02,
+	 5.929858491543674e-02,
+	 7.334648141108041e-02,
+	 8.619016153195329e-02,
+	 9.761865210411406e-02,
+	 1.074442701159656e-01,
+	 1.155056680537256e-01,
+	 1.216704729278034e-01,
+	 1.258374563468283e-01,
+	 1.279381953467522e-01,
+	 1.279381953467522e-01,
+	 1.258374563468283e-01,
+	 1.216704729278034e-01,
+	 1.155056680537256e-01,
+	 1.074442701159656e-01,
+	 9.761865210411406e-02,
+	 8.619016153195329e-02,
+	 7.334648141108041e-02,
+	 5.929858491543674e-02,
+	 4.427743881741955e-02,
+	 2.853138862893374e-02,
+	 1.234122979998709e-02,
+	 7.018610009469298e-03,
+	 1.627439473090597e-02,
+	 2.539206530926243e-02,
+	 3.427386291302163e-02,
+	 4.283589802222643e-02,
+	 5.099805926237624e-02,
+	 5.868409347853570e-02,
+	 6.582222277636175e-02,
+	 7.234579410884845e-02,
+	 7.819389578707031e-02,
+	 8.331192422694685e-02,
+	 8.765209300440391e-02,
+	 9.117387869576386e-02,
+	 9.384439908080457e-02,
+	 9.563872007927483e-02,
+	 9.654008851472781e-02,
+	 9.654008851472781e-02,
+	 9.563872007927483e-02,
+	 9.384439908080457e-02,
+	 9.117387869576386e-02,
+	 8.765209300440391e-02,
+	 8.331192422694685e-02,
+	 7.819389578707031e-02,
+	 7.234579410884845e-02,
+	 6.582222277636175e-02,
+	 5.868409347853570e-02,
+	 5.099805926237624e-02,
+	 4.283589802222643e-02,
+	 3.427386291302163e-02,
+	 2.539206530926243e-02,
+	 1.627439473090597e-02,
+	 7.018610009469298e-03,
+	 3.153346052309180e-03,
+	 7.327553901276492e-03,
+	 1.147723457923497e-02,
+	 1.557931572294293e-02,
+	 1.961616045735530e-02,
+	 2.357076083932409e-02,
+	 2.742650970835688e-02,
+	 3.116722783279834e-02,
+	 3.477722256477066e-02,
+	 3.824135106583067e-02,
+	 4.154508294346455e-02,
+	 4.467456085669410e-02,
+	 4.761665849249028e-02,
+	 5.035903555385428e-02,
+	 5.289018948519349e-02,
+	 5.519950369998405e-02,
+	 5.727729210040293e-02,
+	 5.911483969839548e-02,
+	 6.070443916589358e-02,
+	 6.203942315989246e-02,
+	 6.311419228625378e-02,
+	 6.392423858464795e-02,
+	 6.446616443594984e-02,
+	 6.473769681268368e-02,
+	 6.473769681268368e-02,
+	 6.446616443594984e-02,
+	 6.392423858464795e-02,
+	 6.311419228625378e-02,
+	 6.203942315989246e-02,
+	 6.070443916589358e-02,
+	 5.911483969839548e-02,
+	 5.727729210040293e-02,
+	 5.519950369998405e-02,
+	 5.289018948519349e-02,
+	 5.035903555385428e-02,
+	 4.761665849249028e-02,
+	 4.467456085669410e-02,
+	 4.154508294346455e-02,
+	 3.824135106583067e-02,
+	 3.477722256477066e-02,
+	 3.116722783279834e-02,
+	 2.742650970835688e-02,
+	 2.357076083932409e-02,
+	 1.961616045735530e-02,
+	 1.557931572294293e-02,
+	 1.147723457923497e-02,
+	 7.327553901276492e-03,
+	 3.153346052309180e-03,
+	 1.783280721694215e-03,
+	 4.147033260562923e-03,
+	 6.504457968979654e-03,
+	 8.846759826364391e-03,
+	 1.116813946013147e-02,
+	 1.346304789671823e-02,
+	 1.572603047602508e-02,
+	 1.795171577569730e-02,
+	 2.013482315353009e-02,
+	 2.227017380838301e-02,
+	 2.435270256871085e-02,
+	 2.637746971505463e-02,
+	 2.833967261425970e-02,
+	 3.023465707240250e-02,
+	 3.205792835485145e-02,
+	 3.380516183714179e-02,
+	 3.547221325688232e-02,
+	 3.705512854024015e-02,
+	 3.855015317861559e-02,
+	 3.995374113272035e-02,
+	 4.126256324262349e-02,
+	 4.247351512365360e-02,
+	 4.358372452932346e-02,
+	 4.459055816375655e-02,
+	 4.549162792741811e-02,
+	 4.628479658131437e-02,
+	 4.696818281621000e-02,
+	 4.754016571483030e-02,
+	 4.799938859645832e-02,
+	 4.834476223480295e-02,
+	 4.857546744150346e-02,
+	 4.869095700913975e-02,
+	 4.869095700913975e-02,
+	 4.857546744150346e-02,
+	 4.834476223480295e-02,
+	 4.799938859645832e-02,
+	 4.754016571483030e-02,
+	 4.696818281621000e-02,
+	 4.628479658131437e-02,
+	 4.549162792741811e-02,
+	 4.459055816375655e-02,
+	 4.358372452932346e-02,
+	 4.247351512365360e-02,
+	 4.126256324262349e-02,
+	 3.995374113272035e-02,
+	 3.855015317861559e-02,
+	 3.705512854024015e-02,
+	 3.547221325688232e-02,
+	 3.380516183714179e-02,
+	 3.205792835485145e-02,
+	 3.023465707240250e-02,
+	 2.833967261425970e-02,
+	 2.637746971505463e-02,
+	 2.435270256871085e-02,
+	 2.227017380838301e-02,
+	 2.013482315353009e-02,
+	 1.795171577569730e-02,
+	 1.572603047602508e-02,
+	 1.346304789671823e-02,
+	 1.116813946013147e-02,
+	 8.846759826364391e-03,
+	 6.504457968979654e-03,
+	 4.147033260562923e-03,
+	 1.783280721694215e-03,
+	 1.267791634080145e-03,
+	 2.949102953640348e-03,
+	 4.627935228037660e-03,
+	 6.299180497328108e-03,
+	 7.959847477239289e-03,
+	 9.607105414714554e-03,
+	 1.123816856966751e-02,
+	 1.285028384751018e-02,
+	 1.444073174827659e-02,
+	 1.600682991224884e-02,
+	 1.754593729147493e-02,
+	 1.905545846719071e-02,
+	 2.053284796790803e-02,
+	 2.197561453441639e-02,
+	 2.338132530701144e-02,
+	 2.474760992065992e-02,
+	 2.607216449798627e-02,
+	 2.735275553182769e-02,
+	 2.858722365005421e-02,
+	 2.977348725590514e-02,
+	 3.090954603749171e-02,
+	 3.199348434042196e-02,
+	 3.302347439779197e-02,
+	 3.399777941205664e-02,
+	 3.491475648355113e-02,
+	 3.577285938071427e-02,
+	 3.657064114732993e-02,
+	 3.730675654238187e-02,
+	 3.797996430840554e-02,
+	 3.858912926450697e-02,
+	 3.913322422051868e-02,
+	 3.961133170906238e-02,
+	 4.002264553259711e-02,
+	 4.036647212284434e-02,
+	 4.064223171029500e-02,
+	 4.084945930182883e-02,
+	 4.098780546479425e-02,
+	 4.105703691622975e-02,
+	 4.105703691622975e-02,
+	 4.098780546479425e-02,
+	 4.084945930182883e-02,
+	 4.064223171029500e-02,
+	 4.036647212284434e-02,
+	 4.002264553259711e-02,
+	 3.961133170906238e-02,
+	 3.913322422051868e-02,
+	 3.858912926450697e-02,
+	 3.797996430840554e-02,
+	 3.730675654238187e-02,
+	 3.657064114732993e-02,
+	 3.577285938071427e-02,
+	 3.491475648355113e-02,
+	 3.399777941205664e-02,
+	 3.302347439779197e-02,
+	 3.199348434042196e-02,
+	 3.090954603749171e-02,
+	 2.977348725590514e-02,
+	 2.858722365005421e-02,
+	 2.735275553182769e-02,
+	 2.607216449798627e-02,
+	 2.474760992065992e-02,
+	 2.338132530701144e-02,
+	 2.197561453441639e-02,
+	 2.053284796790803e-02,
+	 1.905545846719071e-02,
+	 1.754593729147493e-02,
+	 1.600682991224884e-02,
+	 1.444073174827659e-02,
+	 1.285028384751018e-02,
+	 1.123816856966751e-02,
+	 9.607105414714554e-03,
+	 7.959847477239289e-03,
+	 6.299180497328108e-03,
+	 4.627935228037660e-03,
+	 2.949102953640348e-03,
+	 1.267791634080145e-03,
+	 7.967920655551096e-04,
+	 1.853960788943804e-03,
+	 2.910731817936379e-03,
+	 3.964554338445037e-03,
+	 5.014202742928704e-03,
+	 6.058545504235144e-03,
+	 7.096470791153892e-03,
+	 8.126876925698382e-03,
+	 9.148671230782973e-03,
+	 1.016077053500807e-02,
+	 1.116210209983862e-02,
+	 1.215160467108798e-02,
+	 1.312822956696170e-02,
+	 1.409094177231500e-02,
+	 1.503872102699494e-02,
+	 1.597056290256220e-02,
+	 1.688547986424521e-02,
+	 1.778250231604524e-02,
+	 1.866067962741138e-02,
+	 1.951908114014511e-02,
+	 2.035679715433333e-02,
+	 2.117293989219124e-02,
+	 2.196664443874452e-02,
+	 2.273706965832933e-02,
+	 2.348339908592624e-02,
+	 2.420484179236472e-02,
+	 2.490063322248356e-02,
+	 2.557003600534927e-02,
+	 2.621234073567247e-02,
+	 2.682686672559171e-02,
+	 2.741296272602918e-02,
+	 2.797000761684825e-02,
+	 2.849741106508532e-02,
+	 2.899461415055519e-02,
+	 2.946108995816790e-02,
+	 2.989634413632837e-02,
+	 3.029991542082757e-02,
+	 3.067137612366908e-02,
+	 3.101033258631377e-02,
+	 3.131642559686128e-02,
+	 3.158933077072709e-02,
+	 3.182875889441097e-02,
+	 3.203445623199260e-02,
+	 3.220620479403022e-02,
+	 3.234382256857588e-02,
+	 3.244716371406422e-02,
+	 3.251611871386877e-02,
+	 3.255061449236310e-02,
+	 3.255061449236310e-02,
+	 3.251611871386877e-02,
+	 3.244716371406422e-02,
+	 3.234382256857588e-02,
+	 3.220620479403022e-02,
+	 3.203445623199260e-02,
+	 3.182875889441097e-02,
+	 3.158933077072709e-02,
+	 3.131642559686128e-02,
+	 3.101033258631377e-02,
+	 3.067137612366908e-02,
+	 3.029991542082757e-02,
+	 2.989634413632837e-02,
+	 2.946108995816790e-02,
+	 2.899461415055519e-02,
+	 2.849741106508532e-02,
+	 2.797000761684825e-02,
+	 2.741296272602918e-02,
+	 2.682686672559171e-02,
+	 2.621234073567247e-02,
+	 2.557003600534927e-02,
+	 2.490063322248356e-02,
+	 2.420484179236472e-02,
+	 2.348339908592624e-02,
+	 2.273706965832933e-02,
+	 2.196664443874452e-02,
+	 2.117293989219124e-02,
+	 2.035679715433333e-02,
+	 1.951908114014511e-02,
+	 1.866067962741138e-02,
+	 1.778250231604524e-02,
+	 1.688547986424521e-02,
+	 1.597056290256220e-02,
+	 1.503872102699494e-02,
+	 1.409094177231500e-02,
+	 1.312822956696170e-02,
+	 1.215160467108798e-02,
+	 1.116210209983862e-02,
+	 1.016077053500807e-02,
+	 9.148671230782973e-03,
+	 8.126876925698382e-03,
+	 7.096470791153892e-03,
+	 6.058545504235144e-03,
+	 5.014202742928704e-03,
+	 3.964554338445037e-03,
+	 2.910731817936379e-03,
+	 1.853960788943804e-03,
+	 7.967920655551096e-04,
+	 4.493809602793247e-04,
+	 1.045812679343955e-03,
+	 1.642503018668025e-03,
+	 2.238288430963589e-03,
+	 2.832751471459202e-03,
+	 3.425526040910720e-03,
+	 4.016254983739125e-03,
+	 4.604584256702754e-03,
+	 5.190161832676753e-03,
+	 5.772637542865985e-03,
+	 6.351663161707649e-03,
+	 6.926892566898776e-03,
+	 7.497981925634683e-03,
+	 8.064589890486184e-03,
+	 8.626377798616736e-03,
+	 9.183009871660741e-03,
+	 9.734153415007133e-03,
+	 1.027947901583238e-02,
+	 1.081866073950294e-02,
+	 1.135137632408076e-02,
+	 1.187730737274008e-02,
+	 1.239613954395128e-02,
+	 1.290756273926764e-02,
+	 1.341127128861640e-02,
+	 1.390696413295191e-02,
+	 1.439434500416671e-02,
+	 1.487312260214756e-02,
+	 1.534301076886553e-02,
+	 1.580372865939929e-02,
+	 1.625500090978524e-02,
+	 1.669655780158920e-02,
+	 1.712813542311144e-02,
+	 1.754947582711770e-02,
+	 1.796032718500892e-02,
+	 1.836044393733148e-02,
+	 1.874958694054493e-02,
+	 1.912752360995110e-02,
+	 1.949402805870684e-02,
+	 1.984888123283103e-02,
+	 2.019187104213008e-02,
+	 2.052279248696024e-02,
+	 2.084144778075119e-02,
+	 2.114764646822147e-02,
+	 2.144120553920861e-02,
+	 2.172194953805225e-02,
+	 2.198971066846064e-02,
+	 2.224432889379992e-02,
+	 2.248565203274509e-02,
+	 2.271353585023663e-02,
+	 2.292784414368698e-02,
+	 2.312844882438715e-02,
+	 2.331522999406290e-02,
+	 2.348807601653601e-02,
+	 2.364688358444775e-02,
+	 2.379155778100353e-02,
+	 2.392201213670359e-02,
+	 2.403816868102417e-02,
+	 2.413995798901941e-02,
+	 2.422731922281538e-02,
+	 2.430020016797200e-02,
+	 2.435855726469073e-02,
+	 2.440235563384971e-02,
+	 2.443156909785019e-02,
+	 2.444618019626265e-02,
+	 2.444618019626265e-02,
+	 2.443156909785019e-02,
+	 2.440235563384971e-02,
+	 2.435855726469073e-02,
+	 2.430020016797200e-02,
+	 2.422731922281538e-02,
+	 2.413995798901941e-02,
+	 2.403816868102417e-02,
+	 2.392201213670359e-02,
+	 2.379155778100353e-02,
+	 2.364688358444775e-02,
+	 2.348807601653601e-02,
+	 2.331522999406290e-02,
+	 2.312844882438715e-02,
+	 2.292784414368698e-02,
+	 2.271353585023663e-02,
+	 2.248565203274509e-02,
+	 2.224432889379992e-02,
+	 2.198971066846064e-02,
+	 2.172194953805225e-02,
+	 2.144120553920861e-02,
+	 2.114764646822147e-02,
+	 2.084144778075119e-02,
+	 2.052279248696024e-02,
+	 2.019187104213008e-02,
+	 1.984888123283103e-02,
+	 1.949402805870684e-02,
+	 1.912752360995110e-02,
+	 1.874958694054493e-02,
+	 1.836044393733148e-02,
+	 1.796032718500892e-02,
+	 1.754947582711770e-02,
+	 1.712813542311144e-02,
+	 1.669655780158920e-02,
+	 1.625500090978524e-02,
+	 1.580372865939929e-02,
+	 1.534301076886553e-02,
+	 1.487312260214756e-02,
+	 1.439434500416671e-02,
+	 1.390696413295191e-02,
+	 1.341127128861640e-02,
+	 1.290756273926764e-02,
+	 1.239613954395128e-02,
+	 1.187730737274008e-02,
+	 1.135137632408076e-02,
+	 1.081866073950294e-02,
+	 1.027947901583238e-02,
+	 9.734153415007133e-03,
+	 9.183009871660741e-03,
+	 8.626377798616736e-03,
+	 8.064589890486184e-03,
+	 7.497981925634683e-03,
+	 6.926892566898776e-03,
+	 6.351663161707649e-03,
+	 5.772637542865985e-03,
+	 5.190161832676753e-03,
+	 4.604584256702754e-03,
+	 4.016254983739125e-03,
+	 3.425526040910720e-03,
+	 2.832751471459202e-03,
+	 2.238288430963589e-03,
+	 1.642503018668025e-03,
+	 1.045812679343955e-03,
+	 4.493809602793247e-04,
+	 3.276086705531245e-04,
+	 7.624720932143003e-04,
+	 1.197647486468724e-03,
+	 1.632356998608938e-03,
+	 2.066366492413687e-03,
+	 2.499478988894582e-03,
+	 2.931503683655136e-03,
+	 3.362251623677550e-03,
+	 3.791534836345003e-03,
+	 4.219166142992002e-03,
+	 4.644959149796782e-03,
+	 5.068728293945476e-03,
+	 5.490288909448898e-03,
+	 5.909457300590087e-03,
+	 6.326050818470344e-03,
+	 6.739887938743419e-03,
+	 7.150788339685478e-03,
+	 7.558572980177958e-03,
+	 7.963064177363291e-03,
+	 8.364085683847163e-03,
+	 8.761462764358031e-03,
+	 9.155022271788507e-03,
+	 9.544592722585182e-03,
+	 9.930004371421147e-03,
+	 1.031108928513620e-02,
+	 1.068768141588426e-02,
+	 1.105961667347319e-02,
+	 1.142673299685286e-02,
+	 1.178887042471834e-02,
+	 1.214587116520688e-02,
+	 1.249757966464512e-02,
+	 1.284384267532502e-02,
+	 1.318450932227564e-02,
+	 1.351943116900022e-02,
+	 1.384846228215276e-02,
+	 1.417145929512234e-02,
+	 1.448828147050197e-02,
+	 1.479879076140885e-02,
+	 1.510285187163555e-02,
+	 1.540033231460031e-02,
+	 1.569110247107491e-02,
+	 1.597503564566143e-02,
+	 1.625200812199800e-02,
+	 1.652189921666245e-02,
+	 1.678459133175820e-02,
+	 1.703997000615455e-02,
+	 1.728792396535865e-02,
+	 1.752834517000167e-02,
+	 1.776112886291277e-02,
+	 1.798617361476553e-02,
+	 1.820338136827169e-02,
+	 1.841265748090801e-02,
+	 1.861391076615361e-02,
+	 1.880705353322231e-02,
+	 1.899200162527135e-02,
+	 1.916867445607079e-02,
+	 1.933699504511625e-02,
+	 1.949689005117179e-02,
+	 1.964828980422577e-02,
+	 1.979112833584827e-02,
+	 1.992534340793450e-02,
+	 2.005087653982371e-02,
+	 2.016767303378067e-02,
+	 2.027568199882857e-02,
+	 2.037485637292337e-02,
+	 2.046515294345998e-02,
+	 2.054653236610096e-02,
+	 2.061895918191969e-02,
+	 2.068240183285082e-02,
+	 2.073683267544058e-02,
+	 2.078222799289191e-02,
+	 2.081856800539841e-02,
+	 2.084583687876282e-02,
+	 2.086402273129623e-02,
+	 2.087311763899543e-02,
+	 2.087311763899543e-02,
+	 2.086402273129623e-02,
+	 2.084583687876282e-02,
+	 2.081856800539841e-02,
+	 2.078222799289191e-02,
+	 2.073683267544058e-02,
+	 2.068240183285082e-02,
+	 2.061895918191969e-02,
+	 2.054653236610096e-02,
+	 2.046515294345998e-02,
+	 2.037485637292337e-02,
+	 2.027568199882857e-02,
+	 2.016767303378067e-02,
+	 2.005087653982371e-02,
+	 1.992534340793450e-02,
+	 1.979112833584827e-02,
+	 1.964828980422577e-02,
+	 1.949689005117179e-02,
+	 1.933699504511625e-02,
+	 1.916867445607079e-02,
+	 1.899200162527135e-02,
+	 1.880705353322231e-02,
+	 1.861391076615361e-02,
+	 1.841265748090801e-02,
+	 1.820338136827169e-02,
+	 1.798617361476553e-02,
+	 1.776112886291277e-02,
+	 1.752834517000167e-02,
+	 1.728792396535865e-02,
+	 1.703997000615455e-02,
+	 1.678459133175820e-02,
+	 1.652189921666245e-02,
+	 1.625200812199800e-02,
+	 1.597503564566143e-02,
+	 1.569110247107491e-02,
+	 1.540033231460031e-02,
+	 1.510285187163555e-02,
+	 1.479879076140885e-02,
+	 1.448828147050197e-02,
+	 1.417145929512234e-02,
+	 1.384846228215276e-02,
+	 1.351943116900022e-02,
+	 1.318450932227564e-02,
+	 1.284384267532502e-02,
+	 1.249757966464512e-02,
+	 1.214587116520688e-02,
+	 1.178887042471834e-02,
+	 1.142673299685286e-02,
+	 1.105961667347319e-02,
+	 1.068768141588426e-02,
+	 1.031108928513620e-02,
+	 9.930004371421147e-03,
+	 9.544592722585182e-03,
+	 9.155022271788507e-03,
+	 8.761462764358031e-03,
+	 8.364085683847163e-03,
+	 7.963064177363291e-03,
+	 7.558572980177958e-03,
+	 7.150788339685478e-03,
+	 6.739887938743419e-03,
+	 6.326050818470344e-03,
+	 5.909457300590087e-03,
+	 5.490288909448898e-03,
+	 5.068728293945476e-03,
+	 4.644959149796782e-03,
+	 4.219166142992002e-03,
+	 3.791534836345003e-03,
+	 3.362251623677550e-03,
+	 2.931503683655136e-03,
+	 2.499478988894582e-03,
+	 2.066366492413687e-03,
+	 1.632356998608938e-03,
+	 1.197647486468724e-03,
+	 7.624720932143003e-04,
+	 3.276086705531245e-04,
+	 0.000000000000000e+00,
+	 0.000000000000000e+00
+};
+constant double GaussAdaptiveZ[656]={
+	-9.602898564975362e-01,
+	-7.966664774136267e-01,
+	-5.255324099163290e-01,
+	-1.834346424956498e-01,
+	 1.834346424956498e-01,
+	 5.255324099163290e-01,
+	 7.966664774136267e-01,
+	 9.602898564975362e-01,
+	-9.815606342467192e-01,
+	-9.041172563704748e-01,
+	-7.699026741943047e-01,
+	-5.873179542866175e-01,
+	-3.678314989981802e-01,
+	-1.252334085114689e-01,
+	 1.252334085114689e-01,
+	 3.678314989981802e-01,
+	 5.873179542866175e-01,
+	 7.699026741943047e-01,
+	 9.041172563704748e-01,
+	 9.815606342467192e-01,
+	-9.894009349916499e-01,
+	-9.445750230732326e-01,
+	-8.656312023878318e-01,
+	-7.554044083550030e-01,
+	-6.178762444026438e-01,
+	-4.580167776572274e-01,
+	-2.816035507792589e-01,
+	-9.501250983763745e-02,
+	 9.501250983763745e-02,
+	 2.816035507792589e-01,
+	 4.580167776572274e-01,
+	 6.178762444026438e-01,
+	 7.554044083550030e-01,
+	 8.656312023878318e-01,
+	 9.445750230732326e-01,
+	 9.894009349916499e-01,
+	-9.951872199970213e-01,
+	-9.747285559713095e-01,
+	-9.382745520027328e-01,
+	-8.864155270044010e-01,
+	-8.200019859739029e-01,
+	-7.401241915785544e-01,
+	-6.480936519369755e-01,
+	-5.454214713888396e-01,
+	-4.337935076260451e-01,
+	-3.150426796961634e-01,
+	-1.911188674736163e-01,
+	-6.405689286260563e-02,
+	 6.405689286260563e-02,
+	 1.911188674736163e-01,
+	 3.150426796961634e-01,
+	 4.337935076260451e-01,
+	 5.454214713888396e-01,
+	 6.480936519369755e-01,
+	 7.401241915785544e-01,
+	 8.200019859739029e-01,
+	 8.864155270044010e-01,
+	 9.382745520027328e-01,
+	 9.747285559713095e-01,
+	 9.951872199970213e-01,
+	-9.972638618494816e-01,
+	-9.856115115452684e-01,
+	-9.647622555875064e-01,
+	-9.349060759377397e-01,
+	-8.963211557660522e-01,
+	-8.493676137325700e-01,
+	-7.944837959679424e-01,
+	-7.321821187402897e-01,
+	-6.630442669302152e-01,
+	-5.877157572407623e-01,
+	-5.068999089322294e-01,
+	-4.213512761306353e-01,
+	-3.318686022821277e-01,
+	-2.392873622521371e-01,
+	-1.444719615827965e-01,
+	-4.830766568773831e-02,
+	 4.830766568773831e-02,
+	 1.444719615827965e-01,
+	 2.392873622521371e-01,
+	 3.318686022821277e-01,
+	 4.213512761306353e-01,
+	 5.068999089322294e-01,
+	 5.877157572407623e-01,
+	 6.630442669302152e-01,
+	 7.321821187402897e-01,
+	 7.944837959679424e-01,
+	 8.493676137325700e-01,
+	 8.963211557660522e-01,
+	 9.349060759377397e-01,
+	 9.647622555875064e-01,
+	 9.856115115452684e-01,
+	 9.972638618494816e-01,
+	-9.987710072524261e-01,
+	-9.935301722663508e-01,
+	-9.841245837228269e-01,
+	-9.705915925462473e-01,
+	-9.529877031604309e-01,
+	-9.313866907065543e-01,
+	-9.058791367155696e-01,
+	-8.765720202742479e-01,
+	-8.435882616243935e-01,
+	-8.070662040294426e-01,
+	-7.671590325157404e-01,
+	-7.240341309238146e-01,
+	-6.778723796326639e-01,
+	-6.288673967765136e-01,
+	-5.772247260839727e-01,
+	-5.231609747222330e-01,
+	-4.669029047509584e-01,
+	-4.086864819907167e-01,
+	-3.487558862921608e-01,
+	-2.873624873554556e-01,
+	-2.247637903946891e-01,
+	-1.612223560688917e-01,
+	-9.700469920946270e-02,
+	-3.238017096286937e-02,
+	 3.238017096286937e-02,
+	 9.700469920946270e-02,
+	 1.612223560688917e-01,
+	 2.247637903946891e-01,
+	 2.873624873554556e-01,
+	 3.487558862921608e-01,
+	 4.086864819907167e-01,
+	 4.669029047509584e-01,
+	 5.231609747222330e-01,
+	 5.772247260839727e-01,
+	 6.288673967765136e-01,
+	 6.778723796326639e-01,
+	 7.240341309238146e-01,
+	 7.671590325157404e-01,
+	 8.070662040294426e-01,
+	 8.435882616243935e-01,
+	 8.765720202742479e-01,
+	 9.058791367155696e-01,
+	 9.313866907065543e-01,
+	 9.529877031604309e-01,
+	 9.705915925462473e-01,
+	 9.841245837228269e-01,
+	 9.935301722663508e-01,
+	 9.987710072524261e-01,
+	-9.993050417357722e-01,
+	-9.963401167719552e-01,
+	-9.910133714767443e-01,
+	-9.833362538846260e-01,
+	-9.733268277899110e-01,
+	-9.610087996520538e-01,
+	-9.464113748584028e-01,
+	-9.295691721319396e-01,
+	-9.105221370785028e-01,
+	-8.893154459951141e-01,
+	-8.659993981540928e-01,
+	-8.406292962525803e-01,
+	-8.132653151227975e-01,
+	-7.839723589433414e-01,
+	-7.528199072605319e-01,
+	-7.198818501716108e-01,
+	-6.852363130542333e-01,
+	-6.489654712546573e-01,
+	-6.111553551723933e-01,
+	-5.718956462026340e-01,
+	-5.312794640198946e-01,
+	-4.894031457070530e-01,
+	-4.463660172534641e-01,
+	-4.022701579639916e-01,
+	-3.572201583376681e-01,
+	-3.113228719902110e-01,
+	-2.646871622087674e-01,
+	-2.174236437400071e-01,
+	-1.696444204239928e-01,
+	-1.214628192961206e-01,
+	-7.299312178779904e-02,
+	-2.435029266342443e-02,
+	 2.435029266342443e-02,
+	 7.299312178779904e-02,
+	 1.214628192961206e-01,
+	 1.696444204239928e-01,
+	 2.174236437400071e-01,
+	 2.646871622087674e-01,
+	 3.113228719902110e-01,
+	 3.572201583376681e-01,
+	 4.022701579639916e-01,
+	 4.463660172534641e-01,
+	 4.894031457070530e-01,
+	 5.312794640198946e-01,
+	 5.718956462026340e-01,
+	 6.111553551723933e-01,
+	 6.489654712546573e-01,
+	 6.852363130542333e-01,
+	 7.198818501716108e-01,
+	 7.528199072605319e-01,
+	 7.839723589433414e-01,
+	 8.132653151227975e-01,
+	 8.406292962525803e-01,
+	 8.659993981540928e-01,
+	 8.893154459951141e-01,
+	 9.105221370785028e-01,
+	 9.295691721319396e-01,
+	 9.464113748584028e-01,
+	 9.610087996520538e-01,
+	 9.733268277899110e-01,
+	 9.833362538846260e-01,
+	 9.910133714767443e-01,
+	 9.963401167719552e-01,
+	 9.993050417357722e-01,
+	-9.995059483621531e-01,
+	-9.973977863553555e-01,
+	-9.936087727235270e-01,
+	-9.881444533598375e-01,
+	-9.810139389756559e-01,
+	-9.722292285203769e-01,
+	-9.618051267587678e-01,
+	-9.497592077108964e-01,
+	-9.361117819348108e-01,
+	-9.208858612521501e-01,
+	-9.041071195455668e-01,
+	-8.858038492920828e-01,
+	-8.660069137719819e-01,
+	-8.447496949833424e-01,
+	-8.220680373289746e-01,
+	-7.980001871612001e-01,
+	-7.725867282818097e-01,
+	-7.458705135036104e-01,
+	-7.178965923877036e-01,
+	-6.887121352776406e-01,
+	-6.583663537581427e-01,
+	-6.269104176722665e-01,
+	-5.943973688367929e-01,
+	-5.608820316012375e-01,
+	-5.264209204012426e-01,
+	-4.910721444621939e-01,
+	-4.548953098137263e-01,
+	-4.179514187803273e-01,
+	-3.803027671175044e-01,
+	-3.420128389669621e-01,
+	-3.031461998079078e-01,
+	-2.637683875849943e-01,
+	-2.239458021964741e-01,
+	-1.837455935289145e-01,
+	-1.432355482272675e-01,
+	-1.024839753912270e-01,
+	-6.155959139061121e-02,
+	-2.053140399399864e-02,
+	 2.053140399399864e-02,
+	 6.155959139061121e-02,
+	 1.024839753912270e-01,
+	 1.432355482272675e-01,
+	 1.837455935289145e-01,
+	 2.239458021964741e-01,
+	 2.637683875849943e-01,
+	 3.031461998079078e-01,
+	 3.420128389669621e-01,
+	 3.803027671175044e-01,
+	 4.179514187803273e-01,
+	 4.548953098137263e-01,
+	 4.910721444621939e-01,
+	 5.264209204012426e-01,
+	 5.608820316012375e-01,
+	 5.943973688367929e-01,
+	 6.269104176722665e-01,
+	 6.583663537581427e-01,
+	 6.887121352776406e-01,
+	 7.178965923877036e-01,
+	 7.458705135036104e-01,
+	 7.725867282818097e-01,
+	 7.980001871612001e-01,
+	 8.220680373289746e-01,
+	 8.447496949833424e-01,
+	 8.660069137719819e-01,
+	 8.858038492920828e-01,
+	 9.041071195455668e-01,
+	 9.208858612521501e-01,
+	 9.361117819348108e-01,
+	 9.497592077108964e-01,
+	 9.618051267587678e-01,
+	 9.722292285203769e-01,
+	 9.810139389756559e-01,
+	 9.881444533598375e-01,
+	 9.936087727235270e-01,
+	 9.973977863553555e-01,
+	 9.995059483621531e-01,
+	-9.996895038832307e-01,
+	-9.983643758631817e-01,
+	-9.959818429872093e-01,
+	-9.925439003237626e-01,
+	-9.880541263296237e-01,
+	-9.825172635630147e-01,
+	-9.759391745851365e-01,
+	-9.683268284632642e-01,
+	-9.596882914487426e-01,
+	-9.500327177844377e-01,
+	-9.393703397527552e-01,
+	-9.277124567223087e-01,
+	-9.150714231208981e-01,
+	-9.014606353158523e-01,
+	-8.868945174024204e-01,
+	-8.713885059092965e-01,
+	-8.549590334346014e-01,
+	-8.376235112281871e-01,
+	-8.194003107379317e-01,
+	-8.003087441391408e-01,
+	-7.803690438674332e-01,
+	-7.596023411766475e-01,
+	-7.380306437444001e-01,
+	-7.156768123489676e-01,
+	-6.925645366421715e-01,
+	-6.687183100439161e-01,
+	-6.441634037849671e-01,
+	-6.189258401254686e-01,
+	-5.930323647775720e-01,
+	-5.665104185613972e-01,
+	-5.393881083243575e-01,
+	-5.116941771546677e-01,
+	-4.834579739205964e-01,
+	-4.547094221677430e-01,
+	-4.254789884073005e-01,
+	-3.957976498289086e-01,
+	-3.656968614723136e-01,
+	-3.352085228926254e-01,
+	-3.043649443544963e-01,
+	-2.731988125910492e-01,
+	-2.417431561638400e-01,
+	-2.100313104605672e-01,
+	-1.780968823676186e-01,
+	-1.459737146548969e-01,
+	-1.136958501106659e-01,
+	-8.129749546442556e-02,
+	-4.881298513604973e-02,
+	-1.627674484960297e-02,
+	 1.627674484960297e-02,
+	 4.881298513604973e-02,
+	 8.129749546442556e-02,
+	 1.136958501106659e-01,
+	 1.459737146548969e-01,
+	 1.780968823676186e-01,
+	 2.100313104605672e-01,
+	 2.417431561638400e-01,
+	 2.731988125910492e-01,
+	 3.043649443544963e-01,
+	 3.352085228926254e-01,
+	 3.656968614723136e-01,
+	 3.957976498289086e-01,
+	 4.254789884073005e-01,
+	 4.547094221677430e-01,
+	 4.834579739205964e-01,
+	 5.116941771546677e-01,
+	 5.393881083243575e-01,
+	 5.665104185613972e-01,
+	 5.930323647775720e-01,
+	 6.189258401254686e-01,
+	 6.441634037849671e-01,
+	 6.687183100439161e-01,
+	 6.925645366421715e-01,
+	 7.156768123489676e-01,
+	 7.380306437444001e-01,
+	 7.596023411766475e-01,
+	 7.803690438674332e-01,
+	 8.003087441391408e-01,
+	 8.194003107379317e-01,
+	 8.376235112281871e-01,
+	 8.549590334346014e-01,
+	 8.713885059092965e-01,
+	 8.868945174024204e-01,
+	 9.014606353158523e-01,
+	 9.150714231208981e-01,
+	 9.277124567223087e-01,
+	 9.393703397527552e-01,
+	 9.500327177844377e-01,
+	 9.596882914487426e-01,
+	 9.683268284632642e-01,
+	 9.759391745851365e-01,
+	 9.825172635630147e-01,
+	 9.880541263296237e-01,
+	 9.925439003237626e-01,
+	 9.959818429872093e-01,
+	 9.983643758631817e-01,
+	 9.996895038832307e-01,
+	-9.998248879471320e-01,
+	-9.990774599773758e-01,
+	-9.977332486255140e-01,
+	-9.957927585349812e-01,
+	-9.932571129002129e-01,
+	-9.901278184917344e-01,
+	-9.864067427245862e-01,
+	-9.820961084357185e-01,
+	-9.771984914639074e-01,
+	-9.717168187471366e-01,
+	-9.656543664319652e-01,
+	-9.590147578536999e-01,
+	-9.518019613412644e-01,
+	-9.440202878302202e-01,
+	-9.356743882779164e-01,
+	-9.267692508789478e-01,
+	-9.173101980809605e-01,
+	-9.073028834017568e-01,
+	-8.967532880491582e-01,
+	-8.856677173453972e-01,
+	-8.740527969580318e-01,
+	-8.619154689395484e-01,
+	-8.492629875779689e-01,
+	-8.361029150609068e-01,
+	-8.224431169556439e-01,
+	-8.082917575079137e-01,
+	-7.936572947621933e-01,
+	-7.785484755064119e-01,
+	-7.629743300440948e-01,
+	-7.469441667970620e-01,
+	-7.304675667419088e-01,
+	-7.135543776835874e-01,
+	-6.962147083695144e-01,
+	-6.784589224477192e-01,
+	-6.602976322726460e-01,
+	-6.417416925623075e-01,
+	-6.228021939105849e-01,
+	-6.034904561585486e-01,
+	-5.838180216287631e-01,
+	-5.637966482266181e-01,
+	-5.434383024128103e-01,
+	-5.227551520511755e-01,
+	-5.017595591361445e-01,
+	-4.804640724041720e-01,
+	-4.588814198335522e-01,
+	-4.370245010371042e-01,
+	-4.149063795522750e-01,
+	-3.925402750332674e-01,
+	-3.699395553498590e-01,
+	-3.471177285976355e-01,
+	-3.240884350244134e-01,
+	-3.008654388776772e-01,
+	-2.774626201779044e-01,
+	-2.538939664226944e-01,
+	-2.301735642266600e-01,
+	-2.063155909020792e-01,
+	-1.823343059853372e-01,
+	-1.582440427142249e-01,
+	-1.340591994611878e-01,
+	-1.097942311276437e-01,
+	-8.546364050451551e-02,
+	-6.108196960413957e-02,
+	-3.666379096873349e-02,
+	-1.222369896061577e-02,
+	 1.222369896061577e-02,
+	 3.666379096873349e-02,
+	 6.108196960413957e-02,
+	 8.546364050451551e-02,
+	 1.097942311276437e-01,
+	 1.340591994611878e-01,
+	 1.582440427142249e-01,
+	 1.823343059853372e-01,
+	 2.063155909020792e-01,
+	 2.301735642266600e-01,
+	 2.538939664226944e-01,
+	 2.774626201779044e-01,
+	 3.008654388776772e-01,
+	 3.240884350244134e-01,
+	 3.471177285976355e-01,
+	 3.699395553498590e-01,
+	 3.925402750332674e-01,
+	 4.149063795522750e-01,
+	 4.370245010371042e-01,
+	 4.588814198335522e-01,
+	 4.804640724041720e-01,
+	 5.017595591361445e-01,
+	 5.227551520511755e-01,
+	 5.434383024128103e-01,
+	 5.637966482266181e-01,
+	 5.838180216287631e-01,
+	 6.034904561585486e-01,
+	 6.228021939105849e-01,
+	 6.417416925623075e-01,
+	 6.602976322726460e-01,
+	 6.784589224477192e-01,
+	 6.962147083695144e-01,
+	 7.135543776835874e-01,
+	 7.304675667419088e-01,
+	 7.469441667970620e-01,
+	 7.629743300440948e-01,
+	 7.785484755064119e-01,
+	 7.936572947621933e-01,
+	 8.082917575079137e-01,
+	 8.224431169556439e-01,
+	 8.361029150609068e-01,
+	 8.492629875779689e-01,
+	 8.619154689395484e-01,
+	 8.740527969580318e-01,
+	 8.856677173453972e-01,
+	 8.967532880491582e-01,
+	 9.073028834017568e-01,
+	 9.173101980809605e-01,
+	 9.267692508789478e-01,
+	 9.356743882779164e-01,
+	 9.440202878302202e-01,
+	 9.518019613412644e-01,
+	 9.590147578536999e-01,
+	 9.656543664319652e-01,
+	 9.717168187471366e-01,
+	 9.771984914639074e-01,
+	 9.820961084357185e-01,
+	 9.864067427245862e-01,
+	 9.901278184917344e-01,
+	 9.932571129002129e-01,
+	 9.957927585349812e-01,
+	 9.977332486255140e-01,
+	 9.990774599773758e-01,
+	 9.998248879471320e-01,
+	-9.998723404457334e-01,
+	-9.993274305065947e-01,
+	-9.983473449340834e-01,
+	-9.969322929775997e-01,
+	-9.950828645255290e-01,
+	-9.927998590434373e-01,
+	-9.900842691660192e-01,
+	-9.869372772712794e-01,
+	-9.833602541697529e-01,
+	-9.793547582425894e-01,
+	-9.749225346595942e-01,
+	-9.700655145738373e-01,
+	-9.647858142586956e-01,
+	-9.590857341746903e-01,
+	-9.529677579610971e-01,
+	-9.464345513503147e-01,
+	-9.394889610042837e-01,
+	-9.321340132728527e-01,
+	-9.243729128743134e-01,
+	-9.162090414984952e-01,
+	-9.076459563329236e-01,
+	-8.986873885126240e-01,
+	-8.893372414942055e-01,
+	-8.795995893549102e-01,
+	-8.694786750173527e-01,
+	-8.589789084007133e-01,
+	-8.481048644991847e-01,
+	-8.368612813885015e-01,
+	-8.252530581614230e-01,
+	-8.132852527930605e-01,
+	-8.009630799369827e-01,
+	-7.882919086530552e-01,
+	-7.752772600680049e-01,
+	-7.619248049697269e-01,
+	-7.482403613363824e-01,
+	-7.342298918013638e-01,
+	-7.198995010552305e-01,
+	-7.052554331857488e-01,
+	-6.903040689571928e-01,
+	-6.750519230300931e-01,
+	-6.595056411226444e-01,
+	-6.436719971150083e-01,
+	-6.275578900977726e-01,
+	-6.111703413658551e-01,
+	-5.945164913591590e-01,
+	-5.776035965513142e-01,
+	-5.604390262878617e-01,
+	-5.430302595752547e-01,
+	-5.253848818220803e-01,
+	-5.075105815339176e-01,
+	-4.894151469632753e-01,
+	-4.711064627160663e-01,
+	-4.525925063160997e-01,
+	-4.338813447290861e-01,
+	-4.149811308476706e-01,
+	-3.959000999390257e-01,
+	-3.766465660565522e-01,
+	-3.572289184172501e-01,
+	-3.376556177463400e-01,
+	-3.179351925907259e-01,
+	-2.980762356029071e-01,
+	-2.780873997969574e-01,
+	-2.579773947782034e-01,
+	-2.377549829482451e-01,
+	-2.174289756869712e-01,
+	-1.970082295132342e-01,
+	-1.765016422258567e-01,
+	-1.559181490266516e-01,
+	-1.352667186271445e-01,
+	-1.145563493406956e-01,
+	-9.379606516172284e-02,
+	-7.299491183373581e-02,
+	-5.216195290789248e-02,
+	-3.130626579379715e-02,
+	-1.043693780425977e-02,
+	 1.043693780425977e-02,
+	 3.130626579379715e-02,
+	 5.216195290789248e-02,
+	 7.299491183373581e-02,
+	 9.379606516172284e-02,
+	 1.145563493406956e-01,
+	 1.352667186271445e-01,
+	 1.559181490266516e-01,
+	 1.765016422258567e-01,
+	 1.970082295132342e-01,
+	 2.174289756869712e-01,
+	 2.377549829482451e-01,
+	 2.579773947782034e-01,
+	 2.780873997969574e-01,
+	 2.980762356029071e-01,
+	 3.179351925907259e-01,
+	 3.376556177463400e-01,
+	 3.572289184172501e-01,
+	 3.766465660565522e-01,
+	 3.959000999390257e-01,
+	 4.149811308476706e-01,
+	 4.338813447290861e-01,
+	 4.525925063160997e-01,
+	 4.711064627160663e-01,
+	 4.894151469632753e-01,
+	 5.075105815339176e-01,
+	 5.253848818220803e-01,
+	 5.430302595752547e-01,
+	 5.604390262878617e-01,
+	 5.776035965513142e-01,
+	 5.945164913591590e-01,
+	 6.111703413658551e-01,
+	 6.275578900977726e-01,
+	 6.436719971150083e-01,
+	 6.595056411226444e-01,
+	 6.750519230300931e-01,
+	 6.903040689571928e-01,
+	 7.052554331857488e-01,
+	 7.198995010552305e-01,
+	 7.342298918013638e-01,
+	 7.482403613363824e-01,
+	 7.619248049697269e-01,
+	 7.752772600680049e-01,
+	 7.882919086530552e-01,
+	 8.009630799369827e-01,
+	 8.132852527930605e-01,
+	 8.252530581614230e-01,
+	 8.368612813885015e-01,
+	 8.481048644991847e-01,
+	 8.589789084007133e-01,
+	 8.694786750173527e-01,
+	 8.795995893549102e-01,
+	 8.893372414942055e-01,
+	 8.986873885126240e-01,
+	 9.076459563329236e-01,
+	 9.162090414984952e-01,
+	 9.243729128743134e-01,
+	 9.321340132728527e-01,
+	 9.394889610042837e-01,
+	 9.464345513503147e-01,
+	 9.529677579610971e-01,
+	 9.590857341746903e-01,
+	 9.647858142586956e-01,
+	 9.700655145738373e-01,
+	 9.749225346595942e-01,
+	 9.793547582425894e-01,
+	 9.833602541697529e-01,
+	 9.869372772712794e-01,
+	 9.900842691660192e-01,
+	 9.927998590434373e-01,
+	 9.950828645255290e-01,
+	 9.969322929775997e-01,
+	 9.983473449340834e-01,
+	 9.993274305065947e-01,
+	 9.998723404457334e-01,
+	 0.000000000000000e+00,
+	 0.000000000000000e+00
+};
\ No newline at end of file
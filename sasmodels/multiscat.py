@@ -61,6 +61,13 @@ The resulting $I(q)$ will be linearly spaced and likely heavily oversampled.
 The usual pinhole or slit resolution calculation can performed from these
 calculated values.
 
+For isotropic 1D patterns the 2D Fourier transform of the radially symmetric
+$I(q)$ is the zeroth order Hankel transform
+.. math:: F(r) = 2 \pi \int_0^\infty I(q) J_0(qr) q\,dq
+so the scattering powers can instead be computed with 1D transforms on a
+log-spaced $q$ grid using FFTLog.  Select this with *method="hankel"* in
+:class:`MultipleScattering`.
+
 By default single precision OpenCL is used for the calculation.  Set the
 environment variable *SAS_OPENCL=none* to use double precision numpy FFT
 instead.  The OpenCL versions is about 10x faster on an elderly Mac with
@@ -75,7 +82,13 @@ import time
 
 import numpy as np
 from numpy import pi
-from scipy.special import gamma
+from scipy.special import gamma, loggamma
+try:
+    import scipy.fft as fftpack
+    HAVE_WORKERS = True
+except ImportError:
+    fftpack = np.fft
+    HAVE_WORKERS = False
 
 from sasmodels import core
 from sasmodels import compare
@@ -101,6 +114,7 @@ except ImportError:
     HAVE_OPENCL = False
 PRECISION = np.dtype('f' if HAVE_OPENCL else 'd')  # 'f' or 'd'
 USE_FAST = True  # OpenCL faster, less accurate math
+FFT_WORKERS = None  # threads for scipy.fft in NumpyCalculator; -1 for all cores
 
 class ICalculator:
     """
@@ -132,10 +146,28 @@ class ICalculator:
 class NumpyCalculator(ICalculator):
     """
     Multiple scattering calculator using numpy fft.
+
+    The multiple scattering calculation uses real-input transforms with the
+    padded frame and the fourier frame allocated once and reused on each
+    call.  If scipy.fft is available then *workers* threads are used for
+    the transforms, defaulting to :data:`FFT_WORKERS`.
     """
-    def __init__(self, dims=None, dtype=PRECISION):
+    def __init__(self, dims=None, dtype=PRECISION, workers=None):
         self.dtype = dtype
         self.complex_dtype = np.dtype('F') if dtype == np.dtype('f') else np.dtype('D')
+        self.workers = FFT_WORKERS if workers is None else workers
+        self._frame = None  # type: np.ndarray
+        self._fourier_frame = None  # type: np.ndarray
+        if dims is not None:
+            self._allocate(dims)
+
+    def _allocate(self, dims):
+        self._frame = np.zeros(dims, dtype=self.dtype)
+        self._fourier_frame = np.empty((dims[0], dims[1]//2 + 1),
+                                       dtype=self.complex_dtype)
+
+    def _fft_kw(self):
+        return {'workers': self.workers} if HAVE_WORKERS else {}
 
     def fft(self, Iq):
         #t0 = time.time()
@@ -156,11 +188,21 @@ class NumpyCalculator(ICalculator):
         coeffs = scattering_coeffs(p, coverage)
         poly = np.asarray(coeffs[::-1], dtype=self.dtype)
         scale = np.sum(Iq)
-        frame = _forward_shift(Iq/scale, dtype=self.dtype)
-        fourier_frame = np.fft.fft2(frame)
-        convolved = fourier_frame * np.polyval(poly, fourier_frame)
-        frame = np.fft.ifft2(convolved)
-        result = scale * _inverse_shift(frame.real, dtype=self.dtype)
+        nq = Iq.shape[0]
+        if self._frame is None or self._frame.shape != (2*nq, 2*nq):
+            self._allocate((2*nq, 2*nq))
+        frame = _forward_shift(Iq/scale, dtype=self.dtype, out=self._frame)
+        F = fftpack.rfft2(frame, **self._fft_kw())
+        # convolved = F * polyval(poly, F), using Horner's rule in place
+        convolved = self._fourier_frame
+        convolved[...] = poly[0]
+        for c in poly[1:]:
+            convolved *= F
+            convolved += c
+        convolved *= F
+        frame = fftpack.irfft2(convolved, s=frame.shape, **self._fft_kw())
+        result = _inverse_shift(frame, dtype=self.dtype)
+        result *= scale
         #print("numpy multiscat time", time.time()-t0)
         return result
 
@@ -262,6 +304,91 @@ class OpenclCalculator(ICalculator):
 
 Calculator = OpenclCalculator if HAVE_OPENCL else NumpyCalculator
 
+class HankelCalculator(object):
+    r"""
+    Multiple scattering calculator for isotropic patterns.
+
+    A radially symmetric pattern $I(q)$ has a radially symmetric 2D Fourier
+    transform given by the zeroth order Hankel transform
+    $F(r) = 2\pi \int_0^\infty I(q) J_0(qr) q\,dq$, so the scattering
+    powers can be computed in 1D without building the 2D pattern.  The
+    transforms use the FFTLog algorithm on the log-spaced points *q*
+    (see :func:`log_q_grid`), which costs $O(n \log n)$ for $n$ points.
+
+    Use the $k=1$ term $I(q)$ directly and only transform the $k \geq 2$
+    terms, which are smooth, so the single scattering pattern is exact.
+    """
+    def __init__(self, q):
+        self.q = q
+        n = len(q)
+        self._dlnq = np.log(q[1]/q[0])
+        # Pad to 2n so that the periodic FFT does not wrap high q onto low q.
+        # Put the r grid in the centre of the reciprocal range, and use the
+        # same step in log r as in log q so that we can map back to q.
+        self._npad = 2*n
+        lnq0 = np.log(q[0])
+        lnr0 = -np.log(q[-1]) - 0.5*n*self._dlnq
+        self._r = np.exp(lnr0 + self._dlnq*np.arange(self._npad))
+        self._forward = _fftlog_kernel(self._npad, self._dlnq, lnq0 + lnr0)
+        self._inverse = _fftlog_kernel(2*self._npad, self._dlnq, lnr0 + lnq0)
+
+    def multiple_scattering(self, Iq, p, coverage=0.99):
+        r"""
+        Compute multiple scattering for $I(q)$ at the calculator *q* points
+        given scattering probability $p$.
+        """
+        coeffs = scattering_coeffs(p, coverage)
+        poly = np.asarray(coeffs[::-1], dtype='d')
+        q, r = self.q, self._r
+        Iq = np.asarray(Iq, dtype='d')
+        # scale = int I(q) d^2q, so that F(0) = 1 after normalization.
+        scale = 2*pi*self._dlnq*np.sum(q*q*Iq)
+        # With phi(q) = q f(q) the transform r int phi(q) J0(qr) dq is its
+        # own inverse.
+        F = (2*pi/r)*_fftlog(q*Iq/scale, self._forward)
+        # Terms k >= 2 of F polyval(poly, F), Horner's rule in place.
+        convolved = np.full_like(F, poly[0])
+        for c in poly[1:]:
+            convolved *= F
+            convolved += c
+        convolved -= 1.
+        convolved *= F
+        frame = _fftlog(r*convolved, self._inverse)[:len(q)]
+        result = Iq + (scale/(2*pi))*frame/q
+        return result
+
+def log_q_grid(qmin, qmax, dq):
+    """
+    Return log-spaced q values from *qmin* to *qmax* with steps no larger
+    than *dq*, for use with :class:`HankelCalculator`.
+    """
+    dlnq = dq/qmax
+    n = int(np.ceil(np.log(qmax/qmin)/dlnq)) + 1
+    return np.exp(np.linspace(np.log(qmin), np.log(qmax), n))
+
+def _fftlog_kernel(n, dlnx, lnxy):
+    r"""
+    Return the FFTLog coefficients for the order 0 Hankel transform of
+    length *n* with step *dlnx* in $\ln x$ and $\ln y$, where *lnxy* is
+    $\ln x_0 + \ln y_0$ for the first points of the input and output grids.
+    """
+    omega = 2*pi*np.arange(n//2 + 1)/(n*dlnx)
+    # Mellin transform of J0 at 1 + i omega, which has unit modulus:
+    #     int t^(i omega) J0(t) dt = 2^(i omega) G((1+i omega)/2) / G((1-i omega)/2)
+    u = np.exp(1j*omega*(np.log(2) - lnxy) + loggamma(0.5+0.5j*omega)
+               - loggamma(0.5-0.5j*omega))
+    u[-1] = u[-1].real
+    return u
+
+def _fftlog(phi, u):
+    r"""
+    Compute $\psi(y) = y \int_0^\infty \phi(x) J_0(xy) dx$ on the log grid,
+    with kernel *u* from :func:`_fftlog_kernel`.  The input is zero padded to
+    the length of the kernel.
+    """
+    n = 2*(len(u) - 1)
+    return np.fft.irfft(np.conj(np.fft.rfft(phi, n=n)*u), n=n)
+
 def scattering_powers(Iq, n, dtype='f', transform=None):
     r"""
     Calculate the scattering powers up to n.
@@ -307,11 +434,13 @@ def truncated_poisson_invcdf(coverage, L):
         cdf += pmf
     return k
 
-def _forward_shift(Iq, dtype=PRECISION):
+def _forward_shift(Iq, dtype=PRECISION, out=None):
     # Prepare padded array and forward transform
+    # If *out* is given it is reused for the frame; only the corners are
+    # written, so the rest of *out* must already be zero.
     nq = Iq.shape[0]
     half_nq = nq//2
-    frame = np.zeros((2*nq, 2*nq), dtype=dtype)
+    frame = np.zeros((2*nq, 2*nq), dtype=dtype) if out is None else out
     frame[:half_nq, :half_nq] = Iq[half_nq:, half_nq:]
     frame[-half_nq:, :half_nq] = Iq[:half_nq, half_nq:]
     frame[:half_nq, -half_nq:] = Iq[half_nq:, :half_nq]
@@ -354,11 +483,21 @@ class MultipleScattering(Resolution):
     *resolution* is the resolution function to apply after multiple
     scattering.  If present, then the resolution $q$ vectors will provide
     default values for *qmin*, *qmax* and *nq*.
+
+    *method* is "fft2" to compute the scattering powers with 2D FFTs on
+    an *nq* x *nq* grid, or "hankel" to use the radial symmetry of 1D
+    patterns and compute them with 1D Hankel transforms (see
+    :class:`HankelCalculator`).  The Hankel method computes $I(q)$ on
+    a log-spaced grid with no 2D intermediate, so *Iqxy* is not available.
+
+    *antialias* is True if pixels should be shared between neighbouring
+    $q$ bins in proportion to their distance from the bin centres when
+    forming the radial profile of the 2D pattern.
     """
     def __init__(self, qmin=None, qmax=None, nq=None, window=2,
                  probability=None, coverage=0.99,
                  is2d=False, resolution=None,
-                 dtype=PRECISION):
+                 dtype=PRECISION, method="fft2", antialias=False):
         # Infer qmin, qmax from instrument resolution calculator, if present
         if resolution is not None:
             is2d = hasattr(resolution, 'qx_data')
@@ -403,12 +542,21 @@ class MultipleScattering(Resolution):
         self.is2d = is2d
         self.window = window
         self.resolution = resolution
+        self.method = method
+        if method not in ("fft2", "hankel"):
+            raise ValueError("unknown multiple scattering method %r"%method)
+        if is2d and method == "hankel":
+            raise ValueError("hankel method requires isotropic 1D scattering")
 
         # Determine the q values to calculate
         q = np.linspace(-q_range, q_range, nq)
         qx, qy = np.meshgrid(q, q)
         if is2d:
             q_calc = (qx.flatten(), qy.flatten())
+        elif method == "hankel":
+            # Sample well below the first pixel so that the transform sees
+            # the full forward scattering peak.
+            q_calc = (log_q_grid(qmin/100, q_range, qmin/2),)
         else:
             # For 1-D patterns, compute q from the center to the corners and
             # interpolate from there into the individual pixels.  Given that
@@ -440,8 +588,11 @@ class MultipleScattering(Resolution):
             # compute, either for the calculated q values for the resolution
             # function (if any) or for the raw q values desired
             self._q = np.linspace(qmin, qmax, nq//(2*window))
-            self._edges = bin_edges(self._q)
-            self._norm, _ = np.histogram(self._radius, bins=self._edges)
+            if method == "fft2":
+                self._edges = bin_edges(self._q)
+                # The pixel radii are fixed, so find their bins just once.
+                self._bins = radial_bins(self._radius, self._edges, antialias)
+                self._norm = bin_sum(1., *self._bins)
             if resolution is not None:
                 self.q = resolution.q
             else:
@@ -449,13 +600,18 @@ class MultipleScattering(Resolution):
                 self.q = self._q
 
         # Prepare the multiple scattering calculator (either numpy or OpenCL)
-        self.transform = Calculator((2*nq, 2*nq), dtype=dtype)
+        if method == "hankel":
+            self.transform = HankelCalculator(q_calc[0])
+        else:
+            self.transform = Calculator((2*nq, 2*nq), dtype=dtype)
 
         # Iq and Iqxy will be set during apply
         self.Iq = None # type: np.ndarray
         self.Iqxy = None # type: np.ndarray
 
     def apply(self, theory):
+        if self.method == "hankel":
+            return self._apply_hankel(theory)
         if self.is2d:
             Iq_calc = theory
         else:
@@ -500,35 +656,90 @@ class MultipleScattering(Resolution):
                 Iq = self.resolution.apply(Iq_res)
             return Iq
 
+    def _apply_hankel(self, theory):
+        probability = self.probability() if callable(self.probability) else self.probability
+        Iq_calc = self.transform.multiple_scattering(
+            theory, probability, self.coverage)
+        self.Iqxy = None
+        self.Iq = Iq = np.interp(self._q, self.q_calc[0], Iq_calc)
+        if self.resolution is not None:
+            Iq_res = np.interp(np.abs(self.resolution.q_calc), self._q, Iq)
+            Iq = self.resolution.apply(Iq_res)
+        return Iq
+
     def radial_profile(self, Iqxy):
         """
         Compute that radial profile for the given Iqxy grid.  The grid should
         be defined as for
         """
-        # circular average, no anti-aliasing
-        Iq = np.histogram(self._radius, bins=self._edges, weights=Iqxy)[0]/self._norm
+        # circular average, with anti-aliasing if requested
+        Iq = bin_sum(Iqxy, *self._bins)/self._norm
         return Iq
 
 
-def annular_average(qxy, Iqxy, qbins):
+def radial_bins(radius, edges, antialias=False):
+    """
+    Return the bin assignments of the pixels at *radius* for the bins with
+    the given *edges*, for use with :func:`bin_sum`.
+
+    Pixels are assigned to the bin containing them, with the last bin closed
+    as for *np.histogram*.  If *antialias* is True, each pixel is instead
+    shared between the two bins whose centres are on either side of it,
+    in proportion to its distance from each centre.  Pixels outside the
+    edges are dropped.
+
+    Returns *index* and *weight*, each with a row per bin that a pixel
+    contributes to, and *nbins*.
+    """
+    radius = np.asarray(radius).flatten()
+    nbins = len(edges) - 1
+    inside = (radius >= edges[0]) & (radius <= edges[-1])
+    if antialias:
+        centers = (edges[:-1] + edges[1:])/2
+        radius = np.clip(radius, centers[0], centers[-1])
+        lower = np.clip(np.searchsorted(centers, radius, side='right') - 1,
+                        0, max(nbins-2, 0))
+        upper = np.minimum(lower + 1, nbins - 1)
+        step = centers[upper] - centers[lower]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            frac = np.where(step > 0, (radius - centers[lower])/step, 0.)
+        index = np.vstack((lower, upper))
+        weight = np.vstack((1. - frac, frac)) * inside
+    else:
+        lower = np.searchsorted(edges, radius, side='right') - 1
+        lower[radius == edges[-1]] = nbins - 1
+        index = np.where(inside, lower, nbins)[None, :]
+        weight = inside[None, :].astype('d')
+    # Send pixels outside the edges to an extra bin which bin_sum discards.
+    index = np.where(weight > 0, index, nbins)
+    return index, weight, nbins
+
+def bin_sum(values, index, weight, nbins):
+    """
+    Return the weighted sum of *values* in each bin using the bin assignments
+    *index*, *weight*, *nbins* returned from :func:`radial_bins`.
+    """
+    values = np.broadcast_to(np.asarray(values, 'd').flatten(), weight.shape[1:])
+    total = np.zeros(nbins+1)
+    for index_k, weight_k in zip(index, weight):
+        total += np.bincount(index_k, weights=weight_k*values, minlength=nbins+1)
+    return total[:nbins]
+
+def annular_average(qxy, Iqxy, qbins, antialias=False):
     """
     Compute annular average of points in *Iqxy* at *qbins*.  The $q_x$, $q_y$
-    coordinates for *Iqxy* are given in *qxy*.
+    coordinates for *Iqxy* are given as radii in *qxy*.
+
+    The average is normalized by the number of pixels in each annulus rather
+    than by the area of the annulus.  Since the only pixels are those in the
+    detector box, this accounts for the chords of the annulus that lie
+    outside the box edges, and for the corners that are outside more than
+    one edge.  Bins with no pixels are returned as zero.
     """
-    qxy, Iqxy = qxy.flatten(), Iqxy.flatten()
-    index = np.argsort(qxy)
-    qxy, Iqxy = qxy[index], Iqxy[index]
-    print(qxy.shape, Iqxy.shape, index.shape, qbins.shape)
-    #values = rebin(np.vstack((0., qxy)), Iqxy, qbins)
-    integral = np.cumsum(Iqxy)
-    Io = np.diff(np.interp(qbins, qxy, integral, left=0.))
-    # normalize by area of annulus
-    # TODO: doesn't properly account for box.
-    # Need to chop off chords that are greater than the box edges
-    # (left, right, top and bottom), then add back in the corners
-    # chopped off by both. https://en.wikipedia.org/wiki/Circular_segment
-    norms = np.diff(pi*qbins**2)
-    return Io/norms
+    bins = radial_bins(qxy, qbins, antialias)
+    norm = bin_sum(1., *bins)
+    total = bin_sum(Iqxy, *bins)
+    return np.where(norm > 0, total/np.where(norm > 0, norm, 1.), 0.)
 
 def rebin(x, I, xo):
     """
@@ -682,5 +893,61 @@ def plotxy(q, Iq):
         data[Iq <= 0] = np.min(Iq[Iq > 0])/2
         pylab.imshow(np.log10(data))
 
+def test_hankel():
+    """
+    Check the 1D Hankel calculation against the 2D FFT calculation.
+    """
+    def lorentz_squared(q):
+        return 1/(1 + (200*q)**2)**2
+    p, coverage = 0.5, 0.99
+    kw = dict(qmax=0.1, nq=1024, probability=p, coverage=coverage,
+              dtype=np.dtype('d'))
+    fft2 = MultipleScattering(method="fft2", **kw)
+    hankel = MultipleScattering(method="hankel", **kw)
+    assert len(hankel.q_calc[0]) < len(fft2.q_calc[0])
+    Iq_fft2 = fft2.apply(lorentz_squared(fft2.q_calc[0]))
+    Iq_hankel = hankel.apply(lorentz_squared(hankel.q_calc[0]))
+    # Differences are dominated by the 2D pixelation, which shrinks as nq
+    # increases.  The Hankel result is already converged at nq=256.
+    assert np.allclose(Iq_hankel, Iq_fft2, rtol=0.05, atol=0)
+
+def test_radial_bins():
+    """
+    Check the precomputed radial bins against np.histogram.
+    """
+    q = np.linspace(-1, 1, 64)
+    qx, qy = np.meshgrid(q, q)
+    radius = np.sqrt(qx**2 + qy**2)
+    Iqxy = np.exp(-radius) + np.cos(5*qx)
+    edges = np.linspace(0.05, 1.2, 30)
+    target = (np.histogram(radius, bins=edges, weights=Iqxy)[0]
+              / np.histogram(radius, bins=edges)[0])
+    assert np.allclose(annular_average(radius, Iqxy, edges), target)
+    # Anti-aliasing moves intensity between bins but keeps the total.
+    index, weight, nbins = radial_bins(radius, edges, antialias=True)
+    inside = (radius >= edges[0]) & (radius <= edges[-1])
+    assert np.allclose(bin_sum(Iqxy, index, weight, nbins).sum(), Iqxy[inside].sum())
+    # A flat pattern averages to a constant even where annuli leave the box.
+    flat = annular_average(radius, np.ones_like(radius), edges, antialias=True)
+    assert np.allclose(flat, 1.)
+
+def test_numpy_calculator():
+    """
+    Check the real-FFT calculator against the complex FFT convolution.
+    """
+    nq, p = 64, 0.3
+    q = np.linspace(-0.5, 0.5, nq)
+    qx, qy = np.meshgrid(q, q)
+    Iq = 1/(1 + (100*qx)**2 + (300*qy)**2)
+    coeffs = scattering_coeffs(p)
+    scale = np.sum(Iq)
+    F = np.fft.fft2(_forward_shift(Iq/scale, dtype='d'))
+    frame = np.fft.ifft2(F*np.polyval(coeffs[::-1], F))
+    target = scale*_inverse_shift(frame.real, dtype='d')
+    calculator = NumpyCalculator(dims=(2*nq, 2*nq), dtype=np.dtype('d'))
+    for _ in range(2):  # second call reuses the buffers
+        actual = calculator.multiple_scattering(Iq, p)
+        assert np.allclose(actual, target, rtol=1e-10, atol=1e-14*scale)
+
 if __name__ == "__main__":
     main()
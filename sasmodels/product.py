@@ -9,23 +9,35 @@ and the module evaluator (with call, release, etc.).
 
 To use it, first load form factor P and structure factor S, then create
 *make_product_info(P, S)*.
+
+When P and S are both C models, :func:`generate.make_source` can compile
+the product info into a single fused kernel which computes P and multiplies
+by S in the same q loop.  This is used by default; set *FUSED* to False (or
+SAS_PRODUCT_FUSED=0 in the environment) to call P and S separately.
+
+The separate P and S kernels remember their most recent results, so a fit
+which only changes the S parameters doesn't recompute P, and vice versa.
+The fused kernel always computes P and S together, so it only remembers
+the effective radius and volume ratio computed from the P parameters.
 """
 from __future__ import print_function, division
 
+import os
 from copy import copy
 import numpy as np  # type: ignore
 
 from .modelinfo import ParameterTable, ModelInfo
-from .kernel import KernelModel, Kernel
+from .kernel import KernelModel, Kernel, make_shared_kernels
 from .details import make_details, dispersion_mesh
 
 # pylint: disable=unused-import
 try:
-    from typing import Tuple
+    from typing import Tuple, Any, List, Callable
 except ImportError:
     pass
 else:
     from .modelinfo import ParameterSet
+    from .details import CallDetails
 # pylint: enable=unused-import
 
 # TODO: make estimates available to constraints
@@ -37,6 +49,10 @@ else:
 ER_ID = "radius_effective"
 VF_ID = "volfraction"
 
+#: Evaluate C models P@S with a single fused kernel rather than calling P
+#: and S separately.  Set SAS_PRODUCT_FUSED=0 in the environment to disable.
+FUSED = os.environ.get("SAS_PRODUCT_FUSED", "1") != "0"
+
 # TODO: core_shell_sphere model has suppressed the volume ratio calculation
 # revert it after making VR and ER available at run time as constraints.
 def make_product_info(p_info, s_info):
@@ -94,7 +110,9 @@ def make_product_info(p_info, s_info):
     model_info.category = "custom"
     model_info.parameters = parameters
     model_info.random = random
-    #model_info.single = p_info.single and s_info.single
+    # Precision and platform for the fused kernel; the parts use their own.
+    model_info.single = p_info.single and s_info.single
+    model_info.opencl = p_info.opencl and s_info.opencl
     model_info.structure_factor = False
     model_info.variant_info = None
     #model_info.tests = []
@@ -141,9 +159,40 @@ def _tag_parameter(par):
     par.name = par.id + vector_length
     return par
 
+def can_fuse(model_info):
+    # type: (ModelInfo) -> bool
+    """
+    Return True if the product model can be evaluated as a single kernel.
+
+    Both P and S must be simple C models, and S can only be dispersed over
+    the effective radius, which is replaced by the value computed from P.
+    """
+    p_info, s_info = model_info.composition[1]
+    return (all(not callable(part.Iq) and part.composition is None
+                for part in (p_info, s_info))
+            and not any(p.polydisperse
+                        for p in s_info.parameters.kernel_parameters[1:]))
+
+def make_fused_parameters(p_info, s_info):
+    # type: (ModelInfo, ModelInfo) -> ParameterTable
+    """
+    Return the parameter table for the fused P@S kernel.
+
+    This is the product parameter table with the effective radius of S
+    restored ahead of the volume fraction so that the kernel has the
+    complete set of S parameters.  Only the P parameters are dispersed.
+    """
+    p_pars, s_pars = p_info.parameters, s_info.parameters
+    p_set = set(p.id for p in p_pars.kernel_parameters)
+    s_list = [(_tag_parameter(par) if par.id in p_set else par)
+              for par in s_pars.kernel_parameters]
+    parameters = ParameterTable(p_pars.kernel_parameters + s_list)
+    parameters.max_pd = p_pars.max_pd
+    return parameters
+
 class ProductModel(KernelModel):
-    def __init__(self, model_info, P, S):
-        # type: (ModelInfo, KernelModel, KernelModel) -> None
+    def __init__(self, model_info, P, S, fused=None):
+        # type: (ModelInfo, KernelModel, KernelModel, KernelModel) -> None
         #: Combined info plock for the product model
         self.info = model_info
         #: Form factor modelling individual particles.
@@ -158,17 +207,25 @@ class ProductModel(KernelModel):
         #: not critical (single is good enough for our purposes), so it just
         #: uses the precision of the form factor.
         self.dtype = P.dtype  # type: np.dtype
+        #: Single kernel computing P@S, as compiled from the product info,
+        #: or None if P and S are to be called separately.
+        self.fused = fused
 
     def make_kernel(self, q_vectors):
         # type: (List[np.ndarray]) -> Kernel
-        # Note: may be sending the q_vectors to the GPU twice even though they
-        # are only needed once.  It would mess up modularity quite a bit to
-        # handle this optimally, especially since there are many cases where
-        # separate q vectors are needed (e.g., form in python and structure
-        # in opencl; or both in opencl, but one in single precision and the
-        # other in double precision).
-        p_kernel = self.P.make_kernel(q_vectors)
-        s_kernel = self.S.make_kernel(q_vectors)
+        if self.fused is not None:
+            kernel = self.fused.make_kernel(q_vectors)
+            parts = lambda: self._make_product_kernel(q_vectors)
+            return FusedProductKernel(self.info, kernel, parts)
+        return self._make_product_kernel(q_vectors)
+
+    def _make_product_kernel(self, q_vectors):
+        # type: (List[np.ndarray]) -> "ProductKernel"
+        # P and S share the q input if they use the same kind of input.
+        # Separate inputs are still needed if, e.g., the form is in python
+        # and the structure in opencl, or both are in opencl but one is in
+        # single precision and the other in double precision.
+        p_kernel, s_kernel = make_shared_kernels([self.P, self.S], q_vectors)
         return ProductKernel(self.info, p_kernel, s_kernel)
 
     def release(self):
@@ -178,9 +235,21 @@ class ProductModel(KernelModel):
         """
         self.P.release()
         self.S.release()
+        if self.fused is not None:
+            self.fused.release()
 
 
 class ProductKernel(Kernel):
+    """
+    Evaluate P@S by calling the P and S kernels.
+
+    The most recent P and S results are remembered along with the values
+    used to compute them.  If a fit only changes S parameters then P is
+    not recomputed, and if it only changes P parameters that do not affect
+    the effective radius or volume ratio (such as SLDs) then S is not
+    recomputed.  This is only done for the separate kernels; see
+    :class:`FusedProductKernel`.
+    """
     def __init__(self, model_info, p_kernel, s_kernel):
         # type: (ModelInfo, Kernel, Kernel) -> None
         self.info = model_info
@@ -188,38 +257,35 @@ class ProductKernel(Kernel):
         self.s_kernel = s_kernel
         self.dtype = p_kernel.dtype
         self.results = []  # type: List[np.ndarray]
+        self._p_cache = (None, None)  # type: Tuple[Any, Tuple[np.ndarray, float, float]]
+        self._s_cache = (None, None)  # type: Tuple[Any, np.ndarray]
 
     def __call__(self, call_details, values, cutoff, magnetic):
         # type: (CallDetails, np.ndarray, float, bool) -> np.ndarray
         p_info, s_info = self.info.composition[1]
 
-        # if there are magnetic parameters, they will only be on the
-        # form factor P, not the structure factor S.
-        nmagnetic = len(self.info.parameters.magnetism_index)
-        if nmagnetic:
-            spin_index = self.info.parameters.npars + 2
-            magnetism = values[spin_index: spin_index+3+3*nmagnetic]
-        else:
-            magnetism = []
         nvalues = self.info.parameters.nvalues
         nweights = call_details.num_weights
         weights = values[nvalues:nvalues + 2*nweights]
 
         # Construct the calling parameters for P.
         p_npars = p_info.parameters.npars
-        p_length = call_details.length[:p_npars]
-        p_offset = call_details.offset[:p_npars]
-        p_details = make_details(p_info, p_length, p_offset, nweights)
-        # Set p scale to the volume fraction in s, which is the first of the
-        # 'S' parameters in the parameter list, or 2+np in 0-origin.
+        p_details, p_values = _form_factor_call(
+            self.info, call_details, values, self.p_kernel.dtype)
+        # P is scaled by the volume fraction in s, which is the first of the
+        # 'S' parameters in the parameter list, or 2+np in 0-origin.  Apply
+        # it after the call so that changing volfraction doesn't change P.
         volfrac = values[2+p_npars]
-        p_values = [[volfrac, 0.0], values[2:2+p_npars], magnetism, weights]
-        spacer = (32 - sum(len(v) for v in p_values)%32)%32
-        p_values.append([0.]*spacer)
-        p_values = np.hstack(p_values).astype(self.p_kernel.dtype)
 
-        # Call ER and VR for P since these are needed for S.
-        p_er, p_vr = calc_er_vr(p_info, p_details, p_values)
+        # Call P, and ER and VR for P since these are needed for S.
+        p_key = _form_factor_key(p_info, p_details, p_values, weights,
+                                 nweights, cutoff, magnetic)
+        if p_key != self._p_cache[0]:
+            p_er, p_vr = calc_er_vr(p_info, p_details, p_values)
+            p_unit = self.p_kernel(p_details, p_values, cutoff, magnetic)
+            self._p_cache = (p_key, (p_unit, p_er, p_vr))
+        p_unit, p_er, p_vr = self._p_cache[1]
+        p_result = volfrac*p_unit
         s_vr = (volfrac/p_vr if p_vr != 0. else volfrac)
         #print("volfrac:%g p_er:%g p_vr:%g s_vr:%g"%(volfrac,p_er,p_vr,s_vr))
 
@@ -233,10 +299,14 @@ class ProductKernel(Kernel):
         s_npars = s_info.parameters.npars-1
         s_length = call_details.length[p_npars:p_npars+s_npars]
         s_offset = call_details.offset[p_npars:p_npars+s_npars]
+        # The volume fraction is also computed, and it too needs to go into
+        # the weights vector since the kernel may use it as a dispersity
+        # loop, loading its value from the weights rather than the table.
         s_length = np.hstack((1, s_length))
-        s_offset = np.hstack((nweights, s_offset))
-        s_details = make_details(s_info, s_length, s_offset, nweights+1)
+        s_offset = np.hstack((nweights, nweights+1, s_offset[1:]))
+        s_details = make_details(s_info, s_length, s_offset, nweights+2)
         v, w = weights[:nweights], weights[nweights:]
+        s_weights = np.hstack((v, [p_er, s_vr], w, [1.0, 1.0]))
         s_values = [
             # scale=1, background=0, radius_effective=p_er, volfraction=s_vr
             [1., 0., p_er, s_vr],
@@ -246,16 +316,22 @@ class ProductKernel(Kernel):
             # parameter list.
             values[2+p_npars+1:2+p_npars+s_npars],
             # no magnetism parameters to include for S
-            # add er into the (value, weights) pairs
-            v, [p_er], w, [1.0]
+            # add er and volfraction into the (value, weights) pairs
+            s_weights,
         ]
         spacer = (32 - sum(len(v) for v in s_values)%32)%32
         s_values.append([0.]*spacer)
         s_values = np.hstack(s_values).astype(self.s_kernel.dtype)
 
-        # Call the kernels
-        p_result = self.p_kernel(p_details, p_values, cutoff, magnetic)
-        s_result = self.s_kernel(s_details, s_values, cutoff, False)
+        # Call S
+        s_key = (s_details.buffer.tobytes(),
+                 s_values[:2+s_info.parameters.npars].tobytes(),
+                 _weights_key(s_length, s_offset, s_weights, nweights+2),
+                 cutoff)
+        if s_key != self._s_cache[0]:
+            s_result = self.s_kernel(s_details, s_values, cutoff, False)
+            self._s_cache = (s_key, s_result)
+        s_result = self._s_cache[1]
 
         #print("p_npars",p_npars,s_npars,p_er,s_vr,values[2+p_npars+1:2+p_npars+s_npars])
         #call_details.show(values)
@@ -277,10 +353,179 @@ class ProductKernel(Kernel):
 
     def release(self):
         # type: () -> None
+        self._p_cache = self._s_cache = (None, None)
         self.p_kernel.release()
         self.s_kernel.release()
 
 
+class FusedProductKernel(Kernel):
+    """
+    Evaluate P@S with a single kernel.
+
+    The fused kernel runs the dispersity loop over P and multiplies by S at
+    each q in the same call.  The effective radius and volume ratio are
+    computed from P in python and passed to the kernel with the parameters.
+    They are remembered with the P parameters used to compute them, so
+    they are not recomputed when only the S parameters or the P parameters
+    which don't affect them change.  Since P and S are computed together,
+    the kernel itself is called for every change; the P and S results are
+    only reused by the separate kernels in :class:`ProductKernel`.
+
+    P and S are not available separately from the fused kernel, so
+    :attr:`results` evaluates them on request by calling the P and S
+    kernels with the most recent parameters.  Use :meth:`parts_kernel`
+    instead of the fused kernel to get P and S from the same evaluation
+    as I(q).
+    """
+    def __init__(self, model_info, kernel, parts):
+        # type: (ModelInfo, Kernel, Callable[[], ProductKernel]) -> None
+        p_info, s_info = model_info.composition[1]
+        self.info = model_info
+        self.kernel = kernel
+        self.dtype = kernel.dtype
+        self.dim = kernel.dim
+        # Info block for the fused parameter table, used for call details.
+        self._fused_info = copy(model_info)
+        self._fused_info.parameters = make_fused_parameters(p_info, s_info)
+        self._make_parts = parts
+        self._parts = None  # type: ProductKernel
+        self._last_call = None  # type: Tuple[CallDetails, np.ndarray, float, bool]
+        self._p_cache = (None, None)  # type: Tuple[Any, Tuple[float, float]]
+
+    def __call__(self, call_details, values, cutoff, magnetic):
+        # type: (CallDetails, np.ndarray, float, bool) -> np.ndarray
+        p_info, s_info = self.info.composition[1]
+        p_npars = p_info.parameters.npars
+        npars = self.info.parameters.npars
+        nvalues = self.info.parameters.nvalues
+        nweights = call_details.num_weights
+        weights = values[nvalues:nvalues + 2*nweights]
+
+        p_details, p_values = _form_factor_call(
+            self.info, call_details, values, self.dtype)
+        p_key = _form_factor_key(p_info, p_details, p_values, weights,
+                                 nweights, cutoff, magnetic)
+        if p_key != self._p_cache[0]:
+            self._p_cache = (p_key, calc_er_vr(p_info, p_details, p_values))
+        p_er, p_vr = self._p_cache[1]
+        volfrac = values[2+p_npars]
+        s_vr = (volfrac/p_vr if p_vr != 0. else volfrac)
+
+        # The effective radius goes back in ahead of the volume fraction.
+        # The kernel may load any parameter from the weights vector as one
+        # of its dispersity loops, so the computed radius and volume
+        # fraction for S are appended to it as (value, weight) pairs.  P
+        # is scaled by the volume fraction, which is folded into the
+        # overall scale.
+        length = np.hstack((call_details.length[:p_npars], 1,
+                            call_details.length[p_npars:]))
+        offset = np.hstack((call_details.offset[:p_npars], nweights,
+                            nweights+1, call_details.offset[p_npars+1:]))
+        details = make_details(self._fused_info, length, offset, nweights+2)
+        v, w = weights[:nweights], weights[nweights:]
+        fused_values = [
+            [values[0]*volfrac, values[1]],
+            values[2:2+p_npars],
+            [p_er, s_vr],
+            values[3+p_npars:2+npars],
+            values[2+npars:nvalues],  # magnetism, if any, is only on P
+            v, [p_er, s_vr], w, [1.0, 1.0],
+        ]
+        spacer = (32 - sum(len(v) for v in fused_values)%32)%32
+        fused_values.append([0.]*spacer)
+        fused_values = np.hstack(fused_values).astype(self.dtype)
+
+        self._last_call = (call_details, values, cutoff, magnetic)
+        return self.kernel(details, fused_values, cutoff, magnetic)
+
+    def parts_kernel(self):
+        # type: () -> ProductKernel
+        """
+        Return the kernel which calls P and S separately, sharing the q
+        input with the fused kernel.  Its *results* hold P and S from
+        its most recent call.
+        """
+        if self._parts is None:
+            self._parts = self._make_parts()
+        return self._parts
+
+    @property
+    def results(self):
+        # type: () -> List[np.ndarray]
+        """
+        P and S for the most recent call, computed on request.
+        """
+        if self._last_call is None:
+            return []
+        parts = self.parts_kernel()
+        parts(*self._last_call)
+        return parts.results
+
+    def release(self):
+        # type: () -> None
+        self._last_call = None
+        self._p_cache = (None, None)
+        if self._parts is not None:
+            self._parts.release()
+            self._parts = None
+        self.kernel.release()
+
+
+def _form_factor_call(model_info, call_details, values, dtype):
+    # type: (ModelInfo, CallDetails, np.ndarray, np.dtype) -> Tuple[CallDetails, np.ndarray]
+    """
+    Return the call details and values for P in the product *model_info*.
+
+    P is called with scale 1 and background 0.
+    """
+    p_info = model_info.composition[1][0]
+    p_npars = p_info.parameters.npars
+    # if there are magnetic parameters, they will only be on the
+    # form factor P, not the structure factor S.
+    nmagnetic = len(model_info.parameters.magnetism_index)
+    if nmagnetic:
+        spin_index = model_info.parameters.npars + 2
+        magnetism = values[spin_index: spin_index+3+3*nmagnetic]
+    else:
+        magnetism = []
+    nvalues = model_info.parameters.nvalues
+    nweights = call_details.num_weights
+    weights = values[nvalues:nvalues + 2*nweights]
+
+    p_length = call_details.length[:p_npars]
+    p_offset = call_details.offset[:p_npars]
+    p_details = make_details(p_info, p_length, p_offset, nweights)
+    p_values = [[1.0, 0.0], values[2:2+p_npars], magnetism, weights]
+    spacer = (32 - sum(len(v) for v in p_values)%32)%32
+    p_values.append([0.]*spacer)
+    p_values = np.hstack(p_values).astype(dtype)
+    return p_details, p_values
+
+def _form_factor_key(p_info, p_details, p_values, weights, nweights,
+                     cutoff, magnetic):
+    # type: (ModelInfo, CallDetails, np.ndarray, np.ndarray, int, float, bool) -> Tuple[Any, ...]
+    """
+    Return a key for the inputs to P in the product, which is used to
+    decide whether results computed from P need to be recomputed.
+    """
+    return (p_details.buffer.tobytes(),
+            p_values[:p_info.parameters.nvalues].tobytes(),
+            _weights_key(p_details.length, p_details.offset,
+                         weights, nweights),
+            cutoff, magnetic)
+
+def _weights_key(length, offset, weights, nweights):
+    # type: (np.ndarray, np.ndarray, np.ndarray, int) -> bytes
+    """
+    Return the (value, weight) pairs used by a kernel as bytes.
+
+    The weight vector is shared by all parts of the model, so compare only
+    the portions that the kernel uses when deciding whether to recompute.
+    """
+    v, w = weights[:nweights], weights[nweights:2*nweights]
+    return b"".join(v[k:k+n].tobytes() + w[k:k+n].tobytes()
+                    for k, n in zip(offset, length))
+
 def calc_er_vr(model_info, call_details, values):
     # type: (ModelInfo, ParameterSet) -> Tuple[float, float]
 
@@ -315,3 +560,126 @@ def calc_er_vr(model_info, call_details, values):
         volume_ratio = 1.0
 
     return radius_effective, volume_ratio
+
+
+def _build_separate(name):
+    """
+    Build product model *name* with separate P and S kernels.
+    """
+    global FUSED
+    from .core import load_model_info, build_model
+    saved, FUSED = FUSED, False
+    try:
+        return build_model(load_model_info(name), platform='dll')
+    finally:
+        FUSED = saved
+
+def test_shared_input():
+    """
+    Check that P and S share their q input and still give the right answer.
+    """
+    from .core import load_model_info, build_model
+    from .direct_model import call_kernel
+
+    q = np.logspace(-3, -1, 50)
+    p_info = load_model_info('sphere')
+    s_info = load_model_info('hardsphere')
+    model = _build_separate('sphere@hardsphere')
+    kernel = model.make_kernel([q])
+    assert kernel.p_kernel.q_input is kernel.s_kernel.q_input
+    pars = {'radius': 60., 'radius_effective': 60., 'volfraction': 0.2}
+    Iq = call_kernel(kernel, pars)
+
+    # The shared input survives until both kernels are released, even if
+    # one of them is released twice.
+    q_input = kernel.s_kernel.q_input
+    kernel.p_kernel.release()
+    kernel.p_kernel.release()
+    assert q_input.q is not None
+    kernel.s_kernel.release()
+    assert q_input.q is None
+
+    P = build_model(p_info, platform='dll').make_kernel([q])
+    S = build_model(s_info, platform='dll').make_kernel([q])
+    Pq = call_kernel(P, {'radius': 60., 'scale': 0.2, 'background': 0.})
+    Sq = call_kernel(S, {'radius_effective': 60., 'volfraction': 0.2,
+                         'background': 0.})
+    assert np.allclose(Iq, Pq*Sq + 0.001)
+
+
+def test_cached_results():
+    """
+    Check that P and S are only recomputed when their inputs change.
+    """
+    from .direct_model import call_kernel
+
+    class Counter(object):
+        def __init__(self, kernel):
+            self.kernel, self.calls = kernel, 0
+            self.dtype = kernel.dtype
+        def __call__(self, *args):
+            self.calls += 1
+            return self.kernel(*args)
+        def release(self):
+            self.kernel.release()
+
+    q = np.logspace(-3, -1, 50)
+    model = _build_separate('sphere@hardsphere')
+    kernel = model.make_kernel([q])
+    kernel.p_kernel = P = Counter(kernel.p_kernel)
+    kernel.s_kernel = S = Counter(kernel.s_kernel)
+    pars = {'radius': 60., 'volfraction': 0.2}
+    base = call_kernel(kernel, pars)
+    assert (P.calls, S.calls) == (1, 1)
+    # SLD changes P but not S
+    call_kernel(kernel, dict(pars, sld=2.))
+    assert (P.calls, S.calls) == (2, 1)
+    # volfraction changes S but not P
+    call_kernel(kernel, dict(pars, sld=2., volfraction=0.3))
+    assert (P.calls, S.calls) == (2, 2)
+    # radius changes both
+    call_kernel(kernel, dict(pars, radius=70.))
+    assert (P.calls, S.calls) == (3, 3)
+    # back to the start gives the same answer
+    assert np.allclose(call_kernel(kernel, pars), base)
+    kernel.release()
+
+
+def test_fused():
+    """
+    Check that the fused kernel matches separate P and S kernels.
+    """
+    global FUSED
+    from .core import load_model_info, build_model
+    from .direct_model import call_kernel
+
+    # vesicle has a volume ratio, so S sees volfraction/VR.
+    saved, FUSED = FUSED, True
+    try:
+        fused = build_model(load_model_info('vesicle@hardsphere'),
+                            platform='dll')
+    finally:
+        FUSED = saved
+    separate = _build_separate('vesicle@hardsphere')
+    assert fused.fused is not None and separate.fused is None
+
+    pars = {'radius': 60., 'radius_pd': 0.1, 'radius_pd_n': 5,
+            'volfraction_S': 0.2}
+    q = np.logspace(-3, -1, 50)
+    qx, qy = np.meshgrid(np.linspace(-0.1, 0.1, 7), np.linspace(-0.1, 0.1, 7))
+    for q_vectors in ([q], [qx.flatten(), qy.flatten()]):
+        kernel = fused.make_kernel(q_vectors)
+        target = separate.make_kernel(q_vectors)
+        assert np.allclose(call_kernel(kernel, pars), call_kernel(target, pars))
+        # P and S are computed on request.
+        assert kernel._parts is None
+        for part, expected in zip(kernel.results, target.results):
+            assert np.allclose(part, expected)
+        # ER and VR are only recomputed when P changes.
+        p_cache = kernel._p_cache
+        call_kernel(kernel, dict(pars, volfraction_S=0.3))
+        assert kernel._p_cache is p_cache
+        call_kernel(kernel, dict(pars, radius=70.))
+        assert kernel._p_cache is not p_cache
+        kernel.release()
+        target.release()
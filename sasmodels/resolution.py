@@ -410,12 +410,12 @@ def linear_extrapolation(q, q_min, q_max):
     q = np.sort(q)
     if q_min + 2*MINIMUM_RESOLUTION < q[0]:
         n_low = np.ceil((q[0]-q_min) / (q[1]-q[0])) if q[1] > q[0] else 15
-        q_low = np.linspace(q_min, q[0], n_low+1)[:-1]
+        q_low = np.linspace(q_min, q[0], int(n_low)+1)[:-1]
     else:
         q_low = []
     if q_max - 2*MINIMUM_RESOLUTION > q[-1]:
         n_high = np.ceil((q_max-q[-1]) / (q[-1]-q[-2])) if q[-1] > q[-2] else 15
-        q_high = np.linspace(q[-1], q_max, n_high+1)[1:]
+        q_high = np.linspace(q[-1], q_max, int(n_high)+1)[1:]
     else:
         q_high = []
     return np.concatenate([q_low, q, q_high])
@@ -463,12 +463,12 @@ def geometric_extrapolation(q, q_min, q_max, points_per_decade=None):
         if q_min < 0:
             q_min = q[0]*MINIMUM_ABSOLUTE_Q
         n_low = log_delta_q * (log(q[0])-log(q_min))
-        q_low = np.logspace(log10(q_min), log10(q[0]), np.ceil(n_low)+1)[:-1]
+        q_low = np.logspace(log10(q_min), log10(q[0]), int(np.ceil(n_low))+1)[:-1]
     else:
         q_low = []
     if q_max > q[-1]:
         n_high = log_delta_q * (log(q_max)-log(q[-1]))
-        q_high = np.logspace(log10(q[-1]), log10(q_max), np.ceil(n_high)+1)[1:]
+        q_high = np.logspace(log10(q[-1]), log10(q_max), int(np.ceil(n_high))+1)[1:]
     else:
         q_high = []
     return np.concatenate([q_low, q, q_high])
@@ -812,13 +812,18 @@ class IgorComparisonTest(unittest.TestCase):
         """
         Compare romberg integration for ellipsoid model.
         """
-        from .core import load_model
+        from .core import load_model_info, build_model
+        from .generate import set_integration_size
         pars = {
             'scale':0.05,
             'radius_polar':500, 'radius_equatorial':15000,
             'sld':6, 'sld_solvent': 1,
             }
-        form = load_model('ellipsoid', dtype='double')
+        # q*radius goes beyond the adaptive quadrature rules, so use the
+        # fixed 76 point rule that the tolerance was chosen for.
+        info = load_model_info('ellipsoid')
+        set_integration_size(info, 76)
+        form = build_model(info, dtype='double')
         q = np.logspace(log10(4e-5), log10(2.5e-2), 68)
         width, height = 0.117, 0.
         resolution = Slit1D(q, qx_width=width, qy_width=height)
@@ -78,21 +78,86 @@ class Pinhole2D(Resolution):
             ## Remove singular points if exists
             self.dqx_data[self.dqx_data < SIGMA_ZERO] = SIGMA_ZERO
             self.dqy_data[self.dqy_data < SIGMA_ZERO] = SIGMA_ZERO
-            qx_calc, qy_calc, weights = self._calc_res()
-            self.q_calc = [qx_calc, qy_calc]
-            self.q_calc_weights = weights
+            self.q_calc_weights = self._calc_weights()
+            # q_calc is oversampled nr*nphi times, so delay computing it
+            # until it is needed.
+            self._q_calc = None
         else:
             # No resolution information
             self.dqx_data = self.dqy_data = None
-            self.q_calc = [self.qx_data, self.qy_data]
             self.q_calc_weights = None
+            self._q_calc = [self.qx_data, self.qy_data]
 
         #self.phi_data = np.arctan(self.qx_data / self.qy_data)
 
+    @property
+    def q_calc(self):
+        """
+        The *[qx, qy]* points to calculate, with the over sampled points
+        for all data points in bin order.
+        """
+        if self._q_calc is None:
+            self._q_calc = list(self._calc_res())
+        return self._q_calc
+
+    @q_calc.setter
+    def q_calc(self, value):
+        self._q_calc = value
+
+    @property
+    def oversampling(self):
+        """
+        Number of calculated points for each data point.
+        """
+        return 1 if self.q_calc_weights is None else self.nr * self.nphi
+
+    def subset(self, start, stop):
+        """
+        Return the resolution for data points *start* to *stop*.
+
+        The subset computes its own *q_calc* and applies to its own part
+        of the theory, so a large detector can be evaluated in pieces
+        without holding the over sampled *q* for every pixel at once.
+        """
+        part = Pinhole2D.__new__(Pinhole2D)
+        part.nr, part.nphi = self.nr, self.nphi
+        part.nsigma, part.coords = self.nsigma, self.coords
+        part.data, part.index = self.data, None
+        part.qx_data = self.qx_data[start:stop]
+        part.qy_data = self.qy_data[start:stop]
+        part.q_data = self.q_data[start:stop]
+        part.q_calc_weights = self.q_calc_weights
+        if self.q_calc_weights is not None:
+            part.dqx_data = self.dqx_data[start:stop]
+            part.dqy_data = self.dqy_data[start:stop]
+            part._q_calc = None
+        else:
+            part.dqx_data = part.dqy_data = None
+            part._q_calc = [part.qx_data, part.qy_data]
+        return part
+
+    def _calc_weights(self):
+        """
+        Gaussian weights for the nr by nphi over sampled bins.
+        """
+        nr, nphi = self.nr, self.nphi
+        bin_size = self.nsigma / nr
+        r = bin_size / 2.0 + np.arange(nr) * bin_size
+        ## Find Gaussian weight for each dq bins: The weight depends only
+        #  on r-direction (The integration may not need)
+        weight_res = (np.exp(-0.5 * (r - bin_size / 2.0)**2)  -
+                      np.exp(-0.5 * (r + bin_size / 2.0)**2))
+        # No needs of normalization here.
+        #weight_res /= np.sum(weight_res)
+        weight_res = weight_res.repeat(nphi).reshape(nr, nphi)
+        weight_res = weight_res.transpose().flatten()
+        return weight_res
+
     def _calc_res(self):
         """
-        Over sampling of r_nbins times phi_nbins, calculate Gaussian weights,
-        then find smeared intensity
+        Over sampling of r_nbins times phi_nbins, returning the *qx*, *qy*
+        points to calculate.  The Gaussian weights for the smeared
+        intensity come from :meth:`_calc_weights`.
         """
         nr, nphi = self.nr, self.nphi
         # Total number of bins = # of bins
@@ -126,14 +191,6 @@ class Pinhole2D(Resolution):
         # The angle (phi) of the original q point
         q_phi = np.arctan(q_phi).repeat(nbins)\
             .reshape([nq, nbins]).transpose().flatten()
-        ## Find Gaussian weight for each dq bins: The weight depends only
-        #  on r-direction (The integration may not need)
-        weight_res = (np.exp(-0.5 * (r - bin_size / 2.0)**2)  -
-                      np.exp(-0.5 * (r + bin_size / 2.0)**2))
-        # No needs of normalization here.
-        #weight_res /= np.sum(weight_res)
-        weight_res = weight_res.repeat(nphi).reshape(nr, nphi)
-        weight_res = weight_res.transpose().flatten()
 
         ## Set dr for all dq bins for averaging
         dr = r.repeat(nphi).reshape(nr, nphi).transpose().flatten()
@@ -157,8 +214,7 @@ class Pinhole2D(Resolution):
             qx_res = qx + dqx*cos(dphi)
             qy_res = qy + dqy*sin(dphi)
 
-
-        return qx_res, qy_res, weight_res
+        return qx_res, qy_res
 
     def apply(self, theory):
         if self.q_calc_weights is not None:
@@ -13,12 +13,10 @@ import math
 from copy import deepcopy
 import collections
 import traceback
+import warnings
 import logging
 from os.path import basename, splitext, abspath, getmtime
-try:
-    import _thread as thread
-except ImportError:
-    import thread
+import threading
 
 import numpy as np  # type: ignore
 
@@ -28,14 +26,16 @@ from . import product
 from . import generate
 from . import weights
 from . import modelinfo
+from . import instrument
 from .details import make_kernel_args, dispersion_mesh
+from .kernel import q_vectors_key
 
 # pylint: disable=unused-import
 try:
     from typing import (Dict, Mapping, Any, Sequence, Tuple, NamedTuple,
-                        List, Optional, Union, Callable)
+                        List, Optional, Union, Callable, Iterator)
     from .modelinfo import ModelInfo, Parameter
-    from .kernel import KernelModel
+    from .kernel import KernelModel, Kernel
     MultiplicityInfoType = NamedTuple(
         'MultiplicityInfo',
         [("number", int), ("control", str), ("choices", List[str]),
@@ -47,7 +47,9 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
-calculation_lock = thread.allocate_lock()
+#: Kept for code which imports it.  Calculations are no longer serialized
+#: across models; each model has its own lock (see :class:`KernelCache`).
+calculation_lock = threading.Lock()
 
 #: True if pre-existing plugins, with the old names and parameters, should
 #: continue to be supported.
@@ -59,6 +61,22 @@ MultiplicityInfo = collections.namedtuple(
     ["number", "control", "choices", "x_axis_label"],
 )
 
+#: Return value from :meth:`SasviewModel.calculate_Iq` with *full_output*.
+#: *Iq* is the calculated I(q).  *parts* holds the intermediate results
+#: from the same calculation, which are [P, S] for product models and
+#: the individual parts for mixture models, or None for simple models.
+IqResult = collections.namedtuple('IqResult', ['Iq', 'parts'])
+
+#: Number of kernels each model keeps for recently used q vectors.  Reusing
+#: a kernel avoids copying q to the device and allocating result buffers
+#: on every call.  The most recent kernel is always kept.
+KERNEL_CACHE_SIZE = 4
+
+#: Default number of q points to calculate at once when evaluating in pieces
+#: with :meth:`SasviewModel.iter_Iq` or *chunk_size* in
+#: :meth:`SasviewModel.evalDistribution`.
+CHUNK_SIZE = 2**20
+
 #: set of defined models (standard and custom)
 MODELS = {}  # type: Dict[str, SasviewModelType]
 #: custom model {path: model} mapping so we can check timestamps
@@ -175,6 +193,67 @@ def _make_standard_model(name):
     return make_model_from_info(model_info)
 
 
+class KernelCache(object):
+    """
+    Kernels of a model for recently used q vectors, keyed by a hash of q.
+
+    Kernels are released when they are evicted, which is in least recently
+    used order once there are more than *size*, or when :meth:`clear` is
+    called.  Copies of the cache are empty, so a cloned or pickled model
+    builds its own kernels.
+
+    The kernels hold the mutable state of a calculation, such as the result
+    buffers, so calculations using them are serialized by *lock*.  Different
+    models have different caches, and so can be evaluated in parallel.
+    """
+    def __init__(self, size=None):
+        # type: (Optional[int]) -> None
+        self.size = KERNEL_CACHE_SIZE if size is None else size
+        self.lock = threading.Lock()
+        self._kernels = collections.OrderedDict()  # type: Dict[Any, Kernel]
+
+    def get(self, model, q_vectors):
+        # type: (KernelModel, List[np.ndarray]) -> Kernel
+        """
+        Return a kernel for *model* at *q_vectors*, creating it if needed.
+        """
+        key = q_vectors_key(q_vectors)
+        kernel = self._kernels.pop(key, None)
+        if kernel is None:
+            kernel = model.make_kernel(q_vectors)
+        # Reinsert at the end to mark it as most recently used.
+        self._kernels[key] = kernel
+        while len(self._kernels) > max(self.size, 1):
+            _, old = self._kernels.popitem(last=False)
+            old.release()
+        return kernel
+
+    def clear(self):
+        # type: () -> None
+        """
+        Release all cached kernels.
+        """
+        with self.lock:
+            while self._kernels:
+                _, kernel = self._kernels.popitem()
+                kernel.release()
+
+    def __len__(self):
+        # type: () -> int
+        return len(self._kernels)
+
+    def __deepcopy__(self, memo):
+        # type: (Dict[int, Any]) -> "KernelCache"
+        return KernelCache(self.size)
+
+    def __getstate__(self):
+        # type: () -> Dict[str, Any]
+        return {'size': self.size}
+
+    def __setstate__(self, state):
+        # type: (Dict[str, Any]) -> None
+        self.__init__(state['size'])
+
 def _register_old_models():
     # type: () -> None
     """
@@ -373,6 +452,8 @@ class SasviewModel(object):
             self._model_info.parameters.defaults['background'] = 0.
 
         self._persistency_dict = {}
+        self._kernel_cache = KernelCache()
+        self._last_parts = None  # type: Optional[List[np.ndarray]]
         self.params = collections.OrderedDict()
         self.dispersion = collections.OrderedDict()
         self.details = {}
@@ -405,6 +486,7 @@ class SasviewModel(object):
         # type: (Dict[str, Any]) -> None
         self.__dict__ = state
         self._model = None
+        self._kernel_cache = KernelCache()
 
     def __str__(self):
         # type: () -> str
@@ -413,6 +495,13 @@ class SasviewModel(object):
         """
         return self.name
 
+    def clear_kernel_cache(self):
+        # type: () -> None
+        """
+        Release the kernels kept for recently evaluated q vectors.
+        """
+        self._kernel_cache.clear()
+
     def is_fittable(self, par_name):
         # type: (str) -> bool
         """
@@ -560,8 +649,8 @@ class SasviewModel(object):
         else:
             return self.calculate_Iq([x])[0]
 
-    def evalDistribution(self, qdist):
-        # type: (Union[np.ndarray, Tuple[np.ndarray, np.ndarray], List[np.ndarray]]) -> np.ndarray
+    def evalDistribution(self, qdist, out=None, chunk_size=None):
+        # type: (Union[np.ndarray, Tuple[np.ndarray, np.ndarray], List[np.ndarray]], Optional[np.ndarray], Optional[int]) -> np.ndarray
         r"""
         Evaluate a distribution of q-values.
 
@@ -588,90 +677,129 @@ class SasviewModel(object):
 
             q = \sqrt{q_x^2+q_y^2}
 
+        For very large q sets, such as the pixels of a 2D detector, use
+        *chunk_size* and/or *out* to calculate the result in pieces of at
+        most *chunk_size* points (default *CHUNK_SIZE*) and store it into
+        *out*, which can be a :class:`numpy.memmap`.  Memory use is then
+        independent of the number of q points.  The kernels for the pieces
+        are not kept.
         """
         if isinstance(qdist, (list, tuple)):
             # Check whether we have a list of ndarrays [qx,qy]
             qx, qy = qdist
-            return self.calculate_Iq(qx, qy)
-
         elif isinstance(qdist, np.ndarray):
             # We have a simple 1D distribution of q-values
-            return self.calculate_Iq(qdist)
-
+            qx, qy = qdist, None
         else:
             raise TypeError("evalDistribution expects q or [qx, qy], not %r"
                             % type(qdist))
 
+        if out is None and chunk_size is None:
+            return self.calculate_Iq(qx, qy)
+        if out is None:
+            out = np.empty(len(qx), 'd')
+        for index, Iq in self.iter_Iq(qx, qy, chunk_size=chunk_size):
+            out[index] = Iq
+        return out
+
+    def iter_Iq(self, qx, qy=None, chunk_size=None):
+        # type: (Sequence[float], Optional[Sequence[float]], Optional[int]) -> Iterator[Tuple[slice, np.ndarray]]
+        """
+        Yield *(index, Iq)* for successive pieces of *q*, or of *qx*, *qy*
+        for 2D, with at most *chunk_size* points (default *CHUNK_SIZE*)
+        calculated at once.
+
+        The parameters are read once at the start, so changing them while
+        iterating does not affect the remaining pieces.
+        """
+        if self._model is None:
+            with self._kernel_cache.lock:
+                if self._model is None:
+                    self._model = core.build_model(self._model_info)
+        chunk_size = chunk_size or CHUNK_SIZE
+        parameters = self._model_info.parameters
+        pairs = [self._get_weights(p) for p in parameters.call_parameters]
+        n = len(qx)
+        for start in range(0, n, chunk_size):
+            index = slice(start, min(start + chunk_size, n))
+            if qy is not None:
+                q_vectors = [np.asarray(qx[index]), np.asarray(qy[index])]
+            else:
+                q_vectors = [np.asarray(qx[index])]
+            with self._kernel_cache.lock:
+                calculator = self._model.make_kernel(q_vectors)
+                try:
+                    call_details, values, is_magnetic = make_kernel_args(
+                        calculator, pairs)
+                    Iq = calculator(call_details, values, cutoff=self.cutoff,
+                                    magnetic=is_magnetic)
+                finally:
+                    calculator.release()
+            yield index, Iq
+
     def calc_composition_models(self, qx):
         """
         returns parts of the composition model or None if not a composition
         model.
+
+        This evaluates the model again.  Use :meth:`calculate_Iq` with
+        *full_output=True* to get the parts along with I(q) from a single
+        evaluation.
         """
-        # TODO: have calculate_Iq return the intermediates.
-        #
-        # The current interface causes calculate_Iq() to be called twice,
-        # once to get the combined result and again to get the intermediate
-        # results.  This is necessary for now.
-        # Long term, the solution is to change the interface to calculate_Iq
-        # so that it returns a results object containing all the bits:
-        #     the A, B, C, ... of the composition model (and any subcomponents?)
-        #     the P and S of the product model,
-        #     the combined model before resolution smearing,
-        #     the sasmodel before sesans conversion,
-        #     the oriented 2D model used to fit oriented usans data,
-        #     the final I(q),
-        #     ...
-        #
-        # Have the model calculator add all of these blindly to the data
-        # tree, and update the graphs which contain them.  The fitter
-        # needs to be updated to use the I(q) value only, ignoring the rest.
-        #
-        # The simple fix of returning the existing intermediate results
-        # will not work for a couple of reasons: (1) another thread may
-        # sneak in to compute its own results before calc_composition_models
-        # is called, and (2) calculate_Iq is currently called three times:
-        # once with q, once with q values before qmin and once with q values
-        # after q max.  Both of these should be addressed before
-        # replacing this code.
         composition = self._model_info.composition
         if composition and composition[0] == 'product': # only P*S for now
-            with calculation_lock:
-                self._calculate_Iq(qx)
-                return self._intermediate_results
+            return self.calculate_Iq(qx, full_output=True).parts
         else:
             return None
 
-    def calculate_Iq(self, qx, qy=None):
-        # type: (Sequence[float], Optional[Sequence[float]]) -> np.ndarray
+    def calculate_Iq(self, qx, qy=None, full_output=False):
+        # type: (Sequence[float], Optional[Sequence[float]], bool) -> Union[np.ndarray, IqResult]
         """
         Calculate Iq for one set of q with the current parameters.
 
         If the model is 1D, use *q*.  If 2D, use *qx*, *qy*.
 
-        This should NOT be used for fitting since it copies the *q* vectors
-        to the card for each evaluation.
+        If *full_output* is True, return an :class:`IqResult` containing
+        I(q) and the intermediate results from the same calculation, such
+        as P and S for a product model or the parts of a mixture model.
+
+        The kernel for *q* is kept for the next call with the same q
+        vectors, up to *KERNEL_CACHE_SIZE* q vectors per model.  Use
+        :meth:`clear_kernel_cache` to release them.
         """
         ## uncomment the following when trying to debug the uncoordinated calls
         ## to calculate_Iq
-        #if calculation_lock.locked():
+        #if self._kernel_cache.lock.locked():
         #    logger.info("calculation waiting for another thread to complete")
         #    logger.info("\n".join(traceback.format_stack()))
 
-        with calculation_lock:
-            return self._calculate_Iq(qx, qy)
+        with self._kernel_cache.lock:
+            result = self._calculate_Iq(qx, qy, full_output=full_output)
+        return result if full_output else result.Iq
 
-    def _calculate_Iq(self, qx, qy=None):
+    def _calculate_Iq(self, qx, qy=None, full_output=False):
+        # type: (Sequence[float], Optional[Sequence[float]], bool) -> IqResult
         if self._model is None:
             self._model = core.build_model(self._model_info)
         if qy is not None:
             q_vectors = [np.asarray(qx), np.asarray(qy)]
         else:
             q_vectors = [np.asarray(qx)]
-        calculator = self._model.make_kernel(q_vectors)
+        calculator = self._kernel_cache.get(self._model, q_vectors)
+        if full_output and hasattr(calculator, 'parts_kernel'):
+            # The fused product kernel does not return P and S, so call them
+            # separately and get all three from the same evaluation.
+            calculator = calculator.parts_kernel()
+        instrumented = instrument.ENABLED
+        if instrumented:
+            start_time = instrument.clock()
         parameters = self._model_info.parameters
         pairs = [self._get_weights(p) for p in parameters.call_parameters]
         #weights.plot_weights(self._model_info, pairs)
         call_details, values, is_magnetic = make_kernel_args(calculator, pairs)
+        if instrumented:
+            instrument.add_time(calculator, 'args',
+                                instrument.clock()-start_time)
         #call_details.show()
         #print("================ parameters ==================")
         #for p, v in zip(parameters.call_parameters, pairs): print(p.name, v[0])
@@ -683,10 +811,28 @@ class SasviewModel(object):
         result = calculator(call_details, values, cutoff=self.cutoff,
                             magnetic=is_magnetic)
         #print("result", result)
-        self._intermediate_results = getattr(calculator, 'results', None)
-        calculator.release()
-        #self._model.release()
-        return result
+        # Intermediate results are only collected when asked.  They are
+        # returned with the result rather than stored on the model so that
+        # another thread can't replace them before they are used.
+        parts = getattr(calculator, 'results', None) if full_output else None
+        if full_output:
+            self._last_parts = parts
+        return IqResult(result, parts)
+
+    @property
+    def _intermediate_results(self):
+        # type: () -> Optional[List[np.ndarray]]
+        """
+        Parts from the most recent :meth:`calc_composition_models` or
+        :meth:`calculate_Iq` with *full_output*.
+
+        Deprecated: use *calculate_Iq(q, full_output=True).parts* instead,
+        which can't be replaced by a calculation in another thread.
+        """
+        warnings.warn("_intermediate_results is deprecated; use"
+                      " calculate_Iq(q, full_output=True).parts",
+                      DeprecationWarning, stacklevel=2)
+        return self._last_parts
 
     def calculate_ER(self):
         # type: () -> float
@@ -819,6 +965,116 @@ def test_product():
     if np.isnan(value):
         raise ValueError("cylinder*hatyer_msa returns null")
 
+def test_full_output():
+    # type: () -> None
+    """
+    Test that calculate_Iq returns the product parts with I(q).
+    """
+    S = _make_standard_model('hardsphere')()
+    P = _make_standard_model('sphere')()
+    model = MultiplicationModel(P, S)
+    q = np.logspace(-3, -1, 20)
+    result = model.calculate_Iq(q, full_output=True)
+    assert np.allclose(result.Iq, model.calculate_Iq(q))
+    Pq, Sq = result.parts
+    assert np.allclose(result.Iq, model.getParam('scale')*Pq*Sq
+                       + model.getParam('background'))
+    for part, expected in zip(model.calc_composition_models(q), result.parts):
+        assert np.allclose(part, expected)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', DeprecationWarning)
+        for part, expected in zip(model._intermediate_results, result.parts):
+            assert np.allclose(part, expected)
+    assert P.calculate_Iq(q, full_output=True).parts is None
+
+    # P and S come from the same evaluation as I(q), even for the fused
+    # product kernel.
+    model.setParam('radius', model.getParam('radius') + 1.)
+    with instrument.collect() as stats:
+        model.calculate_Iq(q, full_output=True)
+    calls = dict((entry.model, entry.calls) for entry in stats if entry.calls)
+    assert calls == {'sphere': 1, 'hardsphere': 1}, calls
+
+def test_chunked():
+    # type: () -> None
+    """
+    Test that evaluating in pieces matches evaluating all at once.
+    """
+    model = _make_standard_model('cylinder')()
+    model.setParam('theta', 30.)
+    q = np.linspace(0.001, 0.2, 1001)
+    target = model.evalDistribution(q)
+    assert np.allclose(model.evalDistribution(q, chunk_size=100), target)
+    out = np.zeros_like(q)
+    result = model.evalDistribution(q, out=out, chunk_size=333)
+    assert result is out and np.allclose(out, target)
+    qx, qy = q, q[::-1]
+    target = model.evalDistribution([qx, qy])
+    pieces = list(model.iter_Iq(qx, qy, chunk_size=250))
+    assert len(pieces) == 5
+    assert np.allclose(np.hstack([Iq for _, Iq in pieces]), target)
+    # The kernels for the pieces are not cached
+    assert len(model._kernel_cache) == 2
+
+def test_kernel_cache():
+    # type: () -> None
+    """
+    Test that kernels are reused for the same q and evicted when old.
+    """
+    model = _make_standard_model('sphere')()
+    q = np.logspace(-3, -1, 20)
+    cache = model._kernel_cache
+    target = model.evalDistribution(q)
+    kernel = cache.get(model._model, [q])
+    assert len(cache) == 1
+    assert np.allclose(model.evalDistribution(q.copy()), target)
+    assert cache.get(model._model, [q]) is kernel
+    for k in range(KERNEL_CACHE_SIZE):
+        model.evalDistribution(q*(k+2))
+    assert len(cache) == KERNEL_CACHE_SIZE
+    assert kernel not in cache._kernels.values()
+    # copies start with an empty cache
+    assert len(model.clone()._kernel_cache) == 0
+    model.clear_kernel_cache()
+    assert len(cache) == 0
+
+def test_threads():
+    # type: () -> None
+    """
+    Test that models can be evaluated concurrently in different threads.
+    """
+    names = ['sphere', 'cylinder', 'core_shell_sphere', 'sphere@hardsphere']
+    nthreads, repeats = 8, 5
+    q = np.logspace(-3, -1, 200)
+    def make(name):
+        if '@' in name:
+            P, S = [_make_standard_model(part)() for part in name.split('@')]
+            return MultiplicationModel(P, S)
+        return _make_standard_model(name)()
+    models = [make(names[k%len(names)]) for k in range(nthreads)]
+    # Each model has its own cache and lock, so they don't block each other.
+    assert len(set(id(m._kernel_cache.lock) for m in models)) == nthreads
+    expected = [model.evalDistribution(q) for model in models]
+    # One extra thread shares a model with another thread.
+    models.append(models[0])
+    expected.append(expected[0])
+
+    errors = []
+    def run(model, target):
+        try:
+            for _ in range(repeats):
+                model.evalDistribution(q)
+                assert np.allclose(model.evalDistribution(q), target)
+        except Exception as exc:  # pylint: disable=broad-except
+            errors.append(exc)
+    threads = [threading.Thread(target=run, args=pair)
+               for pair in zip(models, expected)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors, errors
+
 def test_rpa():
     # type: () -> float
     """
@@ -11,9 +11,49 @@ Wim Bouwman (w.g.bouwman@tudelft.nl), June 2013
 
 from __future__ import division
 
+import os
+from os.path import join as joinpath, exists, getmtime, getsize
+import hashlib
+import tempfile
+import logging
+
 import numpy as np  # type: ignore
 from numpy import pi  # type: ignore
-from scipy.special import j0
+from scipy.special import j0, loggamma
+
+# pylint: disable=unused-import
+try:
+    from typing import Tuple, Dict, List, Optional
+except ImportError:
+    pass
+# pylint: enable=unused-import
+
+logger = logging.getLogger(__name__)
+
+#: Largest dense Hankel matrix (number of elements) that will be built when
+#: the transform method is "auto".  Anything bigger uses the log-spaced fast
+#: Hankel transform instead.  The default is 256 MB of float32 values.
+MAX_DENSE_SIZE = 2**26
+
+#: Number of matrix elements to compute at a time when filling the dense
+#: Hankel matrix.  This bounds the size of the temporaries.
+CHUNK_SIZE = 2**20
+
+#: Directory holding the cached dense Hankel matrices.  Set SAS_SESANS_CACHE
+#: in the environment to use a different directory, or to "none" to turn
+#: off the cache.
+CACHE_PATH = os.environ.get('SAS_SESANS_CACHE', "")
+if not CACHE_PATH:
+    CACHE_PATH = joinpath(os.path.expanduser("~"), ".sasmodels", "sesans_cache")
+elif CACHE_PATH.lower() == "none":
+    CACHE_PATH = ""
+
+#: Total size in bytes of the cached matrices.  The least recently used
+#: matrices are removed from the cache when it grows beyond this size.
+CACHE_SIZE = 2**30
+
+# Bump this when the dense transform changes so old cache entries are ignored.
+_CACHE_VERSION = 1
 
 class SesansTransform(object):
     """
@@ -28,6 +68,18 @@ class SesansTransform(object):
 
     *Rmax* (A) is the maximum size sensitivity; larger radius requires more
     computation time.
+
+    *method* is "dense" to build the full Hankel matrix on a linear *q* grid,
+    "fftlog" to use a fast Hankel transform on a log-spaced *q* grid, or
+    "auto" to use the dense matrix unless it would have more than
+    :data:`MAX_DENSE_SIZE` elements.  The dense matrix is the reference
+    calculation; the fast transform needs far fewer *q* points and memory
+    proportional to the number of *q* points rather than *q* times *SElength*.
+
+    If *cache* is True then the dense matrix is saved in :data:`CACHE_PATH`,
+    keyed by *SElength*, *lam*, *zaccept* and *Rmax*, and memory-mapped from
+    there when the same measurement geometry is seen again.  The fast
+    transform is cheap to build, so it is never cached.
     """
     #: SElength from the data in the original data units; not used by transform
     #: but the GUI uses it, so make sure that it is present.
@@ -36,18 +88,36 @@ class SesansTransform(object):
     #: q values to calculate when computing transform
     q_calc = None  # type: np.ndarray
 
+    #: transform method used, either "dense" or "fftlog"
+    method = None  # type: str
+
     # transform arrays
     _H = None  # type: np.ndarray
     _H0 = None # type: np.ndarray
 
-    def __init__(self, z, SElength, lam, zaccept, Rmax):
-        # type: (np.ndarray, float, float) -> None
+    def __init__(self, z, SElength, lam, zaccept, Rmax, method="auto",
+                 cache=False):
+        # type: (np.ndarray, np.ndarray, np.ndarray, float, float, str, bool) -> None
         #import logging; logging.info("creating SESANS transform")
         self.q = z
-        self._set_hankel(SElength, lam, zaccept, Rmax)
+        if method == "auto":
+            nq = _dense_q_size(SElength)
+            method = "dense" if nq*np.size(SElength) <= MAX_DENSE_SIZE else "fftlog"
+        if method == "dense":
+            if cache and CACHE_PATH:
+                self._load_hankel(SElength, lam, zaccept, Rmax)
+            else:
+                self._set_hankel(SElength, lam, zaccept, Rmax)
+        elif method == "fftlog":
+            self._set_fftlog(SElength, lam, zaccept, Rmax)
+        else:
+            raise ValueError("unknown SESANS transform method %r"%method)
+        self.method = method
 
     def apply(self, Iq):
         # tye: (np.ndarray) -> np.ndarray
+        if self.method == "fftlog":
+            return self._apply_fftlog(Iq)
         G0 = np.dot(self._H0, Iq)
         G = np.dot(self._H.T, Iq)
         P = G - G0
@@ -57,6 +127,7 @@ class SesansTransform(object):
         # type: (np.ndarray, float, float) -> None
         # Force float32 arrays, otherwise run into memory problems on some machines
         SElength = np.asarray(SElength, dtype='float32')
+        lam, zaccept = _broadcast_acceptance(SElength, lam, zaccept)
 
         #Rmax = #value in text box somewhere in FitPage?
         q_max = 2*pi / (SElength[1] - SElength[0])
@@ -66,14 +137,293 @@ class SesansTransform(object):
 
         H0 = np.float32(dq/(2*pi)) * q
 
-        repq = np.tile(q, (SElength.size, 1)).T
-        repSE = np.tile(SElength, (q.size, 1))
-        H = np.float32(dq/(2*pi)) * j0(repSE*repq) * repq
-
-        replam = np.tile(lam, (q.size, 1))
-        reptheta = np.arcsin(repq*replam/2*np.pi)
-        mask = reptheta > zaccept
-        H[mask] = 0
+        # Fill in the matrix a block of q values at a time rather than
+        # tiling q and SElength into full size temporaries.
+        H = np.empty((q.size, SElength.size), dtype='float32')
+        step = max(CHUNK_SIZE//SElength.size, 1)
+        for start in range(0, q.size, step):
+            qk = q[start:start+step, None]
+            Hk = np.float32(dq/(2*pi)) * j0(SElength*qk) * qk
+            Hk[_acceptance_mask(qk, lam, zaccept)] = 0
+            H[start:start+step] = Hk
 
         self.q_calc = q
         self._H, self._H0 = H, H0
+
+    def _load_hankel(self, SElength, lam, zaccept, Rmax):
+        # type: (np.ndarray, float, float) -> None
+        SElength = np.asarray(SElength, dtype='float32')
+        lam, zaccept = _broadcast_acceptance(SElength, lam, zaccept)
+        key = hashlib.sha1()
+        key.update(("v%d %r"%(_CACHE_VERSION, float(Rmax))).encode('ascii'))
+        for v in (SElength, lam, zaccept):
+            key.update(np.ascontiguousarray(v).tobytes())
+        basename = joinpath(CACHE_PATH, "hankel_" + key.hexdigest())
+        parts = ("_H", "_H0", "q_calc")
+        try:
+            loaded = [np.load(basename + part + ".npy", mmap_mode='r')
+                      for part in parts]
+        except (IOError, OSError, ValueError):
+            pass
+        else:
+            self._H, self._H0, self.q_calc = loaded
+            try:
+                os.utime(basename + "q_calc.npy", None)  # mark as recently used
+            except OSError:
+                pass
+            return
+
+        self._set_hankel(SElength, lam, zaccept, Rmax)
+        try:
+            _save_hankel(self, basename, parts)
+            _prune_cache(keep=basename)
+        except (IOError, OSError) as exc:
+            logger.info("could not cache SESANS transform in %s: %s",
+                        CACHE_PATH, exc)
+
+    def _set_fftlog(self, SElength, lam, zaccept, Rmax):
+        # type: (np.ndarray, float, float) -> None
+        SElength = np.asarray(SElength, dtype='d')
+        lam, zaccept = _broadcast_acceptance(SElength, lam, zaccept)
+
+        # Same q range as the dense transform, but log spaced.  The step in
+        # log q is chosen so that the largest q step resolves features of
+        # size max(SElength), with a factor of two to spare.
+        q_max = 2*pi / (SElength[1] - SElength[0])
+        q_min = 0.1 * 2*pi / (np.size(SElength) * SElength[-1])
+        dlnq = pi / (2 * q_max * SElength[-1])
+        n = int(np.ceil(np.log(q_max/q_min)/dlnq))
+        q = q_min * np.exp(dlnq*np.arange(n))
+
+        # Zero pad to twice the length so that the periodic wrap of the FFT
+        # does not fold the high q end onto the low q end.
+        npad = 2*n
+        omega = 2*pi*np.arange(npad//2 + 1)/(npad*dlnq)
+        # Mellin transform of J0 at 1 + i omega:
+        #     int t^(i omega) J0(t) dt = 2^(i omega) G((1+i omega)/2) / G((1-i omega)/2)
+        # This has unit modulus, so the transform is numerically stable.
+        u = np.exp(1j*omega*np.log(2) + loggamma(0.5+0.5j*omega)
+                   - loggamma(0.5-0.5j*omega))
+        # Output grid in log z, starting just below the smallest spin echo
+        # length so that all measured points land well inside the grid.
+        zpos = SElength[SElength > 0]
+        lnz0 = np.log(zpos[0] if zpos.size else SElength[-1]) - 4*dlnq
+        u *= np.exp(-1j*omega*(np.log(q_min) + lnz0))
+        u[-1] = u[-1].real
+        z = np.exp(lnz0 + dlnq*np.arange(npad))
+
+        # Group spin echo lengths which share the same acceptance so that each
+        # group needs only one transform.
+        groups = np.unique(np.vstack((lam, zaccept)), axis=1)
+        masks = []
+        for lam_k, zaccept_k in groups.T:
+            index = (lam == lam_k) & (zaccept == zaccept_k)
+            keep = ~_acceptance_mask(q, lam_k, zaccept_k)
+            masks.append((index, keep))
+
+        self.q_calc = q
+        self._fftlog = (SElength, dlnq, npad, u, z, masks)
+
+    def _apply_fftlog(self, Iq):
+        # type: (np.ndarray) -> np.ndarray
+        SElength, dlnq, npad, u, z, masks = self._fftlog
+        q = self.q_calc
+        Iq = np.asarray(Iq, dtype='d')
+        # G(z) = 1/(2 pi) int J0(qz) q I(q) dq on the log grid, with
+        # the integrand written as e^x h(x) for x = ln q and h = q I(q).
+        h = q*Iq
+        G0 = dlnq/(2*pi) * np.dot(q, h)
+        G = np.empty(SElength.shape, dtype='d')
+        for index, keep in masks:
+            c = np.fft.rfft(h*keep, n=npad)
+            Gz = np.fft.irfft(np.conj(c*u), n=npad) / (2*pi*z)
+            zk = SElength[index]
+            # G at z=0 is just the integral of q I(q) over the accepted q.
+            Gk = np.full(zk.shape, dlnq/(2*pi) * np.dot(q, h*keep))
+            Gk[zk > 0] = np.interp(np.log(zk[zk > 0]), np.log(z), Gz)
+            G[index] = Gk
+        P = G - G0
+        return P
+
+
+def _dense_q_size(SElength):
+    # type: (np.ndarray) -> int
+    """
+    Number of *q* points needed for the dense Hankel transform.
+    """
+    SElength = np.asarray(SElength, dtype='float32')
+    q_max = 2*pi / (SElength[1] - SElength[0])
+    q_min = 0.1 * 2*pi / (np.size(SElength) * SElength[-1])
+    return int(np.ceil(q_max/q_min))
+
+def _broadcast_acceptance(SElength, lam, zaccept):
+    # type: (np.ndarray, np.ndarray, np.ndarray) -> Tuple[np.ndarray, np.ndarray]
+    """
+    Return wavelength and acceptance as vectors the same length as *SElength*.
+    """
+    dtype = SElength.dtype
+    lam = np.broadcast_to(np.asarray(lam, dtype=dtype).flatten(), SElength.shape)
+    zaccept = np.broadcast_to(np.asarray(zaccept, dtype=dtype).flatten(), SElength.shape)
+    return lam, zaccept
+
+def _acceptance_mask(q, lam, zaccept):
+    # type: (np.ndarray, np.ndarray, np.ndarray) -> np.ndarray
+    """
+    Return True for the *q* values outside the acceptance of the instrument.
+    """
+    with np.errstate(invalid='ignore'):
+        theta = np.arcsin(q*lam/2*np.pi)
+    return theta > zaccept
+
+def _save_hankel(transform, basename, parts):
+    # type: (SesansTransform, str, Tuple[str, ...]) -> None
+    """
+    Save the *parts* of the dense *transform* to the cache as *basename*.
+
+    Each part is written to a temporary file and moved into place so that
+    other processes never see a partially written matrix.  *q_calc* is
+    written last since a complete set of files is required for a cache hit.
+    """
+    if not exists(CACHE_PATH):
+        try:
+            os.makedirs(CACHE_PATH)
+        except OSError:
+            if not exists(CACHE_PATH):
+                raise
+            # Another process created it.
+    for part in parts:
+        fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=CACHE_PATH)
+        try:
+            with os.fdopen(fd, "wb") as fid:
+                np.save(fid, getattr(transform, part))
+            getattr(os, 'replace', os.rename)(tmp, basename + part + ".npy")
+        except (IOError, OSError):
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+def _prune_cache(keep=None):
+    # type: (Optional[str]) -> None
+    """
+    Remove the least recently used matrices from the cache so that the
+    total size is at most *CACHE_SIZE*.  The matrix saved as *keep* is
+    not removed, even if it is larger than the cache.
+    """
+    entries = {}  # type: Dict[str, List[str]]
+    for filename in os.listdir(CACHE_PATH):
+        if filename.startswith("hankel_") and filename.endswith(".npy"):
+            # The name is "hankel_" followed by the 40 digit sha1 key.
+            entries.setdefault(filename[:47], []).append(
+                joinpath(CACHE_PATH, filename))
+    used = []
+    for prefix, paths in entries.items():
+        basename = joinpath(CACHE_PATH, prefix)
+        try:
+            size = sum(getsize(path) for path in paths)
+            # Loading an entry updates the time on q_calc.
+            last = max(getmtime(path) for path in paths)
+        except OSError:  # removed by another process
+            continue
+        used.append((basename == keep, last, size, paths))
+    used.sort(reverse=True)
+    total = 0
+    for _, _, size, paths in used:
+        total += size
+        if total > CACHE_SIZE and paths is not used[0][3]:
+            for path in paths:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+def _sphere_Iq(q, radius=500., contrast=1e-6):
+    # type: (np.ndarray, float, float) -> np.ndarray
+    qr = q*radius
+    with np.errstate(all='ignore'):
+        bes = np.where(qr == 0, 1., 3*(np.sin(qr) - qr*np.cos(qr))/qr**3)
+    volume = 4*pi/3*radius**3
+    return 1e8*contrast**2*volume*bes**2
+
+def test_cache():
+    """
+    Check that the cached transform matches the computed transform.
+    """
+    import shutil
+    global CACHE_PATH
+    SElength = np.linspace(100., 10000., 60)
+    lam, zaccept = 2., 0.1
+    saved, CACHE_PATH = CACHE_PATH, tempfile.mkdtemp()
+    first = second = None
+    try:
+        direct = SesansTransform(SElength, SElength, lam, zaccept, 1e7)
+        first = SesansTransform(SElength, SElength, lam, zaccept, 1e7, cache=True)
+        second = SesansTransform(SElength, SElength, lam, zaccept, 1e7, cache=True)
+        assert isinstance(second._H, np.memmap)
+        Iq = _sphere_Iq(direct.q_calc.astype('d'))
+        assert (direct.apply(Iq) == first.apply(Iq)).all()
+        assert (direct.apply(Iq) == second.apply(Iq)).all()
+    finally:
+        # Release the memory maps before removing the files.
+        first = second = None
+        shutil.rmtree(CACHE_PATH)
+        CACHE_PATH = saved
+
+def test_cache_failure():
+    """
+    Check that the transform is still built if the cache can't be written.
+    """
+    import shutil
+    global CACHE_PATH
+    SElength = np.linspace(100., 10000., 60)
+    lam, zaccept = 2., 0.1
+    root = tempfile.mkdtemp()
+    # A file in place of a directory, so the cache can't be created.
+    with open(joinpath(root, "file"), "w"):
+        pass
+    saved, CACHE_PATH = CACHE_PATH, joinpath(root, "file", "cache")
+    try:
+        transform = SesansTransform(SElength, SElength, lam, zaccept, 1e7,
+                                    cache=True)
+        assert transform._H.shape == (transform.q_calc.size, SElength.size)
+    finally:
+        shutil.rmtree(root)
+        CACHE_PATH = saved
+
+def test_cache_size():
+    """
+    Check that the least recently used matrices are removed from the cache.
+    """
+    import shutil
+    global CACHE_PATH, CACHE_SIZE
+    first = np.linspace(100., 10000., 60)
+    second = np.linspace(100., 20000., 60)
+    lam, zaccept = 2., 0.1
+    saved = CACHE_PATH, CACHE_SIZE
+    CACHE_PATH = tempfile.mkdtemp()
+    try:
+        SesansTransform(first, first, lam, zaccept, 1e7, cache=True)
+        CACHE_SIZE = sum(getsize(joinpath(CACHE_PATH, f))
+                         for f in os.listdir(CACHE_PATH))
+        SesansTransform(second, second, lam, zaccept, 1e7, cache=True)
+        # Only the most recent matrix fits.
+        assert len(os.listdir(CACHE_PATH)) == 3
+    finally:
+        shutil.rmtree(CACHE_PATH)
+        CACHE_PATH, CACHE_SIZE = saved
+
+def test_fftlog():
+    """
+    Check that the fast Hankel transform matches the dense matrix.
+    """
+    SElength = np.linspace(100., 10000., 60)
+    lam, zaccept = 2., 0.1
+    dense = SesansTransform(SElength, SElength, lam, zaccept, 1e7, method="dense")
+    fast = SesansTransform(SElength, SElength, lam, zaccept, 1e7, method="fftlog")
+    assert fast.q_calc.size < dense.q_calc.size//5
+    P_dense = dense.apply(_sphere_Iq(dense.q_calc.astype('d')))
+    P_fast = fast.apply(_sphere_Iq(fast.q_calc))
+    scale = abs(P_dense).max()
+    assert abs(P_dense - P_fast).max() < 1e-3*scale, abs(P_dense-P_fast).max()/scale
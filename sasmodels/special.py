@@ -190,6 +190,12 @@ file in the order given, otherwise these functions will not be available.
         and :code:`gauss150.c` for 150-point quadrature. By using
         :code:`import gauss76 as gauss` it is easy to change the number of
         points in the integration.
+
+        For orientation averages, include 'lib/gauss_adaptive.c' instead
+        and use :code:`GAUSS_RULE(q*r, n, z, w)` to select the smallest
+        rule accurate to 1e-6 for $q$ times the largest distance $r$ from
+        the center of the particle to its surface, with :code:`int n` and
+        :code:`constant double *z, *w`.
 """
 # pylint: disable=unused-import
 